@@ -0,0 +1,244 @@
+# answer_cache.py
+import math
+import re
+import threading
+import unicodedata
+from collections import Counter, OrderedDict
+
+# ========= 问答接口的语义答案缓存 =========
+# chat 页上大家反复问的就那么几个问题（“哪个城市 AI 岗位最多”“学历要求怎么样”），
+# 每次都完整走一遍 DeepSeek。这里按 (规范化后的问题, 数据版本) 缓存答案：
+#   - 先查规范化后完全一样的问题，再用字符 n-gram TF-IDF 余弦相似度找近似问题，
+#     相似度 >= threshold 才算命中
+#   - 最多存 max_entries 条，按最近使用淘汰（LRU）
+#   - 数据版本（insight_context 的指纹）一变，整个缓存作废：产物重建以后不会再拿旧数据的答案
+# 只缓存没有对话历史的提问；带历史的追问（“那上海呢”）意思取决于上文，不走缓存。
+#
+# 注意字面相似不等于语义相同：
+#   - “哪个城市岗位最多”和“哪个城市岗位最少”字面上非常接近，所以默认阈值取得比较高
+#   - 只差一个城市 / 技能的两个长问题（“北京……”和“南京……”）相似度能到 0.93，阈值拦不住，
+#     所以近似匹配还要求两边提到的实体（城市、技能、学历名和数字）完全一样
+#   - “工资最高”和“工资最低”只差一个字，相似度也在 0.92 以上，比较 / 方向词（最高、最低、增长、下降……）
+#     同样算进实体，有一个不一样就不命中
+# 宁可少命中也不答错。
+
+SIMILARITY_THRESHOLD = 0.9
+MAX_ENTRIES = 512
+NGRAM_RANGE = (2, 3)
+
+# 对意思没影响的客套话、语气词，只在一个短句的开头 / 结尾去掉：
+# 句中的“的”“了”往往是词的一部分（了解、目的），不能动
+_LEAD_FILLER_RE = re.compile(r"^(?:请问|请|麻烦|帮我|告诉我)+")
+_TAIL_FILLER_RE = re.compile(r"(?:一下|的|了|呢|吗|吧|啊|呀)+$")
+_DROP_RE = re.compile(r"[^\w+#]+|_+")  # + 和 # 留着，不然 C++ / C# 都变成 c
+_DIGITS_RE = re.compile(r"\d+(?:\.\d+)?")
+_ASCII_WORD = "a-z0-9+#"
+
+# 数据里没有单独的学历名单时也要认的几个
+DEGREE_TERMS = ("博士", "硕士", "研究生", "本科", "大专", "专科", "中专", "高中", "学历不限")
+
+# 比较 / 方向词：问的是“最高”还是“最低”，答案正好相反。
+# “多少”单列一项，按长的优先会整个匹配掉，不会拆成“多”和“少”
+DIRECTION_TERMS = ("最高", "最低", "最多", "最少", "高", "低", "多", "少",
+                   "多少", "增长", "下降", "上涨", "下跌", "涨", "跌", "前", "后")
+BUILTIN_TERMS = DEGREE_TERMS + DIRECTION_TERMS
+
+
+def normalize_question(text):
+    """全半角统一、转小写、去掉标点空白，以及每个短句首尾的语气词"""
+    text = unicodedata.normalize("NFKC", text or "").lower()
+    phrases = (_TAIL_FILLER_RE.sub("", _LEAD_FILLER_RE.sub("", p)) for p in _DROP_RE.split(text))
+    return "".join(phrases)
+
+
+def compile_entity_pattern(terms):
+    """
+    实体名单 → 一个正则：长的在前（“上海市”先于“上海”，“C++”先于“C”），
+    英文名要求两边不是字母数字，免得 C 匹配到 CSS 里、Java 匹配到 JavaScript 里。
+    """
+    parts = []
+    for term in sorted({unicodedata.normalize("NFKC", str(t)).lower().strip() for t in terms if t},
+                       key=len, reverse=True):
+        if not term:
+            continue
+        part = re.escape(term)
+        if re.match(r"[a-z0-9]", term):
+            part = f"(?<![{_ASCII_WORD}])" + part
+        if re.search(r"[a-z0-9]$", term):
+            part += f"(?![{_ASCII_WORD}])"
+        parts.append(part)
+    return re.compile("|".join(parts)) if parts else None
+
+
+def extract_entities(text, pattern):
+    """问题里提到的实体名、比较 / 方向词和数字，比较时当集合用"""
+    text = unicodedata.normalize("NFKC", text or "").lower()
+    found = set(_DIGITS_RE.findall(text))
+    if pattern is not None:
+        found.update(pattern.findall(text))
+    return frozenset(found)
+
+
+def char_ngrams(text, ngram_range=NGRAM_RANGE):
+    lo, hi = ngram_range
+    grams = Counter()
+    for n in range(lo, hi + 1):
+        for i in range(len(text) - n + 1):
+            grams[text[i:i + n]] += 1
+    if not grams and text:
+        grams[text] += 1  # 只有一个字的问题
+    return grams
+
+
+def is_standalone(history, question):
+    """
+    这次提问是不是“第一句”：chat 页发来的 history 里已经带着当前问题和一条空的 assistant 占位，
+    去掉这两样以后没有别的对话才算，只有这种提问才查 / 写缓存。
+    """
+    turns = [
+        (m.get("role"), m.get("content").strip())
+        for m in history or []
+        if isinstance(m, dict) and isinstance(m.get("content"), str) and m.get("content").strip()
+    ]
+    if turns and turns[-1] == ("user", question.strip()):
+        turns.pop()
+    return not turns
+
+
+class CachedAnswer:
+    def __init__(self, question, normalized, answer, grams, entities):
+        self.question = question
+        self.normalized = normalized
+        self.answer = answer
+        self.grams = grams
+        self.entities = entities
+        self.hits = 0
+
+
+class AnswerCache:
+    """
+    entity_terms：无参函数，返回当前数据里的城市 / 技能 / 学历名，每次数据版本变了重新取一次；
+    不传就只认 BUILTIN_TERMS（学历、比较 / 方向词）和数字。
+    """
+
+    def __init__(self, threshold=SIMILARITY_THRESHOLD, max_entries=MAX_ENTRIES, ngram_range=NGRAM_RANGE,
+                 entity_terms=None):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ngram_range = ngram_range
+        self.entity_terms = entity_terms
+        self._entity_re = compile_entity_pattern(BUILTIN_TERMS)
+        self.version = None
+        self._entries = OrderedDict()   # normalized -> CachedAnswer，越靠后越新
+        self._df = Counter()            # n-gram -> 出现在几条缓存问题里，算 IDF 用
+        self._lock = threading.Lock()
+        self.lookups = 0
+        self.exact_hits = 0
+        self.near_hits = 0
+        self.entity_rejects = 0
+        self.stores = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def _check_version(self, version):
+        if version != self.version:
+            if self._entries:
+                self.invalidations += 1
+            self._entries.clear()
+            self._df.clear()
+            self.version = version
+            if self.entity_terms is not None:
+                try:
+                    terms = list(self.entity_terms()) + list(BUILTIN_TERMS)
+                except Exception:
+                    terms = list(BUILTIN_TERMS)  # 名单取不到时至少还有学历、方向词和数字
+                self._entity_re = compile_entity_pattern(terms)
+
+    def _idf(self, gram):
+        n = len(self._entries)
+        return math.log((1 + n) / (1 + self._df.get(gram, 0))) + 1
+
+    def _vector(self, grams):
+        vec = {g: tf * self._idf(g) for g, tf in grams.items()}
+        norm = math.sqrt(sum(w * w for w in vec.values())) or 1.0
+        return vec, norm
+
+    def lookup(self, question, version):
+        """命中返回 (答案, 相似度, 命中的原问题)，没命中返回 None。"""
+        normalized = normalize_question(question)
+        if not normalized:
+            return None
+        with self._lock:
+            self._check_version(version)
+            self.lookups += 1
+            entities = extract_entities(question, self._entity_re)
+
+            entry = self._entries.get(normalized)
+            if entry is not None and entry.entities == entities:
+                self._entries.move_to_end(normalized)
+                entry.hits += 1
+                self.exact_hits += 1
+                return entry.answer, 1.0, entry.question
+
+            # 近似匹配：缓存最多几百条，直接和每条算余弦；提到的实体不一样的不参与
+            qvec, qnorm = self._vector(char_ngrams(normalized, self.ngram_range))
+            best, best_sim = None, 0.0
+            rejected = False
+            for cand in self._entries.values():
+                if cand.entities != entities:
+                    rejected = True
+                    continue
+                cvec, cnorm = self._vector(cand.grams)
+                dot = sum(w * cvec.get(g, 0.0) for g, w in qvec.items())
+                sim = dot / (qnorm * cnorm)
+                if sim > best_sim:
+                    best, best_sim = cand, sim
+            if best is None or best_sim < self.threshold:
+                if rejected:
+                    self.entity_rejects += 1
+                return None
+            self._entries.move_to_end(best.normalized)
+            best.hits += 1
+            self.near_hits += 1
+            return best.answer, round(best_sim, 4), best.question
+
+    def store(self, question, version, answer):
+        normalized = normalize_question(question)
+        if not normalized or not answer:
+            return
+        with self._lock:
+            self._check_version(version)
+            old = self._entries.pop(normalized, None)
+            if old is not None:
+                self._df.subtract(old.grams.keys())
+            grams = char_ngrams(normalized, self.ngram_range)
+            entities = extract_entities(question, self._entity_re)
+            self._entries[normalized] = CachedAnswer(question, normalized, answer, grams, entities)
+            self._df.update(grams.keys())
+            self.stores += 1
+
+            while len(self._entries) > self.max_entries:
+                _, evicted = self._entries.popitem(last=False)
+                self._df.subtract(evicted.grams.keys())
+                self.evictions += 1
+            self._df = +self._df  # 去掉减到 0 的项
+
+    def stats(self):
+        with self._lock:
+            hits = self.exact_hits + self.near_hits
+            top = sorted(self._entries.values(), key=lambda e: e.hits, reverse=True)[:10]
+            return {
+                "version": self.version,
+                "entries": len(self._entries),
+                "threshold": self.threshold,
+                "max_entries": self.max_entries,
+                "lookups": self.lookups,
+                "exact_hits": self.exact_hits,
+                "near_hits": self.near_hits,
+                "entity_rejects": self.entity_rejects,
+                "hit_rate": round(hits / self.lookups, 4) if self.lookups else None,
+                "stores": self.stores,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "top_questions": [{"question": e.question, "hits": e.hits} for e in top],
+            }
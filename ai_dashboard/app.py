@@ -1,10 +1,15 @@
 import os
 import json
-from flask import Flask, render_template, jsonify, current_app, Response, stream_with_context,request
+from flask import Flask, render_template, jsonify, Response, stream_with_context,request
 from openai import OpenAI  # 记得先 pip install openai
 from flask import request, session, jsonify
 from models import db, UserQuery
 from sqlalchemy import func 
+from artifact_store import ArtifactStore
+from insight_context import InsightContextCache, city_insight_messages, messages_version, skill_insight_messages
+from insight_broadcast import InsightBroadcaster
+from insight_store import PrecomputedInsights, replay_text
+from answer_cache import AnswerCache, is_standalone
 
 app = Flask(__name__)
 
@@ -33,15 +38,41 @@ deepseek_client = OpenAI(
 DEEPSEEK_MODEL = "deepseek-chat"
 
 
+# static/data 下的 JSON 全进程共用一份缓存，文件 mtime / 大小变了才重新解析
+artifact_store = ArtifactStore(os.path.join(app.static_folder, "data"))
+# AI 接口共用的数据摘要提示词，按数据版本只渲染一次
+insight_context = InsightContextCache(artifact_store)
+# 总览页洞察：同一数据版本只调一次大模型，所有打开页面的人共享这一份流
+main_insight_broadcaster = InsightBroadcaster()
+# 城市 / 技能下钻页的洞察：没有预生成文本时现场生成，同一份数据同样只生成一次
+drill_insight_broadcaster = InsightBroadcaster(keep_versions=256)
+# build_insights.py 离线预生成的洞察（static/data/insights.json），对得上当前数据就直接从磁盘流
+precomputed_insights = PrecomputedInsights(artifact_store)
+
+
+def answer_entity_terms():
+    """答案缓存近似匹配时必须对得上的实体名：数据里的城市、技能和学历"""
+    cities = artifact_store.get("city_drill.json").get("cities", [])
+    skills = artifact_store.get("skill_drill.json").get("skills", [])
+    degrees = artifact_store.get("degree_counts.json").get("degrees", [])
+    return [*cities, *skills, *degrees]
+
+
+# chat 问答的答案缓存：同一份数据下相同 / 几乎相同的第一句提问直接回缓存，不再调大模型
+answer_cache = AnswerCache(
+    threshold=float(os.environ.get("ANSWER_CACHE_THRESHOLD", "0.9")),
+    max_entries=int(os.environ.get("ANSWER_CACHE_SIZE", "512")),
+    entity_terms=answer_entity_terms,
+)
+
+
 def load_json_from_static(relative_path: str):
     """
     从 static/data 下读取 json 文件的小工具函数
     比如 relative_path='trend.json' -> static/data/trend.json
+    走 artifact_store 的缓存，返回的对象是共享的，不要原地修改
     """
-    base = os.path.join(current_app.static_folder, "data")
-    full = os.path.join(base, relative_path)
-    with open(full, "r", encoding="utf-8") as f:
-        return json.load(f)
+    return artifact_store.get(relative_path)
 
 
 # ========= 页面路由 =========
@@ -128,107 +159,147 @@ def query_insight():
         recent_queries=recent,
     )
 
-# ========= AI 洞察 API =========
-@app.route("/api/insight/main_dashboard", methods=["GET"], endpoint="api_main_insight")
-def api_main_insight():
-    """
-    main_dashboard 页的“AI 智能洞察”接口（流式 SSE）
-    前端用 EventSource 连接这个接口，一边生成一边推给前端。
-    """
+@app.route("/api/artifact_stats")
+def artifact_stats():
+    """artifact_store 的命中 / 未命中 / 重新加载次数，以及每个已加载文件的版本"""
+    return jsonify(artifact_store.stats())
+
+@app.route("/api/insight_context_stats")
+def insight_context_stats():
+    """数据摘要上下文的版本、重建次数和估算 token 数"""
+    return jsonify(insight_context.stats())
+
+@app.route("/api/insight_broadcast_stats")
+def insight_broadcast_stats():
+    """洞察的生成 / 加入 / 重放次数、各数据版本的生成状态，以及预生成文本的命中情况"""
+    return jsonify({
+        "main_dashboard": main_insight_broadcaster.stats(),
+        "drill": drill_insight_broadcaster.stats(),
+        "precomputed": precomputed_insights.stats(),
+    })
+
+@app.route("/api/answer_cache_stats")
+def answer_cache_stats():
+    """chat 答案缓存的条数、精确 / 近似命中次数、命中率和淘汰 / 作废次数"""
+    return jsonify(answer_cache.stats())
 
-    def generate():
+# ========= AI 洞察 API =========
+def deepseek_deltas(messages):
+    """流式调用 DeepSeek，只吐出文本片段"""
+    stream = deepseek_client.chat.completions.create(
+        model=DEEPSEEK_MODEL,
+        messages=messages,
+        stream=True
+    )
+    for chunk in stream:
         try:
-            # 1. 读大屏用到的数据文件
-            trend = load_json_from_static("trend.json")
-            degrees = load_json_from_static("degree_counts.json")
-            categories = load_json_from_static("rose.json")
-            geo = load_json_from_static("geo.json")
-            city_rank = load_json_from_static("city_job_rank.json")
-            skills = load_json_from_static("skills_top10.json")
+            yield chunk.choices[0].delta.content
+        except Exception:
+            continue
 
-            months = trend.get("months", [])
-            series = trend.get("series", [])
-            total_series = series[0]["data"] if series else []
 
-            degree_list = degrees.get("data", [])
-            cat_list = categories
-            geo_cities = geo[:30]  # 简单截一下，避免 prompt 太长
-            city_top = list(zip(city_rank.get("cities", []),
-                                city_rank.get("job_counts", [])))
-            skill_top = list(zip(skills.get("skills", []),
-                                 skills.get("counts", [])))
-
-            # 2. 提示词：写成偏“汇报稿”的洞察
-            user_prompt = f"""
-你是一名资深数据分析师，正在为“AI 职场智能洞察大屏”的【总览页】撰写洞察报告。
-
-你拿到的数据摘要如下（字段已做过聚合，只保留关键信息）：
+def insight_sse(kind, key, messages, version, broadcaster, refresh=False, live=True):
+    """
+    洞察接口共用的 SSE 流程：
+    - 有预生成、且版本对得上的文本（insights.json）就直接从磁盘流出去
+    - 否则交给 broadcaster 现场生成：同一版本只调一次大模型，同时打开的页面共享同一个流
+    - refresh=1 时跳过预生成文本和已生成的缓存，重新调一次大模型
+    - live=False 时只给现成的（预生成的、已经生成好或正在生成的），都没有就发一个 missing，不调大模型
+    """
+    text = None if refresh else precomputed_insights.lookup(kind, key, version)
+    if text is not None:
+        deltas, source = replay_text(text), "precomputed"
+    else:
+        found = broadcaster.subscribe(f"{kind}:{key}:{version}", lambda: deepseek_deltas(messages),
+                                      refresh=refresh, start=live)
+        if found is None:
+            yield "data: " + json.dumps({"type": "missing"}) + "\n\n"
+            return
+        deltas, source = found
 
-[1] 时间趋势（AI 岗位数量）
-- months: {months}
-- total_job_series: {total_series}
+    # 先发一个开始信号（可选），source 说明这次是预生成、新生成、加入进行中的还是重放缓存
+    yield "data: " + json.dumps({"type": "start", "source": source}) + "\n\n"
 
-[2] 学历结构（degree_counts）
-- degree_list: {degree_list}
+    # 一块一块把内容推给前端
+    for delta in deltas:
+        yield "data: " + json.dumps({"type": "chunk", "content": delta}) + "\n\n"
 
-[3] 岗位类别结构（rose.json）
-- categories(前若干个): {cat_list[:8]}
+    # 结束标记
+    yield "data: " + json.dumps({"type": "end"}) + "\n\n"
 
-[4] 城市分布 & Top 城市
-- geo 城市示例: {geo_cities[:10]}
-- city_top10: {city_top[:10]}
 
-[5] 核心技能 Top10
-- skills_top10: {skill_top}
+@app.route("/api/insight/main_dashboard", methods=["GET"], endpoint="api_main_insight")
+def api_main_insight():
+    """
+    main_dashboard 页的“AI 智能洞察”接口（流式 SSE）
+    前端用 EventSource 连接这个接口，一边生成一边推给前端。
+    优先用离线预生成的文本；没有的话同一数据版本只生成一次：同时打开的页面共享同一个流，
+    之后打开的直接重放生成好的全文；带 refresh=1 时重新调一次大模型。
+    """
+    refresh = request.args.get("refresh") == "1"
 
-请你基于这些信息，输出一段“AI 就业市场智能洞察”，要求：
+    def generate():
+        try:
+            # 数据摘要和提示词按数据版本缓存，这里直接取
+            ctx = insight_context.get()
+            yield from insight_sse("overview", "main_dashboard", ctx.main_insight_messages(),
+                                   ctx.main_insight_version, main_insight_broadcaster, refresh)
+        except Exception as e:
+            err_msg = f"生成洞察时后端出现错误：{str(e)}"
+            yield "data: " + json.dumps({"type": "error", "content": err_msg}) + "\n\n"
 
-1. 输出格式按模块分三段：
-   【趋势洞察】...
-   【结构与地域洞察】...
-   【技能与人才建议】...
+    return Response(stream_with_context(generate()), mimetype="text/event-stream")
 
-2. 每一段内部用 2–3 个「· 」开头的要点进行展开说明，整体 3–5 条要点即可。
-3. 风格偏实务型汇报：先给结论，再简短解释原因或数据依据，适合放进 PPT 里当讲解稿。
-4. 尽量同时覆盖：时间趋势、地域差异、学历梯度、岗位方向与核心技能，对求职者给出 1–2 句实用建议。
-5. 全文控制在 200～300 字左右，不要堆砌数字，也不要复述原始字段内容。
 
-直接输出中文洞察内容即可，不要出现“上面数据”“如下所示”之类的字眼。
-"""
+@app.route("/api/insight/city", methods=["GET"], endpoint="api_city_insight")
+def api_city_insight():
+    """
+    城市详情页的 AI 洞察（流式 SSE），?city=北京
+    数据来自 city_drill.json 里这个城市的那一条。
+    切换城市时页面只要现成的（预生成 / 已生成）；带 live=1（点“生成”）或 refresh=1 才调大模型。
+    """
+    city = request.args.get("city", "").strip()
+    refresh = request.args.get("refresh") == "1"
+    live = refresh or request.args.get("live") == "1"
 
-            # 3. 调用 DeepSeek，开启流式
-            stream = deepseek_client.chat.completions.create(
-                model=DEEPSEEK_MODEL,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "你是一名擅长写简洁有力数据洞察的商业分析师，语言专业但不啰嗦。"
-                    },
-                    {
-                        "role": "user",
-                        "content": user_prompt
-                    },
-                ],
-                stream=True
-            )
+    def generate():
+        try:
+            drill = load_json_from_static("city_drill.json")
+            city_data = drill.get("city_data", {}).get(city)
+            if city_data is None:
+                yield "data: " + json.dumps({"type": "error", "content": f"没有城市「{city}」的数据。"}) + "\n\n"
+                return
+            messages = city_insight_messages(city, drill.get("months", []), city_data)
+            yield from insight_sse("city", city, messages, messages_version(messages),
+                                   drill_insight_broadcaster, refresh, live)
+        except Exception as e:
+            err_msg = f"生成洞察时后端出现错误：{str(e)}"
+            yield "data: " + json.dumps({"type": "error", "content": err_msg}) + "\n\n"
 
-            # 先发一个开始信号（可选）
-            yield "data: " + json.dumps({"type": "start"}) + "\n\n"
+    return Response(stream_with_context(generate()), mimetype="text/event-stream")
 
-            # 一块一块把内容推给前端
-            for chunk in stream:
-                delta = None
-                try:
-                    delta = chunk.choices[0].delta.content
-                except Exception:
-                    delta = None
-                if not delta:
-                    continue
-                yield "data: " + json.dumps({"type": "chunk", "content": delta}) + "\n\n"
 
-            # 结束标记
-            yield "data: " + json.dumps({"type": "end"}) + "\n\n"
+@app.route("/api/insight/skill", methods=["GET"], endpoint="api_skill_insight")
+def api_skill_insight():
+    """
+    技能详情页的 AI 洞察（流式 SSE），?skill=Python
+    数据来自 skill_drill.json 里这个技能的那一条。
+    切换技能时页面只要现成的（预生成 / 已生成）；带 live=1（点“生成”）或 refresh=1 才调大模型。
+    """
+    skill = request.args.get("skill", "").strip()
+    refresh = request.args.get("refresh") == "1"
+    live = refresh or request.args.get("live") == "1"
 
+    def generate():
+        try:
+            drill = load_json_from_static("skill_drill.json")
+            skill_data = drill.get("skill_data", {}).get(skill)
+            if skill_data is None:
+                yield "data: " + json.dumps({"type": "error", "content": f"没有技能「{skill}」的数据。"}) + "\n\n"
+                return
+            messages = skill_insight_messages(skill, skill_data)
+            yield from insight_sse("skill", skill, messages, messages_version(messages),
+                                   drill_insight_broadcaster, refresh, live)
         except Exception as e:
             err_msg = f"生成洞察时后端出现错误：{str(e)}"
             yield "data: " + json.dumps({"type": "error", "content": err_msg}) + "\n\n"
@@ -251,76 +322,19 @@ def api_chat_nl():
         if not user_msg:
             return jsonify({"reply": "请先输入一个问题，例如：目前哪几个城市的 AI 岗位机会最多？"}), 400
 
-        # 1. 读数据（你已有的这些 json）
-        trend = load_json_from_static("trend.json")
-        degrees = load_json_from_static("degree_counts.json")
-        categories = load_json_from_static("rose.json")
-        geo = load_json_from_static("geo.json")
-        city_rank = load_json_from_static("city_job_rank.json")
-        skills = load_json_from_static("skills_top10.json")
-
-        # 2. 做一个简短的数据摘要（不要太长）
-        months = trend.get("months", [])
-        series = trend.get("series", [])
-        total_series = series[0]["data"] if series else []
-
-        degree_list = degrees.get("data", [])
-        cat_list = categories[:8]  # 只取前面几个类别
-        geo_top_sample = geo[:15]
-        city_top = list(zip(city_rank.get("cities", []),
-                            city_rank.get("job_counts", [])))[:10]
-        skill_top = list(zip(skills.get("skills", []),
-                             skills.get("counts", [])))[:10]
-
-        # 把这些整理成一段 summary 文本，给模型当“数据上下文”
-        data_summary = f"""
-[时间趋势]
-- months: {months}
-- total_job_series: {total_series}
-
-[学历结构]
-- degree_list: {degree_list}
-
-[岗位类别结构（部分）]
-- categories: {cat_list}
-
-[城市分布（部分采样 + Top10）]
-- geo_sample: {geo_top_sample}
-- city_top10: {city_top}
-
-[技能 Top10]
-- skills_top10: {skill_top}
-"""
-
-        # 3. 组 messages：把数据 summary 放进系统/assistant，history 也带上
-        messages = [
-            {
-                "role": "system",
-                "content": (
-                    "你是一个基于 AI 就业数据的智能职业顾问，只能主要参考我给你的数据摘要来回答问题。"
-                    "回答时："
-                    "1）尽量用通俗但专业的中文解释；"
-                    "2）如果问题跟数据无关，可以给一点常识性建议，但要说明“这部分是基于通用经验”；"
-                    "3）不要伪造不存在的数据，不要给出具体数字时胡编。"
-                )
-            },
-            {
-                "role": "assistant",
-                "content": "以下是本系统当前的大屏数据摘要，你回答问题时要尽量依据这些信息：\n" + data_summary
-            }
-        ]
-
-        # 把前端发来的 history 拼进去（简单过一遍，确保格式合法）
-        for item in history[-6:]:  # 最多带最近 6 句，避免太长
-            role = item.get("role")
-            content = item.get("content", "")
-            if role in ("user", "assistant") and content.strip():
-                messages.append({"role": role, "content": content.strip()})
-
-        # 最后加入当前这句话
-        messages.append({"role": "user", "content": user_msg})
-
-        # 4. 调用 DeepSeek（这里用非流式，接口简单一点）
+        ctx = insight_context.get()
+        # 0. 没有上文的提问先查答案缓存（按数据版本分区，数据重建后自动作废）
+        cacheable = is_standalone(history, user_msg)
+        if cacheable:
+            hit = answer_cache.lookup(user_msg, ctx.version)
+            if hit is not None:
+                reply, similarity, matched = hit
+                return jsonify({"reply": reply, "cached": True, "similarity": similarity, "matched": matched})
+
+        # 1. 组 messages：共用的 system + 数据摘要前缀，再接上 history 和当前这句话
+        messages = ctx.chat_messages(history, user_msg)
+
+        # 2. 调用 DeepSeek（这里用非流式，接口简单一点）
         resp = deepseek_client.chat.completions.create(
             model=DEEPSEEK_MODEL,
             messages=messages,
@@ -328,6 +342,8 @@ def api_chat_nl():
         )
 
         reply = resp.choices[0].message.content.strip()
+        if cacheable:
+            answer_cache.store(user_msg, ctx.version, reply)
         return jsonify({"reply": reply})
 
     except Exception as e:
@@ -363,69 +379,21 @@ def api_chat_stream():
                 }) + "\n\n"
                 return
 
-            # 1. 读数据（跟 /api/chat_nl 一样）
-            trend = load_json_from_static("trend.json")
-            degrees = load_json_from_static("degree_counts.json")
-            categories = load_json_from_static("rose.json")
-            geo = load_json_from_static("geo.json")
-            city_rank = load_json_from_static("city_job_rank.json")
-            skills = load_json_from_static("skills_top10.json")
-
-            months = trend.get("months", [])
-            series = trend.get("series", [])
-            total_series = series[0]["data"] if series else []
-
-            degree_list = degrees.get("data", [])
-            cat_list = categories[:8]
-            geo_top_sample = geo[:15]
-            city_top = list(zip(city_rank.get("cities", []),
-                                city_rank.get("job_counts", [])))[:10]
-            skill_top = list(zip(skills.get("skills", []),
-                                 skills.get("counts", [])))[:10]
-
-            data_summary = f"""
-[时间趋势]
-- months: {months}
-- total_job_series: {total_series}
-
-[学历结构]
-- degree_list: {degree_list}
-
-[岗位类别结构（部分）]
-- categories: {cat_list}
-
-[城市分布（部分采样 + Top10）]
-- geo_sample: {geo_top_sample}
-- city_top10: {city_top}
-
-[技能 Top10]
-- skills_top10: {skill_top}
-"""
-
-            messages = [
-                {
-                    "role": "system",
-                    "content": (
-                        "你是一个基于 AI 就业数据的大屏问答助手，只能主要参考我给你的数据摘要来回答问题。"
-                        "回答时：1）用通俗但专业的中文；"
-                        "2）超出数据部分用“基于通用经验”标记；"
-                        "3）不要乱编具体数字。"
-                    )
-                },
-                {
-                    "role": "assistant",
-                    "content": "以下是当前大屏的数据摘要，你回答问题时要尽量依据这些信息：\n" + data_summary
-                }
-            ]
-
-            # 最近几轮对话史
-            for item in history[-6:]:
-                role = item.get("role")
-                content = item.get("content", "")
-                if role in ("user", "assistant") and content.strip():
-                    messages.append({"role": role, "content": content.strip()})
-
-            messages.append({"role": "user", "content": q})
+            ctx = insight_context.get()
+            # 0. 和 /api/chat_nl 共用答案缓存：命中就把缓存的回答按小块重放，不调上游
+            cacheable = is_standalone(history, q)
+            hit = answer_cache.lookup(q, ctx.version) if cacheable else None
+            if hit is not None:
+                reply, similarity, matched = hit
+                yield "data: " + json.dumps({"type": "start", "source": "cached",
+                                             "similarity": similarity, "matched": matched}) + "\n\n"
+                for delta in replay_text(reply):
+                    yield "data: " + json.dumps({"type": "chunk", "content": delta}) + "\n\n"
+                yield "data: " + json.dumps({"type": "end"}) + "\n\n"
+                return
+
+            # 1. 和 /api/chat_nl 同一份前缀，上游前缀缓存两个接口共用
+            messages = ctx.chat_messages(history, q)
 
             # 2. 流式调用 DeepSeek
             stream = deepseek_client.chat.completions.create(
@@ -437,6 +405,7 @@ def api_chat_stream():
             # 开始信号
             yield "data: " + json.dumps({"type": "start"}) + "\n\n"
 
+            parts = []
             for chunk in stream:
                 delta = None
                 try:
@@ -445,12 +414,17 @@ def api_chat_stream():
                     delta = None
                 if not delta:
                     continue
+                parts.append(delta)
 
                 yield "data: " + json.dumps({
                     "type": "chunk",
                     "content": delta
                 }) + "\n\n"
 
+            # 完整生成完才写缓存，中途出错 / 断开的半截回答不缓存
+            if cacheable:
+                answer_cache.store(q, ctx.version, "".join(parts).strip())
+
             # 结束信号
             yield "data: " + json.dumps({"type": "end"}) + "\n\n"
 
@@ -0,0 +1,123 @@
+# artifact_store.py
+import hashlib
+import json
+import os
+import threading
+import time
+
+
+class ArtifactStore:
+    """
+    static/data 下 JSON 产物的进程内缓存。
+
+    - 每个文件只在第一次用到、或者磁盘上变了的时候 json.load 一次，之后请求直接拿内存里的对象
+    - 是否变了看 (mtime_ns, size)；同一个文件 check_interval 秒内最多 stat 一次
+    - 重新加载时先把新文件完整解析出来再整体替换，请求拿到的要么是旧版本要么是新版本；
+      build_all 正写到一半、JSON 解析失败时继续用旧版本，下次检查再试
+    - get() 返回的是共享对象，调用方不要原地修改
+    - 计数器不加锁，多线程下是近似值，看趋势够用
+    """
+
+    def __init__(self, base_dir, check_interval=1.0):
+        self.base_dir = base_dir
+        self.check_interval = check_interval
+        self._entries = {}      # 相对路径 -> {"sig", "data", "checked_at", "loaded_at"}
+        self._lock = threading.Lock()
+        self._file_locks = {}
+        self.hits = 0
+        self.misses = 0
+        self.reloads = 0
+        self.errors = 0
+
+    def _stat(self, relative_path):
+        st = os.stat(os.path.join(self.base_dir, relative_path))
+        return st.st_mtime_ns, st.st_size
+
+    def _file_lock(self, relative_path):
+        with self._lock:
+            return self._file_locks.setdefault(relative_path, threading.Lock())
+
+    def get(self, relative_path):
+        return self._get_entry(relative_path)["data"]
+
+    def _get_entry(self, relative_path):
+        now = time.monotonic()
+        entry = self._entries.get(relative_path)
+        if entry is not None and now - entry["checked_at"] < self.check_interval:
+            self.hits += 1
+            return entry
+
+        # 同一个文件同时只有一个请求去 stat / 解析，其它请求等它做完直接用结果
+        with self._file_lock(relative_path):
+            entry = self._entries.get(relative_path)
+            if entry is not None and now - entry["checked_at"] < self.check_interval:
+                self.hits += 1
+                return entry
+
+            try:
+                sig = self._stat(relative_path)
+            except OSError:
+                if entry is None:
+                    raise
+                # 文件临时不见了（比如正在被替换），先用旧的
+                self.errors += 1
+                entry["checked_at"] = now
+                return entry
+
+            if entry is not None and entry["sig"] == sig:
+                entry["checked_at"] = now
+                self.hits += 1
+                return entry
+
+            try:
+                with open(os.path.join(self.base_dir, relative_path), "r", encoding="utf-8") as f:
+                    data = json.load(f)
+            except ValueError:
+                if entry is None:
+                    raise
+                self.errors += 1
+                entry["checked_at"] = now
+                return entry
+
+            if entry is None:
+                self.misses += 1
+            else:
+                self.reloads += 1
+            entry = {
+                "sig": sig,
+                "data": data,
+                "checked_at": now,
+                "loaded_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+            }
+            self._entries[relative_path] = entry
+            return entry
+
+    def snapshot(self, relative_paths):
+        """
+        一次取一组文件：返回 (版本指纹, [数据, ...])。
+        指纹和数据来自同一批缓存条目，任何一个文件重新加载过指纹就会变。
+        """
+        entries = [self._get_entry(p) for p in relative_paths]
+        h = hashlib.sha256()
+        for p, e in sorted(zip(relative_paths, entries), key=lambda pe: pe[0]):
+            mtime, size = e["sig"]
+            h.update(f"{p}:{mtime}:{size};".encode("utf-8"))
+        return h.hexdigest()[:16], [e["data"] for e in entries]
+
+    def version(self, relative_paths):
+        """这几个文件当前加载版本的指纹。"""
+        return self.snapshot(relative_paths)[0]
+
+    def stats(self):
+        total = self.hits + self.misses + self.reloads
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "reloads": self.reloads,
+            "errors": self.errors,
+            "hit_rate": round(self.hits / total, 4) if total else None,
+            "files": {
+                p: {"mtime_ns": e["sig"][0], "size": e["sig"][1], "loaded_at": e["loaded_at"]}
+                for p, e in sorted(self._entries.items())
+            },
+        }
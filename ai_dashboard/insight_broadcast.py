@@ -0,0 +1,140 @@
+# insight_broadcast.py
+import threading
+import time
+from collections import OrderedDict
+
+# ========= 总览页 AI 洞察：同一数据版本只生成一次，所有观众共享 =========
+# 每个打开 main_dashboard.html 的页面都会连一个 EventSource，原来每个连接各自调一次流式大模型，
+# 一面墙的大屏就是 N 次一模一样的付费生成。这里改成 single-flight：
+#   - 第一个请求启动生成（放在后台线程里跑，发起的页面中途关掉也会跑完）
+#   - 生成过程中进来的请求订阅同一个流：先把已经产出的片段重放一遍，再跟着实时往下收
+#   - 跑完的全文按数据版本缓存，之后的观众直接重放，不再调上游
+#   - 生成失败不缓存，正在等的观众收到错误，下一个请求重新生成
+#   - 页面上点“重新生成”带 refresh=1：已经生成完的作废重来；正在生成的照样加入，不会并发出第二份
+
+IDLE_TIMEOUT = 120     # 秒，上游这么久没有新片段就当它卡死了
+KEEP_VERSIONS = 4      # 最多缓存几个数据版本的全文
+
+
+class Flight:
+    """一次生成：片段列表只追加，订阅者各自记着读到哪儿了。"""
+
+    def __init__(self, key):
+        self.key = key
+        self.chunks = []
+        self.done = False
+        self.error = None
+        self.started_at = time.time()
+        self.finished_at = None
+        self._cond = threading.Condition()
+
+    def run(self, produce):
+        try:
+            for delta in produce():
+                if not delta:
+                    continue
+                with self._cond:
+                    self.chunks.append(delta)
+                    self._cond.notify_all()
+        except Exception as e:
+            self.error = str(e)
+        with self._cond:
+            self.done = True
+            self.finished_at = time.time()
+            self._cond.notify_all()
+
+    def replay(self):
+        """从头开始逐个吐片段：已经有的立刻吐，没有的等生成线程产出；出错时抛 RuntimeError。"""
+        i = 0
+        while True:
+            with self._cond:
+                while i >= len(self.chunks) and not self.done:
+                    if not self._cond.wait(timeout=IDLE_TIMEOUT):
+                        raise TimeoutError(f"上游 {IDLE_TIMEOUT} 秒没有新内容")
+                pending = self.chunks[i:]
+                finished = self.done
+            for delta in pending:
+                yield delta
+            i += len(pending)
+            if finished and i >= len(self.chunks):
+                break
+        if self.error is not None:
+            raise RuntimeError(self.error)
+
+    @property
+    def text(self):
+        return "".join(self.chunks)
+
+
+class InsightBroadcaster:
+    def __init__(self, keep_versions=KEEP_VERSIONS):
+        self.keep_versions = keep_versions
+        self._flights = OrderedDict()   # key -> Flight（进行中的 + 已经成功完成的）
+        self._lock = threading.Lock()
+        self.started = 0
+        self.joined = 0
+        self.replayed = 0
+        self.failed = 0
+
+    def subscribe(self, key, produce, refresh=False, start=True):
+        """
+        拿到 key（数据版本）对应的生成，返回 (片段迭代器, 来源)。
+        来源是 "generated"（这次请求启动了生成）、"joined"（加入进行中的）或 "cached"（已经生成完）。
+        produce 是无参函数，返回上游的文本片段迭代器，只有需要真正生成时才会被调用。
+        start=False 时只看已有的：没有进行中或生成好的就返回 None，不调上游。
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is not None and flight.done and (flight.error is not None or refresh):
+                del self._flights[key]
+                flight = None
+
+            if flight is None and not start:
+                return None
+            if flight is None:
+                flight = Flight(key)
+                self._flights[key] = flight
+                self.started += 1
+                source = "generated"
+                threading.Thread(target=self._run, args=(flight, produce), daemon=True).start()
+            elif flight.done:
+                self._flights.move_to_end(key)
+                self.replayed += 1
+                source = "cached"
+            else:
+                self.joined += 1
+                source = "joined"
+        return flight.replay(), source
+
+    def _run(self, flight, produce):
+        flight.run(produce)
+        with self._lock:
+            if flight.error is not None:
+                self.failed += 1
+                if self._flights.get(flight.key) is flight:
+                    del self._flights[flight.key]
+                return
+            # 只留最近几个版本，数据换版以后旧的全文慢慢挤出去
+            done = [k for k, f in self._flights.items() if f.done]
+            for k in done[:max(0, len(done) - self.keep_versions)]:
+                del self._flights[k]
+
+    def stats(self):
+        with self._lock:
+            flights = [
+                {
+                    "version": f.key,
+                    "state": "error" if f.error else ("done" if f.done else "running"),
+                    "chunks": len(f.chunks),
+                    "chars": len(f.text),
+                    "seconds": round((f.finished_at or time.time()) - f.started_at, 2),
+                }
+                for f in self._flights.values()
+            ]
+        return {
+            "started": self.started,
+            "joined": self.joined,
+            "replayed": self.replayed,
+            "failed": self.failed,
+            "flights": flights,
+        }
@@ -0,0 +1,235 @@
+# insight_context.py
+import hashlib
+import json
+import re
+import threading
+import time
+
+# ========= AI 接口共用的数据摘要上下文 =========
+# 原来 /api/insight/main_dashboard、/api/chat_nl、/api/chat_stream 每次请求都各自读六个 JSON、
+# 切片、zip、拼 f-string，三处写法还略有不同。
+# 这里按数据版本（artifact_store 里这六个文件的指纹）只渲染一次，三个接口共用同一份文本：
+#   - 请求里不再拼提示词
+#   - 同一份数据下，发给大模型的前缀（system + 数据摘要）逐字节一样，上游的前缀缓存能一直命中
+# 城市 / 技能下钻页的洞察提示词也放在这里：离线预生成（data_clean_code/build_insights.py）
+# 和在线兜底生成用的是同一套渲染函数，messages_version 相同就说明预生成的文本对得上当前数据。
+
+SUMMARY_FILES = (
+    "trend.json",
+    "degree_counts.json",
+    "rose.json",
+    "geo.json",
+    "city_job_rank.json",
+    "skills_top10.json",
+)
+
+INSIGHT_SYSTEM_PROMPT = "你是一名擅长写简洁有力数据洞察的商业分析师，语言专业但不啰嗦。"
+
+CHAT_SYSTEM_PROMPT = (
+    "你是一个基于 AI 就业数据的智能职业顾问，只能主要参考我给你的数据摘要来回答问题。"
+    "回答时："
+    "1）尽量用通俗但专业的中文解释；"
+    "2）如果问题跟数据无关，可以给一点常识性建议，但要说明“这部分是基于通用经验”；"
+    "3）不要伪造不存在的数据，不要给出具体数字时胡编。"
+)
+
+CHAT_SUMMARY_INTRO = "以下是本系统当前的大屏数据摘要，你回答问题时要尽量依据这些信息：\n"
+
+CHAT_HISTORY_TURNS = 6  # 最多带最近 6 句，避免太长
+
+_CJK_RE = re.compile(r"[\u3000-\u303f\u4e00-\u9fff\uff00-\uffef]")
+_ASCII_RUN_RE = re.compile(r"[^\s\u3000-\u303f\u4e00-\u9fff\uff00-\uffef]+")
+
+
+def estimate_tokens(text):
+    """粗估 token 数：中文字符一个算一个，其余按连续片段每 4 个字符算一个。"""
+    cjk = len(_CJK_RE.findall(text))
+    rest = sum((len(m) + 3) // 4 for m in _ASCII_RUN_RE.findall(text))
+    return cjk + rest
+
+
+def messages_version(messages):
+    """一组 messages 的内容指纹：数据或提示词有任何变化指纹都会变。"""
+    raw = json.dumps(messages, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def render_data_summary(trend, degrees, categories, geo, city_rank, skills):
+    """六个 JSON → 给模型当“数据上下文”的摘要文本（不要太长）。"""
+    months = trend.get("months", [])
+    series = trend.get("series", [])
+    total_series = series[0]["data"] if series else []
+
+    degree_list = degrees.get("data", [])
+    cat_list = categories[:8]  # 只取前面几个类别
+    geo_top_sample = geo[:15]
+    city_top = list(zip(city_rank.get("cities", []),
+                        city_rank.get("job_counts", [])))[:10]
+    skill_top = list(zip(skills.get("skills", []),
+                         skills.get("counts", [])))[:10]
+
+    return f"""
+[时间趋势]
+- months: {months}
+- total_job_series: {total_series}
+
+[学历结构]
+- degree_list: {degree_list}
+
+[岗位类别结构（部分）]
+- categories: {cat_list}
+
+[城市分布（部分采样 + Top10）]
+- geo_sample: {geo_top_sample}
+- city_top10: {city_top}
+
+[技能 Top10]
+- skills_top10: {skill_top}
+"""
+
+
+def render_main_insight_prompt(data_summary):
+    """总览页“AI 智能洞察”的用户提示词：写成偏“汇报稿”的洞察"""
+    return f"""
+你是一名资深数据分析师，正在为“AI 职场智能洞察大屏”的【总览页】撰写洞察报告。
+
+你拿到的数据摘要如下（字段已做过聚合，只保留关键信息）：
+{data_summary}
+请你基于这些信息，输出一段“AI 就业市场智能洞察”，要求：
+
+1. 输出格式按模块分三段：
+   【趋势洞察】...
+   【结构与地域洞察】...
+   【技能与人才建议】...
+
+2. 每一段内部用 2–3 个「· 」开头的要点进行展开说明，整体 3–5 条要点即可。
+3. 风格偏实务型汇报：先给结论，再简短解释原因或数据依据，适合放进 PPT 里当讲解稿。
+4. 尽量同时覆盖：时间趋势、地域差异、学历梯度、岗位方向与核心技能，对求职者给出 1–2 句实用建议。
+5. 全文控制在 200～300 字左右，不要堆砌数字，也不要复述原始字段内容。
+
+直接输出中文洞察内容即可，不要出现“上面数据”“如下所示”之类的字眼。
+"""
+
+
+INSIGHT_REQUIREMENTS = """
+要求：
+1. 用 2–4 个「· 」开头的要点，先给结论，再简短说明数据依据；
+2. 覆盖薪资水平、需求变化和技能 / 方向上的特点，最后给求职者 1 句实用建议；
+3. 全文控制在 150～200 字，不要堆砌数字，也不要复述原始字段名。
+
+直接输出中文洞察内容即可，不要出现“上面数据”“如下所示”之类的字眼。
+"""
+
+
+def city_insight_messages(city, months, city_data):
+    """城市下钻页（city_drill.json 里的一个城市）的洞察提示词"""
+    user_prompt = f"""
+你是一名资深数据分析师，正在为“AI 职场智能洞察大屏”的【城市详情页】撰写【{city}】的 AI 岗位洞察。
+
+数据摘要：
+- 岗位总数: {city_data.get("total_jobs")}
+- months: {months}
+- 每月岗位数: {city_data.get("trend_jobs", [])}
+- 每月平均月薪: {city_data.get("trend_salary", [])}
+- 月薪箱线 [min, Q1, median, Q3, max]: {city_data.get("salary_box")}
+- 岗位方向 Top8: {city_data.get("categories", [])[:8]}
+- 核心技能 Top10: {city_data.get("skills", [])[:10]}
+{INSIGHT_REQUIREMENTS}"""
+    return [
+        {"role": "system", "content": INSIGHT_SYSTEM_PROMPT},
+        {"role": "user", "content": user_prompt},
+    ]
+
+
+def skill_insight_messages(skill, skill_data):
+    """技能下钻页（skill_drill.json 里的一个技能）的洞察提示词"""
+    user_prompt = f"""
+你是一名资深数据分析师，正在为“AI 职场智能洞察大屏”的【技能详情页】撰写【{skill}】这项技能的洞察。
+
+数据摘要：
+- 要求该技能的岗位数: {skill_data.get("total_jobs")}
+- 月薪箱线 [min, Q1, median, Q3, max]: {skill_data.get("salary_box")}
+- 各经验段平均月薪: {skill_data.get("exp_salary", {})}
+- 城市 Top10: {skill_data.get("city_counts", [])[:10]}
+- 岗位方向 Top8: {skill_data.get("direction_counts", skill_data.get("direction_top", []))[:8]}
+{INSIGHT_REQUIREMENTS}"""
+    return [
+        {"role": "system", "content": INSIGHT_SYSTEM_PROMPT},
+        {"role": "user", "content": user_prompt},
+    ]
+
+
+class SummaryContext:
+    """某一个数据版本下渲染好的提示词，建好以后只读。"""
+
+    def __init__(self, version, data_summary):
+        self.version = version
+        self.data_summary = data_summary
+        self.main_insight_prompt = render_main_insight_prompt(data_summary)
+        self.main_insight_version = messages_version(self.main_insight_messages())
+        self.chat_prefix = (
+            {"role": "system", "content": CHAT_SYSTEM_PROMPT},
+            {"role": "assistant", "content": CHAT_SUMMARY_INTRO + data_summary},
+        )
+        self.tokens = {
+            "data_summary": estimate_tokens(data_summary),
+            "main_insight": estimate_tokens(INSIGHT_SYSTEM_PROMPT) + estimate_tokens(self.main_insight_prompt),
+            "chat_prefix": sum(estimate_tokens(m["content"]) for m in self.chat_prefix),
+        }
+        self.built_at = time.strftime("%Y-%m-%d %H:%M:%S")
+
+    def main_insight_messages(self):
+        return [
+            {"role": "system", "content": INSIGHT_SYSTEM_PROMPT},
+            {"role": "user", "content": self.main_insight_prompt},
+        ]
+
+    def chat_messages(self, history, question):
+        """共用前缀 + 最近几轮对话（简单过一遍，确保格式合法）+ 当前问题"""
+        messages = [dict(m) for m in self.chat_prefix]
+        for item in history[-CHAT_HISTORY_TURNS:]:
+            if not isinstance(item, dict):
+                continue
+            role = item.get("role")
+            content = item.get("content", "")
+            if role in ("user", "assistant") and isinstance(content, str) and content.strip():
+                messages.append({"role": role, "content": content.strip()})
+        messages.append({"role": "user", "content": question})
+        return messages
+
+
+class InsightContextCache:
+    """按 artifact_store 里 SUMMARY_FILES 的版本缓存 SummaryContext，文件一变下次请求重建。"""
+
+    def __init__(self, store):
+        self.store = store
+        self._current = None
+        self._lock = threading.Lock()
+        self.builds = 0
+        self.hits = 0
+
+    def get(self):
+        version, data = self.store.snapshot(SUMMARY_FILES)
+        ctx = self._current
+        if ctx is not None and ctx.version == version:
+            self.hits += 1
+            return ctx
+        with self._lock:
+            ctx = self._current
+            if ctx is not None and ctx.version == version:
+                self.hits += 1
+                return ctx
+            ctx = SummaryContext(version, render_data_summary(*data))
+            self._current = ctx
+            self.builds += 1
+            return ctx
+
+    def stats(self):
+        ctx = self._current
+        return {
+            "builds": self.builds,
+            "hits": self.hits,
+            "version": ctx.version if ctx else None,
+            "built_at": ctx.built_at if ctx else None,
+            "tokens": ctx.tokens if ctx else None,
+        }
@@ -0,0 +1,55 @@
+# insight_store.py
+
+# ========= 离线预生成的洞察文本 =========
+# data_clean_code/build_insights.py 在构建阶段用本地 Ollama 把总览页、每个城市、每个技能的洞察
+# 预先生成好，写到 static/data/insights.json：
+#   {"insights": {"overview": {"main_dashboard": {...}}, "city": {城市: {...}}, "skill": {技能: {...}}}}
+# 每条记着 version（生成时 messages 的指纹，见 insight_context.messages_version）。
+# 接口按当前数据渲染出 messages 再算指纹，对得上就直接从磁盘流出去，对不上（数据变了）或没有就现场生成。
+
+INSIGHTS_FILE = "insights.json"
+REPLAY_CHUNK_CHARS = 24  # 从磁盘重放时每个 SSE 片段的字数，前端照样是逐段出字
+
+
+class PrecomputedInsights:
+    def __init__(self, store, filename=INSIGHTS_FILE):
+        self.store = store
+        self.filename = filename
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+
+    def lookup(self, kind, key, version):
+        """预生成且和当前数据对得上的文本；没有就返回 None。"""
+        try:
+            entry = self.store.get(self.filename).get("insights", {}).get(kind, {}).get(key)
+        except (OSError, ValueError):
+            entry = None
+        if not entry or not entry.get("text"):
+            self.misses += 1
+            return None
+        if entry.get("version") != version:
+            self.stale += 1
+            return None
+        self.hits += 1
+        return entry["text"]
+
+    def stats(self):
+        try:
+            data = self.store.get(self.filename)
+        except (OSError, ValueError):
+            data = {}
+        insights = data.get("insights", {})
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale": self.stale,
+            "model": data.get("model"),
+            "generated_at": data.get("generated_at"),
+            "counts": {kind: len(entries) for kind, entries in insights.items()},
+        }
+
+
+def replay_text(text, size=REPLAY_CHUNK_CHARS):
+    for i in range(0, len(text), size):
+        yield text[i:i + size]
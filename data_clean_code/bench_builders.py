@@ -0,0 +1,234 @@
+import argparse
+import json
+import platform
+import resource
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from build_artifacts import DEFAULT_INPUT, GENERATORS, REPO_DIR, SALARY_COL, SKILL_COL, BuildState, write_outputs
+
+
+# ========= 生成器的规模基准 =========
+# 真实数据只有五千多行，看不出生成器在大数据量下会不会突然变慢、爆内存。
+# 这里按真实数据的分布造 10k / 100k / 1M / 10M 行的合成数据，每个生成器单独起一个子进程跑，
+# 记下读数据、生成、写盘各自的耗时和子进程的峰值内存（ru_maxrss），写成 JSON 报告。
+# 用法：
+#   python bench_builders.py                                # 默认四档规模，全部生成器
+#   python bench_builders.py --sizes 10k 100k --only cockpit cockpit_cube
+#   python bench_builders.py --sizes 1M --timeout 1800 --report /tmp/bench.json
+#
+# 合成数据怎么造：
+#   - 整行有放回地抽真实岗位，城市 / 方向 / 学历 / 经验段 / 月份 / 技能列表的联合分布原样保留
+#   - 最低 / 最高月薪乘一个对数正态抖动再取整到 SALARY_ROUND，中位月薪重新取两者中点，
+#     薪资区间的形状和“扎堆在整数上”的特点都还在
+#   - 真实数据量变大时技能词表也会变长：每行以 TAIL_SKILL_RATE 的概率追加一个长尾技能，
+#     长尾词表大小随行数的平方根增长，技能共现矩阵、倒排索引才会跟着真实地变大
+
+DEFAULT_SIZES = ["10k", "100k", "1M", "10M"]
+DEFAULT_WORK_DIR = REPO_DIR / "data" / "bench"
+DEFAULT_TIMEOUT = 3600
+CHUNK_ROWS = 500_000
+SEED = 20240101
+
+SALARY_JITTER = 0.08
+SALARY_ROUND = 500
+TAIL_SKILL_RATE = 0.03
+TAIL_VOCAB_PER_SQRT_ROW = 2
+SKILL_SEP = "、"
+
+
+def parse_size(text):
+    """10k / 1M / 2500 → 行数"""
+    text = str(text).strip().lower()
+    scale = {"k": 1_000, "m": 1_000_000}.get(text[-1:], 1)
+    return int(float(text[:-1] if scale > 1 else text) * scale)
+
+
+def size_label(n):
+    if n >= 1_000_000 and n % 1_000_000 == 0:
+        return f"{n // 1_000_000}M"
+    if n >= 1_000 and n % 1_000 == 0:
+        return f"{n // 1_000}k"
+    return str(n)
+
+
+def bench_columns():
+    """合成数据只保留生成器读到的列（再加上最低 / 最高月薪），大档位的 CSV 能小一半多。"""
+    cols = {"最低月薪_元", "最高月薪_元", SALARY_COL}
+    for gen in GENERATORS.values():
+        cols.update(gen.columns)
+    return cols
+
+
+def synth_chunk(real, n, rng, tail_vocab):
+    """从真实数据按行抽 n 行，再抖动薪资、追加长尾技能。"""
+    chunk = real.iloc[rng.integers(0, len(real), n)].reset_index(drop=True)
+
+    factor = np.exp(rng.normal(0.0, SALARY_JITTER, n))
+    lo = (chunk["最低月薪_元"].to_numpy(dtype=float) * factor / SALARY_ROUND).round() * SALARY_ROUND
+    hi = (chunk["最高月薪_元"].to_numpy(dtype=float) * factor / SALARY_ROUND).round() * SALARY_ROUND
+    hi = np.maximum(lo, hi)
+    chunk["最低月薪_元"] = lo
+    chunk["最高月薪_元"] = hi
+    chunk[SALARY_COL] = (lo + hi) / 2
+
+    if len(tail_vocab):
+        picked = np.flatnonzero((rng.random(n) < TAIL_SKILL_RATE) & chunk[SKILL_COL].notna().to_numpy())
+        if picked.size:
+            # Zipf 式地抽长尾技能：越靠前的越常见
+            ranks = np.minimum(rng.zipf(1.3, picked.size) - 1, len(tail_vocab) - 1)
+            col = chunk.columns.get_loc(SKILL_COL)
+            chunk.iloc[picked, col] = chunk.iloc[picked, col].to_numpy(dtype=object) + SKILL_SEP + tail_vocab[ranks]
+    return chunk
+
+
+def make_dataset(n_rows, work_dir, real_path=DEFAULT_INPUT, seed=SEED, regen=False):
+    """造 n_rows 行的合成 CSV（已经有了就直接复用），返回路径。分块写，10M 行也不用整表放进内存。"""
+    work_dir = Path(work_dir)
+    work_dir.mkdir(parents=True, exist_ok=True)
+    path = work_dir / f"synth_{size_label(n_rows)}.csv"
+    if path.exists() and not regen:
+        return path
+
+    real = pd.read_csv(real_path)
+    real = real[[c for c in real.columns if c in bench_columns()]]
+    rng = np.random.default_rng(seed)
+
+    base_skills = real[SKILL_COL].dropna().str.split(SKILL_SEP).explode().str.strip()
+    base_skills = base_skills[base_skills != ""].value_counts().index.to_numpy(dtype=object)
+    tail_size = int(TAIL_VOCAB_PER_SQRT_ROW * np.sqrt(n_rows))
+    tail_vocab = np.array(
+        [f"{base_skills[i % len(base_skills)]}-{i // len(base_skills) + 2}" for i in range(tail_size)],
+        dtype=object,
+    )
+
+    t0 = time.time()
+    tmp = path.with_suffix(".tmp")
+    written = 0
+    with open(tmp, "w", encoding="utf-8-sig", newline="") as f:
+        while written < n_rows:
+            n = min(CHUNK_ROWS, n_rows - written)
+            synth_chunk(real, n, rng, tail_vocab).to_csv(f, index=False, header=written == 0)
+            written += n
+    tmp.replace(path)
+    print(f"合成数据 {path.name}：{n_rows} 行，长尾技能 {tail_size} 个，"
+          f"{path.stat().st_size / 1e6:.1f} MB，耗时 {time.time() - t0:.1f}s")
+    return path
+
+
+def peak_rss_mb():
+    """当前进程到目前为止的峰值常驻内存（Linux 的 ru_maxrss 单位是 KB，macOS 是字节）。"""
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(rss / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def run_worker(data_path, name, out_dir):
+    """子进程里跑一个生成器，最后一行打印 JSON 结果。"""
+    t0 = time.perf_counter()
+    state = BuildState.load(data_path)
+    load_s = time.perf_counter() - t0
+    rss_after_load = peak_rss_mb()
+
+    t1 = time.perf_counter()
+    outputs = GENERATORS[name](state)
+    build_s = time.perf_counter() - t1
+
+    t2 = time.perf_counter()
+    paths = write_outputs(outputs, out_dir)
+    write_s = time.perf_counter() - t2
+
+    print(json.dumps({
+        "rows": len(state.df),
+        "load_s": round(load_s, 3),
+        "build_s": round(build_s, 3),
+        "write_s": round(write_s, 3),
+        "rss_after_load_mb": rss_after_load,
+        "peak_rss_mb": peak_rss_mb(),
+        "output_bytes": {p.name: p.stat().st_size for p in paths},
+    }, ensure_ascii=False))
+
+
+def run_one(data_path, name, out_dir, timeout):
+    """起子进程跑一个生成器；超时、报错也记一条，规模上去之后哪里先崩一眼能看到。"""
+    cmd = [sys.executable, str(Path(__file__).resolve()), "--worker", str(data_path), name, str(out_dir)]
+    t0 = time.perf_counter()
+    try:
+        proc = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout, cwd=Path(__file__).parent)
+    except subprocess.TimeoutExpired:
+        return {"status": "timeout", "wall_s": round(time.perf_counter() - t0, 3)}
+    wall_s = round(time.perf_counter() - t0, 3)
+
+    if proc.returncode != 0:
+        # 被 OOM killer 杀掉时 returncode 是 -9
+        return {"status": "error", "returncode": proc.returncode, "wall_s": wall_s,
+                "stderr": proc.stderr.strip().splitlines()[-5:]}
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    return {"status": "ok", "wall_s": wall_s, **result}
+
+
+def write_report(report, path):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    tmp.replace(path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="按真实分布造合成数据，测每个生成器的耗时和峰值内存")
+    parser.add_argument("--sizes", nargs="+", default=DEFAULT_SIZES, help="行数档位，如 10k 100k 1M 10M")
+    parser.add_argument("--only", nargs="+", choices=list(GENERATORS), help="只测这些生成器")
+    parser.add_argument("--input", default=str(DEFAULT_INPUT), help="当作分布来源的真实数据")
+    parser.add_argument("--work", default=str(DEFAULT_WORK_DIR), help="合成数据和生成器输出放这里")
+    parser.add_argument("--report", help="JSON 报告路径，默认 <work>/bench_report.json")
+    parser.add_argument("--timeout", type=int, default=DEFAULT_TIMEOUT, help="单个生成器的超时（秒）")
+    parser.add_argument("--seed", type=int, default=SEED)
+    parser.add_argument("--regen", action="store_true", help="合成数据已经有了也重新造")
+    parser.add_argument("--worker", nargs=3, metavar=("DATA", "GENERATOR", "OUT"), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        run_worker(*args.worker)
+        return
+
+    work_dir = Path(args.work)
+    report_path = Path(args.report) if args.report else work_dir / "bench_report.json"
+    names = args.only or list(GENERATORS)
+    report = {
+        "started_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "source": str(args.input),
+        "seed": args.seed,
+        "timeout_s": args.timeout,
+        "results": [],
+    }
+
+    for size in args.sizes:
+        n_rows = parse_size(size)
+        data_path = make_dataset(n_rows, work_dir, args.input, args.seed, args.regen)
+        out_dir = work_dir / f"out_{size_label(n_rows)}"
+        for name in names:
+            res = run_one(data_path, name, out_dir, args.timeout)
+            report["results"].append({"size": size_label(n_rows), "rows": n_rows, "generator": name, **res})
+            write_report(report, report_path)  # 每跑完一个就落盘，10M 档跑一半中断也有结果
+
+            if res["status"] == "ok":
+                print(f"[{size_label(n_rows)}] {name}: 读 {res['load_s']:.2f}s，生成 {res['build_s']:.2f}s，"
+                      f"写 {res['write_s']:.2f}s，峰值内存 {res['peak_rss_mb']:.0f} MB")
+            else:
+                print(f"[{size_label(n_rows)}] {name}: {res['status']}（{res['wall_s']:.0f}s）")
+
+    report["finished_at"] = time.strftime("%Y-%m-%d %H:%M:%S")
+    write_report(report, report_path)
+    print(f"报告 → {report_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+import argparse
+import time
+from graphlib import TopologicalSorter
+
+from build_artifacts import DEFAULT_CACHE_DIR, DEFAULT_INPUT, DEFAULT_OUT_DIR, GENERATORS, BuildState, write_outputs
+from build_manifest import MANIFEST_NAME, BuildManifest
+
+
+# ========= 一次读数据，生成看板 static/data 下的全部 JSON =========
+# 默认增量：输出目录里的 build_manifest.json 记着每个产物的输入哈希和生成器版本，
+# 没变的跳过，过期的按依赖顺序重跑。
+# 薪资分位数用按月的可合并草图，草图缓存在 --cache 目录：过期的生成器重跑时也只扫变了的月份。
+# 用法：
+#   python build_all.py                               # 增量重建
+#   python build_all.py --force                       # 不管清单，全部重建
+#   python build_all.py --only skill cockpit          # 只看部分生成器（连带它们的依赖）
+#   python build_all.py --input clean_ai_jobs_columnar --out /tmp/data
+
+
+def build_order(names):
+    """names 连同它们依赖的生成器，按依赖拓扑序排好（同一层按 GENERATORS 的登记顺序）。"""
+    wanted = set()
+    todo = list(names)
+    while todo:
+        name = todo.pop()
+        if name not in wanted:
+            wanted.add(name)
+            todo.extend(GENERATORS[name].deps)
+
+    rank = {name: i for i, name in enumerate(GENERATORS)}
+    sorter = TopologicalSorter({n: GENERATORS[n].deps for n in wanted})
+    sorter.prepare()
+    order = []
+    while sorter.is_active():
+        ready = sorted(sorter.get_ready(), key=rank.get)
+        order.extend(ready)
+        sorter.done(*ready)
+    return order
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="生成看板用的全部 JSON（只读一次数据，增量构建）")
+    parser.add_argument("--input", default=str(DEFAULT_INPUT),
+                        help="cleaned_data.csv，或 columnar_store 写出的分区目录")
+    parser.add_argument("--out", default=str(DEFAULT_OUT_DIR), help="输出目录，默认 ai_dashboard/static/data")
+    parser.add_argument("--cache", default=str(DEFAULT_CACHE_DIR), help="按月薪资草图的缓存目录")
+    parser.add_argument("--only", nargs="+", choices=list(GENERATORS), help="只跑这些生成器")
+    parser.add_argument("--force", action="store_true", help="忽略 build_manifest.json，全部重建")
+    parser.add_argument("--list", action="store_true", help="列出所有生成器后退出")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for name, gen in GENERATORS.items():
+            deps = f"（依赖 {', '.join(gen.deps)}）" if gen.deps else ""
+            print(f"{name}{deps}")
+        return
+
+    t0 = time.time()
+    state = BuildState.load(args.input, cache_dir=args.cache)
+    _ = state.skills  # 技能长表在这里统一拆好，后面的生成器都直接用
+    print(f"读取 {args.input}：{len(state.df)} 行，{len(state.partitions())} 个月份分区，"
+          f"{len(state.skills)} 条技能记录，耗时 {time.time() - t0:.2f}s")
+
+    manifest = BuildManifest(args.out)
+    built = skipped = total_files = 0
+    for name in build_order(args.only or list(GENERATORS)):
+        gen = GENERATORS[name]
+        code = gen.code_hash
+        inputs = state.partition_hashes(gen.columns)
+        deps = {d: manifest.output_hashes(d) for d in gen.deps}
+
+        reason = "--force" if args.force else manifest.stale_reason(name, code, inputs, deps)
+        if reason is None:
+            skipped += 1
+            print(f"[{name}] 最新，跳过")
+            continue
+
+        t1 = time.time()
+        paths = write_outputs(gen(state), args.out)
+        manifest.record(name, code, inputs, deps, paths)
+        built += 1
+        total_files += len(paths)
+        print(f"[{name}] {reason} → {', '.join(p.name for p in paths)}（{time.time() - t1:.2f}s）")
+
+    print(f"完成：重建 {built} 个生成器（{total_files} 个文件），跳过 {skipped} 个，"
+          f"清单 {MANIFEST_NAME} → {args.out}，总耗时 {time.time() - t0:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,1166 @@
+import hashlib
+import inspect
+import json
+import math
+import re
+import itertools
+import sys
+import types
+from collections import Counter, defaultdict
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from columnar_store import load_cleaned, to_csv_frame
+from salary_sketch import SalarySketch, group_sketches
+from skill_cooccur import CooccurrenceEngine
+
+
+# ========= 看板 static/data 下各个 JSON 的生成器 =========
+# 原来九个脚本各自 read_csv 一遍、各自用不同的正则拆技能。
+# 这里把它们改成一组生成器函数，共用同一个 BuildState：
+#   - 数据只读一次（CSV 或 columnar_store 的分区目录都行）
+#   - 核心技能列表只拆一次，拆出来的 (岗位, 技能) 长表所有生成器共用
+# 每个生成器返回 {文件名: 要写出的对象}，由 build_all.py 或原来的脚本负责写盘。
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_INPUT = REPO_DIR / "data" / "cleaned_data.csv"
+DEFAULT_OUT_DIR = REPO_DIR / "ai_dashboard" / "static" / "data"
+DEFAULT_CACHE_DIR = REPO_DIR / "data" / "build_cache"
+
+SKILL_COL = "核心技能列表"
+TAG_COL = "AI标签列表"
+SALARY_COL = "中位月薪_元"
+PARTITION_COL = "发布月份"
+
+# 统一的技能分隔符：顿号、中英文逗号、中英文分号、斜杠、竖线、空白
+SKILL_SPLIT_RE = re.compile(r"[、，,;；/\|\s]+")
+
+EXPERIENCE_ORDER = [
+    "实习/应届",
+    "0-1年",
+    "1-3年",
+    "2-3年",
+    "2-5年",
+    "3-5年",
+    "5-10年",
+    "10年以上",
+    "无经验要求",
+]
+
+
+def split_skills(text):
+    """把“核心技能列表”拆成单个技能字符串列表"""
+    if not isinstance(text, str):
+        return []
+    return [p.strip() for p in SKILL_SPLIT_RE.split(text) if p.strip()]
+
+
+class BuildState:
+    """
+    一次构建里所有生成器共享的数据。df 保持 CSV 读出来的形态，生成器不要原地改它。
+    cache_dir 设了的话，按月的薪资草图会缓存在这里（见 salary_sketches）。
+    """
+
+    def __init__(self, df, cache_dir=None):
+        self.df = df
+        self.cache_dir = cache_dir
+        self.skill_lists = df[SKILL_COL].map(split_skills) if SKILL_COL in df.columns \
+            else pd.Series([[] for _ in range(len(df))], index=df.index)
+        self._skills = None
+        self._skill_counter = None
+        self._skill_jobs = None
+        self._skill_index = None
+        self._cooccurrence = None
+        self._col_hashes = {}
+        self._partitions = None
+        self._sketches = {}
+
+    @classmethod
+    def load(cls, path=DEFAULT_INPUT, cache_dir=None):
+        """path 是 CSV 就直接解析；是 columnar_store 的分区目录就读列式文件再转回 CSV 形态。"""
+        path = Path(path)
+        if path.is_dir():
+            return cls(to_csv_frame(load_cleaned(path)), cache_dir)
+        return cls(pd.read_csv(path), cache_dir)
+
+    @property
+    def skills(self):
+        """(job, skill) 长表：job 是 df 的行号，一行岗位有几个技能就有几行。"""
+        if self._skills is None:
+            s = self.skill_lists.explode().dropna()
+            self._skills = pd.DataFrame({"job": s.index, "skill": s.to_numpy()})
+        return self._skills
+
+    @property
+    def skill_jobs(self):
+        """
+        去重后的 (skill, pos) 表，按技能排好：同一岗位重复写了两次的技能只算一次。
+        pos 是 df 里的行位置（不是 index 标签），可以直接拿去 numpy 取值。
+        """
+        if self._skill_jobs is None:
+            pos = pd.Series(np.arange(len(self.df)), index=self.df.index)
+            pairs = pd.DataFrame({"skill": self.skills["skill"].to_numpy(),
+                                  "pos": pos.loc[self.skills["job"]].to_numpy()})
+            self._skill_jobs = pairs.drop_duplicates().sort_values(["skill", "pos"], kind="stable") \
+                .reset_index(drop=True)
+        return self._skill_jobs
+
+    @property
+    def skill_index(self):
+        """倒排索引：技能 → 含这个技能的行位置数组（精确匹配，升序）。"""
+        if self._skill_index is None:
+            jobs = self.skill_jobs
+            bounds = np.flatnonzero(jobs["skill"].to_numpy()[1:] != jobs["skill"].to_numpy()[:-1]) + 1
+            starts = np.r_[0, bounds]
+            ends = np.r_[bounds, len(jobs)]
+            pos = jobs["pos"].to_numpy()
+            self._skill_index = {
+                jobs["skill"].iat[a]: pos[a:b] for a, b in zip(starts, ends)
+            } if len(jobs) else {}
+        return self._skill_index
+
+    @property
+    def cooccurrence(self):
+        """岗位 × 技能稀疏矩阵上的共现引擎（skill_cooccur.py）。"""
+        if self._cooccurrence is None:
+            jobs = self.skill_jobs
+            self._cooccurrence = CooccurrenceEngine(jobs["skill"].to_numpy(), jobs["pos"].to_numpy(), len(self.df))
+        return self._cooccurrence
+
+    @property
+    def skill_counter(self):
+        """全表技能词频，顺序和逐行累加的 Counter 一致（同频按首次出现先后）。"""
+        if self._skill_counter is None:
+            self._skill_counter = Counter(self.skills["skill"])
+        return self._skill_counter
+
+
+    def partitions(self):
+        """发布月份 → 这个月的行位置（没有月份的行归到 unknown），和 columnar_store 的分区一致。"""
+        if self._partitions is None:
+            if PARTITION_COL in self.df.columns:
+                keys = self.df[PARTITION_COL].astype(object).where(self.df[PARTITION_COL].notna(), "unknown")
+                keys = keys.map(lambda m: str(m).strip() or "unknown")
+            else:
+                keys = pd.Series("unknown", index=self.df.index)
+            self._partitions = {k: np.asarray(v) for k, v in keys.groupby(keys.to_numpy()).indices.items()}
+        return self._partitions
+
+    def partition_hashes(self, columns):
+        """
+        每个分区只看 columns 这几列（连同行号）算一个内容哈希。
+        生成器没读的列改了，不会让它的产物过期。
+        """
+        cols = [c for c in columns if c in self.df.columns]
+        for c in cols:
+            if c not in self._col_hashes:
+                self._col_hashes[c] = pd.util.hash_pandas_object(self.df[c], index=True).to_numpy()
+        out = {}
+        for part, pos in sorted(self.partitions().items()):
+            h = hashlib.sha256()
+            for c in cols:
+                h.update(c.encode("utf-8"))
+                h.update(self._col_hashes[c][pos].tobytes())
+            out[part] = h.hexdigest()[:16]
+        return out
+
+    def salary_sketches(self, name, columns, keys, pos=None):
+        """
+        每个格子一个可合并的薪资草图（salary_sketch.py），返回 {key: SalarySketch}，按 key 首次出现的先后排。
+        keys[i] 是第 pos[i] 行所在的格子（pos 默认就是每一行），NaN key、没有薪资的行不计入。
+
+        先按发布月份分区各自建草图，再跨月合并。设了 cache_dir 时每个月的草图落盘到
+        <cache_dir>/<name>.sketches.json，下次构建时 columns + 薪资列的分区哈希没变的月份直接读回来，
+        追加一个月只扫这个月的行。同名的草图一次构建里只算一遍。
+        """
+        if name in self._sketches:
+            return self._sketches[name]
+
+        pos = np.arange(len(self.df)) if pos is None else np.asarray(pos, dtype=np.int64)
+        keys = np.asarray(keys, dtype=object)
+        salaries = pd.to_numeric(self.df[SALARY_COL], errors="coerce").to_numpy(dtype=float)[pos]
+        hashes = self.partition_hashes(list(columns) + [SALARY_COL])
+
+        cache_path = Path(self.cache_dir) / f"{name}.sketches.json" if self.cache_dir else None
+        cached = {}
+        if cache_path is not None and cache_path.exists():
+            try:
+                with open(cache_path, "r", encoding="utf-8") as f:
+                    cached = json.load(f)
+            except (OSError, ValueError):
+                print(f"[warn] {cache_path} 读不了，草图全部重算")
+
+        parts = self.partitions()
+        row_part = np.empty(len(self.df), dtype=object)
+        for part, rows in parts.items():
+            row_part[rows] = part
+        entry_part = row_part[pos]
+
+        monthly = {}
+        for part in sorted(parts):
+            entry = cached.get(part)
+            if entry is None or entry.get("hash") != hashes[part]:
+                sel = entry_part == part
+                codes, uniques = pd.factorize(keys[sel])
+                sketches = group_sketches(codes, salaries[sel], len(uniques))
+                entry = {"hash": hashes[part], "cells": {k: sk.to_dict() for k, sk in zip(uniques, sketches) if sk.n}}
+            monthly[part] = entry
+
+        if cache_path is not None and monthly != cached:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = cache_path.with_suffix(".tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(monthly, f, ensure_ascii=False)
+            tmp.replace(cache_path)
+
+        by_key = defaultdict(list)
+        for part in sorted(monthly):
+            for k, d in monthly[part]["cells"].items():
+                by_key[k].append(SalarySketch.from_dict(d))
+        valid = ~np.isnan(salaries) & pd.notna(keys)
+        self._sketches[name] = {k: SalarySketch.merged(by_key[k]) for k in pd.unique(keys[valid])}
+        return self._sketches[name]
+
+
+def write_outputs(outputs, out_dir):
+    """把生成器的结果写成 JSON，返回写出的路径列表。"""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for name, payload in outputs.items():
+        path = out_dir / name
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(payload, f, ensure_ascii=False, indent=2)
+        paths.append(path)
+    return paths
+
+
+# ============================
+# 首页：趋势 / Geo / 玫瑰 / 词云（原 index_json_build.py）
+# ============================
+
+def build_index(state):
+    df = state.df
+
+    required_cols = ["发布月份", "主要AI方向", "工作城市", "中位月薪_元", "核心技能列表", "AI标签列表"]
+    missing = [c for c in required_cols if c not in df.columns]
+    if missing:
+        raise ValueError(f"缺少必要字段: {missing}")
+
+    # ① 多折线趋势图：按 AI 方向总量取 Top5，月份补齐
+    direction_counts = df["主要AI方向"].value_counts()
+    top_directions = direction_counts.head(5).index.tolist()
+    months = sorted(df["发布月份"].dropna().unique().tolist())
+
+    trend_series = []
+    for direction in top_directions:
+        sub = df[df["主要AI方向"] == direction]
+        counts_by_month = sub.groupby("发布月份").size()
+        data = [int(counts_by_month.get(m, 0)) for m in months]
+        trend_series.append({
+            "name": direction,
+            "type": "line",    # 给前端 ECharts 直接用
+            "smooth": True,
+            "data": data
+        })
+
+    trend_payload = {
+        "months": months,
+        "series": trend_series
+    }
+
+    # ② 全国岗位 Geo 气泡图
+    geo_group = (
+        df.groupby("工作城市")
+          .agg(jobs=("招聘岗位", "size"), salary=("中位月薪_元", "mean"))
+          .reset_index()
+    )
+    geo_group = geo_group[geo_group["工作城市"].notna()]
+
+    geo_list = []
+    for _, row in geo_group.iterrows():
+        item = {"name": str(row["工作城市"]).strip(), "value": int(row["jobs"])}
+        if pd.notna(row["salary"]):
+            item["salary"] = float(row["salary"])
+        geo_list.append(item)
+
+    # ③ 岗位类别玫瑰图（AI方向）Top12
+    rose_group = (
+        df.groupby("主要AI方向")
+          .agg(jobs=("招聘岗位", "size"), salary=("中位月薪_元", "mean"))
+          .reset_index()
+    )
+    rose_group = rose_group[rose_group["主要AI方向"].notna()]
+    rose_group = rose_group.sort_values("jobs", ascending=False).head(12)
+
+    rose_list = []
+    for _, row in rose_group.iterrows():
+        item = {"name": str(row["主要AI方向"]).strip(), "value": int(row["jobs"])}
+        if pd.notna(row["salary"]):
+            item["salary"] = float(row["salary"])
+        rose_list.append(item)
+
+    # ④ AI 技能词云：核心技能 + AI 标签一起数，取 Top100
+    skills_counter = Counter(state.skill_counter)
+    for text in df[TAG_COL]:
+        skills_counter.update(split_skills(text))
+    sorted_skills = sorted(skills_counter.items(), key=lambda x: x[1], reverse=True)[:100]
+    wc_list = [{"name": name, "value": int(count)} for name, count in sorted_skills]
+
+    return {
+        "trend.json": trend_payload,
+        "geo.json": geo_list,
+        "rose.json": rose_list,
+        "wordcloud.json": wc_list,
+    }
+
+
+# ============================
+# 人才画像：学历 / 薪资区间 / 经验箱线（原 talent_json_build.py）
+# ============================
+
+def build_talent(state):
+    salary_col = "中位月薪_元"
+    degree_col = "学历层级"
+    exp_col = "经验段"
+    df = state.df[[degree_col, exp_col]].copy()
+    df[salary_col] = pd.to_numeric(state.df[salary_col], errors="coerce")
+
+    # ⑬ / ⑯ 学历占比（玫瑰图 + 漏斗图）
+    degree_counts = df[degree_col].dropna().value_counts().reset_index()
+    degree_counts.columns = ["degree", "count"]
+    degree_counts = degree_counts.sort_values("count", ascending=False)
+
+    degree_counts_json = {
+        "degrees": degree_counts["degree"].astype(str).tolist(),
+        "counts": degree_counts["count"].astype(int).tolist(),
+        "data": [
+            {"name": str(row["degree"]), "value": int(row["count"])}
+            for _, row in degree_counts.iterrows()
+        ]
+    }
+
+    # ⑭ 学历 × 薪资 Bar，用中位数排序
+    degree_salary = (
+        df[[degree_col, salary_col]]
+        .dropna()
+        .groupby(degree_col)[salary_col]
+        .agg(["count", "mean", "median", "min", "max"])
+        .reset_index()
+    )
+    degree_salary = degree_salary.sort_values("median")
+
+    degree_salary_json = {
+        "degrees": degree_salary[degree_col].astype(str).tolist(),
+        "count": degree_salary["count"].astype(int).tolist(),
+        "mean": degree_salary["mean"].round(2).tolist(),
+        "median": degree_salary["median"].round(2).tolist(),
+        "min": degree_salary["min"].round(2).tolist(),
+        "max": degree_salary["max"].round(2).tolist()
+    }
+
+    # ⑮ 薪资区间分布直方图，左闭右开
+    bins = [0, 5000, 10000, 15000, 20000, 30000, 50000, np.inf]
+    labels = ["0-5k", "5k-10k", "10k-15k", "15k-20k", "20k-30k", "30k-50k", "50k+"]
+    salary_bin = pd.cut(df[salary_col].dropna(), bins=bins, labels=labels, right=False, include_lowest=True)
+    bin_counts = salary_bin.value_counts().reindex(labels, fill_value=0)
+
+    salary_bins_json = {
+        "bins": labels,
+        "counts": bin_counts.astype(int).tolist(),
+        "bin_edges": [float(b) if np.isfinite(b) else "inf" for b in bins]
+    }
+
+    # ⑰ 经验 × 薪资箱线图（按月的薪资草图合并出来，追加月份不用重扫全表）
+    exp_sketches = state.salary_sketches("talent_exp", [exp_col], state.df[exp_col].to_numpy())
+    box_categories = []
+    box_data = []
+    for exp in sorted(exp_sketches):
+        box_categories.append(str(exp))
+        box_data.append(exp_sketches[exp].five_number())
+
+    experience_salary_boxplot_json = {
+        "categories": box_categories,
+        "boxData": box_data,
+        "outliers": []
+    }
+
+    return {
+        "degree_counts.json": degree_counts_json,
+        "degree_salary.json": degree_salary_json,
+        "salary_bins.json": salary_bins_json,
+        "experience_salary_boxplot.json": experience_salary_boxplot_json,
+    }
+
+
+# ============================
+# 城市区域：大区汇总 / 城市 × 月份折线（原 city_json_build2.py）
+# ============================
+
+REGION_CITIES = [
+    ("华东", {
+        "上海", "南京", "苏州", "杭州", "宁波", "无锡", "常州", "南通", "扬州", "镇江",
+        "嘉兴", "湖州", "绍兴", "台州", "温州",
+        "合肥", "芜湖", "马鞍山", "蚌埠", "安庆", "阜阳",
+        "福州", "厦门", "泉州", "莆田", "龙岩",
+        "济南", "青岛", "烟台", "威海", "淄博", "潍坊", "临沂", "济宁", "泰安", "东营", "滨州", "德州"
+    }),
+    ("华南", {
+        "广州", "深圳", "东莞", "佛山", "中山", "珠海", "惠州", "江门", "肇庆", "汕头", "湛江", "茂名",
+        "南宁", "柳州", "桂林", "北海", "玉林",
+        "海口", "三亚",
+        "昆明", "曲靖", "大理", "红河", "玉溪"
+    }),
+    ("华北", {
+        "北京", "天津", "石家庄", "唐山", "保定", "秦皇岛", "廊坊", "邯郸", "沧州", "承德",
+        "太原", "大同", "长治", "晋中", "运城"
+    }),
+    ("东北", {"沈阳", "大连", "长春", "哈尔滨", "吉林", "鞍山", "抚顺", "营口", "盘锦", "本溪", "四平"}),
+    ("华中", {"武汉", "长沙", "郑州", "南昌", "合肥", "襄阳", "宜昌", "洛阳", "新乡", "信阳", "九江", "赣州"}),
+    ("西南", {"成都", "重庆", "贵阳", "昆明", "拉萨", "绵阳", "南充", "乐山", "泸州", "德阳"}),
+    ("西北", {"西安", "兰州", "银川", "乌鲁木齐", "西宁", "榆林", "咸阳", "宝鸡"}),
+]
+
+
+def map_region(city):
+    """根据城市名映射到大区"""
+    for region, cities in REGION_CITIES:
+        if city in cities:
+            return region
+    return "其他地区"
+
+
+def build_city(state):
+    df = state.df
+
+    # 一、区域分布：按大区聚合岗位数量 & 平均中位月薪
+    region_group = (
+        df.assign(大区=df["工作城市"].map(map_region))
+          .groupby("大区")
+          .agg(
+              job_count=("招聘岗位", "size"),
+              avg_salary=("中位月薪_元", "mean")
+          )
+          .reset_index()
+          .sort_values("job_count", ascending=False)
+    )
+
+    region_summary = [
+        {
+            "name": row["大区"],
+            "job_count": int(row["job_count"]),
+            "avg_salary": (
+                round(row["avg_salary"], 2)
+                if not math.isnan(row["avg_salary"]) else None
+            )
+        }
+        for _, row in region_group.iterrows()
+    ]
+
+    # 二、城市 × 月份 多折线：岗位数 Top K 城市
+    K_CITY = 9
+    city_counts = (
+        df.groupby("工作城市")["招聘岗位"]
+          .count()
+          .sort_values(ascending=False)
+    )
+    top_cities = city_counts.head(K_CITY).index.tolist()
+    months = sorted(df["发布月份"].unique().tolist())
+
+    sub = df[df["工作城市"].isin(top_cities)]
+    pivot = (
+        sub.pivot_table(
+            index="工作城市",
+            columns="发布月份",
+            values="招聘岗位",
+            aggfunc="count",
+            fill_value=0
+        )
+        .reindex(index=top_cities, columns=months, fill_value=0)
+    )
+
+    city_month_trend = {
+        "months": months,
+        "series": [
+            {"name": city, "data": [int(pivot.loc[city, m]) for m in months]}
+            for city in top_cities
+        ]
+    }
+
+    return {
+        "region_summary.json": region_summary,
+        "city_month_trend.json": city_month_trend,
+    }
+
+
+# ============================
+# 岗位类别：玫瑰 / 对比 / 类别词云 / 雷达（原 job_json_build.py）
+# ============================
+
+def build_job(state):
+    CAT_COL = "主要AI方向"
+    TOP_K_CATEGORY = 10
+    TOP_WORDS = 80  # 每个类别词云最多展示多少个词
+
+    df = state.df.dropna(subset=[CAT_COL])
+
+    cat_group = (
+        df.groupby(CAT_COL)
+          .agg(
+              job_count=("招聘岗位", "size"),
+              avg_salary=("中位月薪_元", "mean"),
+              city_count=("工作城市", "nunique"),
+              month_count=("发布月份", "nunique")
+          )
+          .reset_index()
+          .sort_values("job_count", ascending=False)
+    )
+    cat_top = cat_group.head(TOP_K_CATEGORY).reset_index(drop=True)
+
+    def round_or_none(x):
+        return round(x, 2) if not math.isnan(x) else None
+
+    # ⑨ 岗位类别占比玫瑰图
+    rose_data = [
+        {
+            "name": row[CAT_COL],
+            "value": int(row["job_count"]),
+            "avg_salary": round_or_none(row["avg_salary"])
+        }
+        for _, row in cat_top.iterrows()
+    ]
+
+    # ⑩ 类别平均薪资对比
+    compare_json = {
+        "categories": cat_top[CAT_COL].tolist(),
+        "job_count": [int(x) for x in cat_top["job_count"]],
+        "avg_salary": [round_or_none(x) for x in cat_top["avg_salary"]]
+    }
+
+    outputs = {
+        "job_category_rose.json": rose_data,
+        "job_category_compare.json": compare_json,
+    }
+
+    # ⑪ 类别词云：用共享的技能长表，按岗位所属类别计数
+    if SKILL_COL in df.columns:
+        top_cats = set(cat_top[CAT_COL])
+        skills = state.skills
+        job_cat = df[CAT_COL]
+        skills = skills[skills["job"].isin(job_cat.index[job_cat.isin(top_cats)])]
+
+        cat_word_counter = defaultdict(Counter)
+        for cat, skill in zip(job_cat.loc[skills["job"]].to_numpy(), skills["skill"].to_numpy()):
+            cat_word_counter[cat][skill] += 1
+
+        category_wordcloud = []
+        for cat in cat_top[CAT_COL]:
+            items = cat_word_counter.get(cat, Counter()).most_common(TOP_WORDS)
+            if not items:
+                continue
+            category_wordcloud.append({
+                "category": cat,
+                "words": [{"name": w, "value": int(c)} for w, c in items]
+            })
+        outputs["category_wordcloud.json"] = category_wordcloud
+    else:
+        print("⚠️ 未找到技能列：核心技能列表，请确认列名")
+
+    # ⑫ 岗位能力雷达图：岗位数量 / 平均薪资 / 城市覆盖数 / 活跃月份数
+    def with_margin(x, ratio=1.1):
+        return int(math.ceil(x * ratio)) if x > 0 else 1
+
+    has_rows = len(cat_top) > 0
+    indicators = [
+        {"name": "岗位数量", "max": with_margin(int(cat_top["job_count"].max()) if has_rows else 0)},
+        {"name": "平均薪资", "max": with_margin(float(cat_top["avg_salary"].max()) if has_rows else 0.0)},
+        {"name": "城市覆盖数", "max": with_margin(int(cat_top["city_count"].max()) if has_rows else 0)},
+        {"name": "活跃月份数", "max": with_margin(int(cat_top["month_count"].max()) if has_rows else 0)},
+    ]
+
+    series_radar = []
+    for _, row in cat_top.iterrows():
+        series_radar.append({
+            "name": row[CAT_COL],
+            "value": [
+                int(row["job_count"]),
+                float(row["avg_salary"]) if not math.isnan(row["avg_salary"]) else 0.0,
+                int(row["city_count"]),
+                int(row["month_count"]),
+            ]
+        })
+
+    outputs["job_category_radar.json"] = {
+        "indicators": indicators,
+        "series": series_radar
+    }
+    return outputs
+
+
+# ============================
+# 技能：Top10 排行 / 共现关系图（原 skill_json_build.py）
+# ============================
+
+# 共现关系分两份：
+#   - skills_graph.json：页面上力导向布局画的总览图，只留连边最多的 GRAPH_TOP_N 个技能，不要孤立点；
+#     边只画共现数 >= GRAPH_MIN_COOCCURRENCE 的
+#   - skill_neighbors.json：至少出现在 GRAPH_MIN_JOBS 个岗位里的全部技能各自按 PMI 排的 top-k 邻居，
+#     页面上点了节点才去拉，用来往外展开
+GRAPH_TOP_N = 60
+GRAPH_MIN_JOBS = 2
+GRAPH_MIN_COOCCURRENCE = 5
+GRAPH_NEIGHBOR_K = 10
+GRAPH_NEIGHBOR_MIN_COUNT = 2
+
+
+def graph_node(name, cnt, max_count, jobs, degree):
+    # 节点尺寸控制在 10 ~ 30：size ≈ 10 + 20 * (频数 / 最大频数) ^ 0.6
+    ratio = cnt / max_count if max_count > 0 else 0
+    return {
+        "id": name,
+        "name": name,
+        "value": cnt,
+        "symbolSize": round(10 + 20 * (ratio ** 0.6), 2),
+        "jobs": jobs,
+        "degree": degree,
+    }
+
+
+def build_skill(state, top_n_for_graph=GRAPH_TOP_N):
+    top_n_for_rank = 10            # TopN 排行榜
+
+    skill_counter = state.skill_counter
+
+    # ⑲ 技能 Top10 排行榜
+    top_skills_rank = skill_counter.most_common(top_n_for_rank)
+    skills_top10_json = {
+        "skills": [name for name, cnt in top_skills_rank],
+        "counts": [int(cnt) for name, cnt in top_skills_rank],
+        "data": [{"name": name, "value": int(cnt)} for name, cnt in top_skills_rank]
+    }
+
+    # ⑳ 技能共现关系图：XᵀX 一次算出所有技能对，先在全部技能上算连边数，再挑连边最多的画总览
+    engine = state.cooccurrence
+    candidates = [
+        name for name, _ in skill_counter.most_common()
+        if engine.job_counts[engine.index[name]] >= GRAPH_MIN_JOBS
+    ]
+    rows, cols, _ = engine.pairs(GRAPH_MIN_COOCCURRENCE, candidates)
+    degree = np.bincount(np.r_[rows, cols], minlength=len(engine.vocab))
+    # 连边数一样的按频数（most_common 的先后）排
+    ranked = sorted((n for n in candidates if degree[engine.index[n]] > 0),
+                    key=lambda n: -degree[engine.index[n]])
+    graph_skills = ranked[:top_n_for_graph]
+
+    rows, cols, counts = engine.pairs(GRAPH_MIN_COOCCURRENCE, graph_skills)
+    lifts = engine.lift(rows, cols, counts)
+    # 截断以后邻居全在 top N 外面的节点也是孤立点，去掉
+    linked = set(engine.vocab[rows]) | set(engine.vocab[cols])
+    graph_skills = [n for n in graph_skills if n in linked]
+
+    max_count = max(skill_counter[s] for s in candidates) if candidates else 1
+    nodes = [
+        graph_node(name, int(skill_counter[name]), max_count,
+                   int(engine.job_counts[engine.index[name]]), int(degree[engine.index[name]]))
+        for name in graph_skills
+    ]
+    links = [
+        {
+            "source": engine.vocab[i],
+            "target": engine.vocab[j],
+            "value": int(w),
+            "lift": round(float(lf), 3),
+        }
+        for i, j, w, lf in zip(rows, cols, counts, lifts)
+    ]
+
+    # ㉑ 每个技能的高关联邻居，点节点时按需加载
+    neighbors = {}
+    for name in candidates:
+        top = engine.neighbors(name, GRAPH_NEIGHBOR_K, "pmi", GRAPH_NEIGHBOR_MIN_COUNT)
+        if top:
+            neighbors[name] = {
+                "value": int(skill_counter[name]),
+                "jobs": int(engine.job_counts[engine.index[name]]),
+                "neighbors": top,
+            }
+
+    return {
+        "skills_top10.json": skills_top10_json,
+        "skills_graph.json": {"nodes": nodes, "links": links},
+        "skill_neighbors.json": {"by": "pmi", "k": GRAPH_NEIGHBOR_K, "max_value": max_count, "skills": neighbors},
+    }
+
+
+# ============================
+# 技能下钻（原 skill_dril_json_build.py / skill_dril_json_build2.py）
+# ============================
+
+# 下钻默认覆盖全部技能（再按 min_jobs 过滤冷门的）；想只要前 N 个就传 top_n
+SKILL_DRILL_TOP_N = None
+SKILL_DRILL_MIN_JOBS = 10
+
+SKILL_HIST_BINS = [0, 5000, 10000, 15000, 20000, 30000, 40000, 60000, 100000]
+SKILL_HIST_LABELS = ["0-5k", "5-10k", "10-15k", "15-20k", "20-30k", "30-40k", "40-60k", "60k+"]
+
+
+def _ranked_counts(long, col, top=None):
+    """
+    skill × col 计数，每个技能内按数量降序、同数量按首次出现先后（和 value_counts 一样），
+    返回 {skill: [{"name", "value"}]}。
+    """
+    sub = long[["skill", col]].dropna()
+    counts = sub.groupby(["skill", col], sort=False).size().rename("n").reset_index()
+    counts = counts.sort_values("n", ascending=False, kind="stable")
+    if top is not None:
+        counts = counts.groupby("skill", sort=False).head(top)
+    out = defaultdict(list)
+    for skill, name, n in zip(counts["skill"].tolist(), counts[col].tolist(), counts["n"].tolist()):
+        out[skill].append({"name": name, "value": int(n)})
+    return out
+
+
+def skill_drill_stats(state, top_n=SKILL_DRILL_TOP_N, min_jobs=SKILL_DRILL_MIN_JOBS, city_top=10, direction_top=8):
+    """
+    一次分组算出所有技能的下钻数据，返回 (按热度排好的技能列表, {skill: 统计})。
+    技能按倒排索引精确匹配，不再是子串包含（"C" 不会再算进 "C++" 的岗位）。
+    """
+    df = state.df
+    jobs = state.skill_jobs
+    long = pd.DataFrame({
+        "skill": jobs["skill"].to_numpy(),
+        "salary": df["中位月薪_元"].to_numpy()[jobs["pos"].to_numpy()],
+        "exp": df["经验段"].to_numpy()[jobs["pos"].to_numpy()],
+        "city": df["工作城市"].to_numpy()[jobs["pos"].to_numpy()],
+        "direction": df["主要AI方向"].to_numpy()[jobs["pos"].to_numpy()],
+    })
+    long["salary"] = pd.to_numeric(long["salary"], errors="coerce")
+
+    total_jobs = long.groupby("skill", sort=False).size()
+    ranked = [skill for skill, _ in state.skill_counter.most_common(top_n)]
+    ranked = [skill for skill in ranked if total_jobs.get(skill, 0) >= min_jobs]
+    # 后面的分组只对要输出的技能做
+    long = long[long["skill"].isin(ranked)]
+
+    paid = long.dropna(subset=["salary"])
+    sketches = state.salary_sketches("skill_drill", [SKILL_COL], jobs["skill"].to_numpy(), jobs["pos"].to_numpy())
+
+    hist = (
+        pd.cut(paid["salary"], bins=SKILL_HIST_BINS, labels=SKILL_HIST_LABELS, right=False, include_lowest=True)
+        .groupby(paid["skill"].to_numpy(), observed=False).value_counts()
+        .unstack(fill_value=0)
+        .reindex(columns=SKILL_HIST_LABELS, fill_value=0)
+    )
+
+    exp_mean = paid[paid["exp"].isin(EXPERIENCE_ORDER)].groupby(["skill", "exp"], sort=False)["salary"].mean()
+    exp_salary = defaultdict(dict)
+    for (skill, exp), v in exp_mean.items():
+        exp_salary[skill][exp] = float(round(v, 2))
+
+    city_counts = _ranked_counts(long, "city", city_top)
+    direction_top_counts = _ranked_counts(long, "direction", direction_top)
+    direction_all_counts = _ranked_counts(long, "direction")
+
+    hist = hist.to_dict("index")
+
+    stats = {}
+    for skill in ranked:
+        sketch = sketches.get(skill)
+        n = sketch.n if sketch is not None else 0
+        stats[skill] = {
+            "total_jobs": int(total_jobs[skill]),
+            "salary_box": sketch.five_number() if n else None,
+            "salary_hist": [
+                {"bin": label, "value": int(hist[skill][label])} for label in SKILL_HIST_LABELS
+            ] if n else [],
+            "salary_sample_size": n,
+            # 经验段按 EXPERIENCE_ORDER 的顺序排
+            "exp_salary": {e: exp_salary[skill][e] for e in EXPERIENCE_ORDER if e in exp_salary[skill]},
+            "city_counts": city_counts.get(skill, []),
+            "direction_top": direction_top_counts.get(skill, []),
+            "direction_all": direction_all_counts.get(skill, []),
+        }
+    return ranked, stats
+
+
+def build_skill_drill(state, top_n=SKILL_DRILL_TOP_N, min_jobs=SKILL_DRILL_MIN_JOBS):
+    """技能下钻页：薪资箱线、经验-薪资曲线、城市 Top10、方向 Top8"""
+    ranked, stats = skill_drill_stats(state, top_n, min_jobs)
+    skill_data = {
+        skill: {
+            "total_jobs": st["total_jobs"],
+            "salary_box": st["salary_box"],
+            "salary_sample_size": st["salary_sample_size"],
+            "exp_salary": st["exp_salary"],
+            "city_counts": st["city_counts"],
+            "direction_counts": st["direction_top"],
+        }
+        for skill, st in ((s, stats[s]) for s in ranked)
+    }
+    return {
+        "skill_drill.json": {
+            "skills": list(skill_data.keys()),
+            "experience_order": EXPERIENCE_ORDER,
+            "skill_data": skill_data,
+        }
+    }
+
+
+def build_skill_drill_hist(state, top_n=SKILL_DRILL_TOP_N, min_jobs=SKILL_DRILL_MIN_JOBS):
+    """技能下钻第二版：薪资直方图 + 经验段雷达（带全局 radar_max）+ 完整方向分布"""
+    df = state.df
+    for c in ["工作城市", "中位月薪_元", "经验段", "主要AI方向", "核心技能列表"]:
+        if c not in df.columns:
+            raise ValueError(f"缺少必要字段：{c}")
+    if df["中位月薪_元"].dropna().empty:
+        raise ValueError("中位月薪_元 列没有有效数据")
+
+    # 经验段雷达图的全局最大值，稍微放大一点做上限
+    exp_salary_global = []
+    for exp in EXPERIENCE_ORDER:
+        tmp = df[df["经验段"] == exp]["中位月薪_元"].dropna()
+        if not tmp.empty:
+            exp_salary_global.append(tmp.mean())
+    radar_max = float(max(exp_salary_global) * 1.1) if exp_salary_global else 50000.0
+
+    ranked, stats = skill_drill_stats(state, top_n, min_jobs)
+    skill_data = {
+        skill: {
+            "total_jobs": st["total_jobs"],
+            "salary_hist": st["salary_hist"],
+            "salary_sample_size": st["salary_sample_size"],
+            "exp_salary": st["exp_salary"],
+            "city_counts": st["city_counts"],
+            "direction_counts": st["direction_all"],
+        }
+        for skill, st in ((s, stats[s]) for s in ranked)
+    }
+    return {
+        "skill_drill_hist.json": {
+            "skills": list(skill_data.keys()),
+            "experience_order": EXPERIENCE_ORDER,
+            "salary_bins": SKILL_HIST_LABELS,
+            "radar_max": radar_max,
+            "skill_data": skill_data
+        }
+    }
+
+
+# ============================
+# 技能驾驶舱（原 cockpit_data.py / city_drill_json_build.py）
+# ============================
+
+def salary_cell(sketch):
+    """一个格子的薪资区间：n/min/q1/median/q3/max。"""
+    lo, q1, median, q3, hi = sketch.five_number()
+    return {"n_jobs": sketch.n, "min": lo, "q1": q1, "median": median, "q3": q3, "max": hi}
+
+
+def build_cockpit(state):
+    df = state.df
+    required_cols = ["工作城市", "主要AI方向", "学历层级", "经验段", "中位月薪_元", "核心技能列表"]
+    missing = [c for c in required_cols if c not in df.columns]
+    if missing:
+        raise SystemExit(f"缺少必要字段: {missing}")
+
+    # 岗位列表 jobs：前端可以直接用这个做筛选；没有薪资就先跳过，不参与 gauge
+    paid = df["中位月薪_元"].notna().to_numpy()
+    sub = df[paid]
+    dims = {}
+    for key, col in (("city", "工作城市"), ("direction", "主要AI方向"), ("degree", "学历层级"), ("exp", "经验段")):
+        dims[key] = [None if pd.isna(v) else str(v) for v in sub[col].tolist()]
+    salaries = sub["中位月薪_元"].astype(float).to_numpy()
+    skill_lists = state.skill_lists[paid].tolist()
+
+    jobs = [
+        {
+            "id": int(idx),
+            "city": city,
+            "direction": direction,
+            "degree": degree,
+            "exp": exp,
+            "salary": float(salary),
+            "skills": skills,
+        }
+        for idx, city, direction, degree, exp, salary, skills in zip(
+            sub.index.tolist(), dims["city"], dims["direction"], dims["degree"], dims["exp"],
+            salaries.tolist(), skill_lists,
+        )
+    ]
+
+    # 维度列表，给前端填下拉框用；经验段只保留数据里真实存在的
+    degree_list = sorted({d for d in dims["degree"] if d})
+    exp_seen = set(dims["exp"])
+    exp_list = [e for e in EXPERIENCE_ORDER if e in exp_seen]
+    city_list = sorted({c for c in dims["city"] if c})
+    direction_list = sorted({d for d in dims["direction"] if d})
+
+    # 组合统计： (学历, 经验段, 城市, 方向) → 薪资区间，缺失值在 key 里写成 "None"
+    combo_stats = {key: salary_cell(sk) for key, sk in cube_base_sketches(state).items()}
+
+    # 全局技能频率（当作推荐“应该补”的候选池之一）
+    skill_counter = Counter(itertools.chain.from_iterable(skill_lists))
+    global_skill_top = [
+        {"name": name, "value": int(cnt)}
+        for name, cnt in skill_counter.most_common(50)
+    ]
+
+    return {
+        "skill_cockpit.json": {
+            "degree_list": degree_list,
+            "exp_list": exp_list,
+            "city_list": city_list,
+            "direction_list": direction_list,
+            "jobs": jobs,                 # 原子样本，前端自由筛
+            "combo_stats": combo_stats,   # 组合 → 薪资区间，用于 gauge
+            "global_skill_top": global_skill_top,  # 全局热门技能
+        }
+    }
+
+
+# 驾驶舱 roll-up cube：四个维度各自可以取 "*"（不限），共 16 种组合全部预先算好。
+# 样本数不到 CUBE_MIN_JOBS 的格子记一个 fallback，指向按 CUBE_ROLLUP_ORDER 逐级放宽后
+# 最近的、样本够的祖先；前端缺格子时也按同样的顺序往上放宽，最多查 5 次就一定有结果。
+CUBE_DIMS = [("degree", "学历层级"), ("exp", "经验段"), ("city", "工作城市"), ("direction", "主要AI方向")]
+CUBE_ROLLUP_ORDER = ["city", "direction", "exp", "degree"]
+CUBE_MIN_JOBS = 5
+WILDCARD = "*"
+
+
+def cube_parents(key):
+    """按 CUBE_ROLLUP_ORDER 逐级把维度换成 * 得到的祖先 key 列表（不含自身）。"""
+    parts = dict(zip([d for d, _ in CUBE_DIMS], key.split("|")))
+    out = []
+    for dim in CUBE_ROLLUP_ORDER:
+        if parts[dim] != WILDCARD:
+            parts[dim] = WILDCARD
+            out.append("|".join(parts[d] for d, _ in CUBE_DIMS))
+    return out
+
+
+def cube_base_sketches(state):
+    """四个维度都不是 * 的最细格子 → 薪资草图；combo_stats 和 cube 共用（缓存名 cockpit_combo）。"""
+    values = [[str(v) if pd.notna(v) else "None" for v in state.df[col].tolist()] for _, col in CUBE_DIMS]
+    keys = ["|".join(parts) for parts in zip(*values)]
+    return state.salary_sketches("cockpit_combo", [col for _, col in CUBE_DIMS], keys)
+
+
+def build_cockpit_cube(state, min_jobs=CUBE_MIN_JOBS):
+    base = cube_base_sketches(state)
+
+    # 16 个 grouping set 都从最细格子上卷：只合并草图，不再回头扫原始行
+    children = defaultdict(list)
+    for mask in itertools.product([False, True], repeat=len(CUBE_DIMS)):
+        for key, sketch in base.items():
+            parts = key.split("|")
+            children["|".join(WILDCARD if wild else p for wild, p in zip(mask, parts))].append(sketch)
+    cells = {key: salary_cell(SalarySketch.merged(sketches)) for key, sketches in children.items()}
+
+    # 样本太少的格子只留个数和 fallback，省体积
+    for key, cell in cells.items():
+        if cell["n_jobs"] >= min_jobs:
+            continue
+        parent = next((p for p in cube_parents(key) if cells.get(p, {}).get("n_jobs", 0) >= min_jobs),
+                      WILDCARD + ("|" + WILDCARD) * (len(CUBE_DIMS) - 1))
+        cells[key] = {"n_jobs": cell["n_jobs"], "fallback": parent}
+
+    return {
+        "skill_cockpit_cube.json": {
+            "dims": [d for d, _ in CUBE_DIMS],
+            "wildcard": WILDCARD,
+            "rollup_order": CUBE_ROLLUP_ORDER,
+            "min_jobs": min_jobs,
+            "cells": cells,
+        }
+    }
+
+
+# ============================
+# 多维：城市 → 方向桑基 / 经验 × 学历 × 薪资气泡（原 multi_json_build.py）
+# ============================
+
+def build_multi(state):
+    city_col = "工作城市"
+    direction_col = "主要AI方向"
+    exp_col = "经验段"
+    degree_col = "学历层级"
+    salary_col = "中位月薪_元"
+
+    # 统一类型（缺失值也会变成字符串 "nan"，和原脚本保持一致）
+    df = state.df[[city_col, direction_col, exp_col, degree_col]].astype(str)
+    df[salary_col] = pd.to_numeric(state.df[salary_col], errors="coerce")
+
+    # ① 城市 → 主要AI方向 桑基图
+    sankey_df = (
+        df[[city_col, direction_col]]
+        .dropna()
+        .groupby([city_col, direction_col])
+        .size()
+        .reset_index(name="count")
+    )
+    cities = sankey_df[city_col].unique().tolist()
+    directions = sankey_df[direction_col].unique().tolist()
+
+    sankey_json = {
+        "nodes": [{"name": name} for name in (cities + directions)],
+        "links": [
+            {"source": row[city_col], "target": row[direction_col], "value": int(row["count"])}
+            for _, row in sankey_df.iterrows()
+        ]
+    }
+
+    # ② 经验 × 薪资 × 学历 气泡图：X 经验段，Y 平均薪资，颜色学历，大小岗位数
+    bubble_df = (
+        df[[exp_col, degree_col, salary_col]]
+        .dropna()
+        .groupby([exp_col, degree_col])[salary_col]
+        .agg(["count", "mean"])
+        .reset_index()
+    )
+
+    bubble_json = {
+        "exp_levels": df[exp_col].dropna().unique().tolist(),
+        "degree_levels": df[degree_col].dropna().unique().tolist(),
+        "data": [
+            {
+                "exp": row[exp_col],
+                "degree": row[degree_col],
+                "avg_salary": round(float(row["mean"]), 2),
+                "count": int(row["count"])
+            }
+            for _, row in bubble_df.iterrows()
+        ]
+    }
+
+    return {
+        "city_direction_sankey.json": sankey_json,
+        "exp_degree_salary_bubble.json": bubble_json,
+    }
+
+
+def _code_names(code):
+    """函数体（含内部的 lambda / 推导式）里引用到的全局名字"""
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            names |= _code_names(const)
+    return names
+
+
+def _plain_repr(value):
+    """常量的稳定文本表示；不是普通数据（模块、numpy 对象之类）返回 None。集合排好序，不受哈希随机化影响。"""
+    if isinstance(value, (set, frozenset)):
+        items = [_plain_repr(v) for v in value]
+        return None if None in items else "{" + ", ".join(sorted(items)) + "}"
+    if isinstance(value, (list, tuple)):
+        items = [_plain_repr(v) for v in value]
+        return None if None in items else "[" + ", ".join(items) + "]"
+    if isinstance(value, dict):
+        items = [(_plain_repr(k), _plain_repr(v)) for k, v in value.items()]
+        return None if any(None in kv for kv in items) else "{" + ", ".join(f"{k}: {v}" for k, v in items) + "}"
+    if value is None or isinstance(value, (bool, int, float, str, Path, re.Pattern)):
+        return repr(value)
+    return None
+
+
+def code_fingerprint(func, roots=()):
+    """
+    生成器的代码指纹：从生成器函数（和 roots，比如所有生成器都拿到的 BuildState）出发，
+    顺着引用把用到的东西都算进去：
+      - 同一个模块里的函数 / 类：源码，再接着往下找它们引用的
+      - 模块级常量、函数默认参数：值（GRAPH_TOP_N 这种改了也要重建）
+      - 同目录下的其它模块（salary_sketch.py、skill_cooccur.py ……）：整个文件，再接着找它 import 的同目录模块
+    numpy / pandas 这些第三方库不管。
+    """
+    home = func.__globals__
+    local_dir = Path(home["__file__"]).resolve().parent
+    h = hashlib.sha256()
+    seen = set()
+
+    def local_module(obj):
+        mod = obj if isinstance(obj, types.ModuleType) else sys.modules.get(getattr(obj, "__module__", None))
+        path = getattr(mod, "__file__", None)
+        if path and Path(path).resolve().parent == local_dir:
+            return mod
+        return None
+
+    def visit_module(mod):
+        if mod.__name__ in seen:
+            return
+        seen.add(mod.__name__)
+        h.update(Path(mod.__file__).read_bytes())
+        for value in vars(mod).values():
+            other = local_module(value)
+            if other is not None and other is not mod:
+                visit_module(other)
+
+    def visit(obj):
+        if id(obj) in seen:
+            return
+        seen.add(id(obj))
+        h.update(inspect.getsource(obj).encode("utf-8"))
+        if isinstance(obj, type):
+            members = [getattr(v, "__func__", None) or getattr(v, "fget", None) or v for v in vars(obj).values()]
+            codes = [m.__code__ for m in members if isinstance(m, types.FunctionType)]
+        else:
+            codes = [obj.__code__]
+            h.update(repr((_plain_repr(obj.__defaults__), _plain_repr(obj.__kwdefaults__))).encode("utf-8"))
+        for name in sorted(set().union(*map(_code_names, codes))):
+            if name not in home:
+                continue
+            value = home[name]
+            if isinstance(value, (types.FunctionType, type)) and value.__module__ == home["__name__"]:
+                visit(value)
+            elif local_module(value) is not None:
+                visit_module(local_module(value))
+            elif _plain_repr(value) is not None:
+                h.update(f"{name}={_plain_repr(value)};".encode("utf-8"))
+
+    for obj in (func, *roots):
+        visit(obj)
+    return h.hexdigest()[:12]
+
+
+class Generator:
+    """
+    一个生成器的登记信息：
+    - columns：它读了哪些列，增量构建只对这些列算输入哈希
+    - version：想强制重建时手动加一（用到的函数、常量、同目录模块改了会自动算进 code_hash）
+    - deps：依赖的其它生成器（它们的产物也算输入），build_all.py 按依赖顺序跑
+    """
+
+    def __init__(self, name, func, columns, version=1, deps=()):
+        self.name = name
+        self.func = func
+        self.columns = list(columns)
+        self.version = version
+        self.deps = list(deps)
+
+    def __call__(self, state):
+        return self.func(state)
+
+    @property
+    def code_hash(self):
+        """手动版本号 + code_fingerprint，生成器或它用到的任何本地代码一改产物就算过期。"""
+        return f"v{self.version}-" + code_fingerprint(self.func, roots=(BuildState,))
+
+
+SALARY_COLS = [SALARY_COL]
+
+# 名字 → 生成器，build_all.py 按依赖顺序跑（没有依赖的按这里的先后）
+GENERATORS = {g.name: g for g in [
+    Generator("index", build_index,
+              ["发布月份", "主要AI方向", "工作城市", "招聘岗位", SKILL_COL, TAG_COL] + SALARY_COLS),
+    Generator("talent", build_talent, ["学历层级", "经验段"] + SALARY_COLS),
+    Generator("city", build_city, ["工作城市", "招聘岗位", "发布月份"] + SALARY_COLS),
+    Generator("job", build_job, ["主要AI方向", "招聘岗位", "工作城市", "发布月份", SKILL_COL] + SALARY_COLS),
+    Generator("skill", build_skill, [SKILL_COL]),
+    Generator("skill_drill", build_skill_drill, [SKILL_COL, "经验段", "工作城市", "主要AI方向"] + SALARY_COLS),
+    Generator("skill_drill_hist", build_skill_drill_hist,
+              [SKILL_COL, "经验段", "工作城市", "主要AI方向"] + SALARY_COLS),
+    Generator("cockpit", build_cockpit, [SKILL_COL, "学历层级", "经验段", "工作城市", "主要AI方向"] + SALARY_COLS),
+    Generator("cockpit_cube", build_cockpit_cube, ["学历层级", "经验段", "工作城市", "主要AI方向"] + SALARY_COLS),
+    Generator("multi", build_multi, ["工作城市", "主要AI方向", "经验段", "学历层级"] + SALARY_COLS),
+]}
@@ -0,0 +1,157 @@
+import argparse
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+from build_artifacts import DEFAULT_OUT_DIR, REPO_DIR
+from clean_llm import CONCURRENCY, MODEL_NAME, get_pool
+from tolerant_json import THINK_RE
+
+# 提示词和 Flask 接口用同一套渲染函数（ai_dashboard/insight_context.py），版本指纹才对得上
+sys.path.insert(0, str(REPO_DIR / "ai_dashboard"))
+from insight_context import (  # noqa: E402
+    SUMMARY_FILES, SummaryContext, city_insight_messages, messages_version, render_data_summary,
+    skill_insight_messages,
+)
+from insight_store import INSIGHTS_FILE  # noqa: E402
+
+
+# ========= 离线预生成看板的 AI 洞察 =========
+# 洞察文本只在 static/data 下的 JSON 变了才需要变，没必要每次打开页面都现场生成。
+# 这里在构建阶段用 clean_llm.py 那套本地 Ollama（同样的 endpoint 池和模型）把
+#   - 总览页（main_dashboard）
+#   - city_drill.json 里的每个城市
+#   - skill_drill.json 里的每个技能
+# 的洞察一次性生成好，写到 static/data/insights.json。每条记着生成时 messages 的指纹，
+# 数据没变的条目下次直接跳过；Flask 接口指纹对得上就从磁盘流，对不上再现场生成。
+# 用法：
+#   python build_insights.py                        # 增量：只生成新增 / 数据变了的条目
+#   python build_insights.py --only overview city   # 只跑部分
+#   python build_insights.py --limit 5 --force      # 试跑几条
+
+KINDS = ["overview", "city", "skill"]
+TEMPERATURE = 0.3
+SAVE_EVERY = 20  # 每生成这么多条落一次盘，中途中断不白跑
+
+
+def load_json(out_dir, name):
+    with open(Path(out_dir) / name, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def insight_tasks(out_dir, kinds):
+    """[(kind, key, messages)]，和接口那边按同样的数据渲染"""
+    tasks = []
+    if "overview" in kinds:
+        ctx = SummaryContext(None, render_data_summary(*(load_json(out_dir, n) for n in SUMMARY_FILES)))
+        tasks.append(("overview", "main_dashboard", ctx.main_insight_messages()))
+    if "city" in kinds:
+        drill = load_json(out_dir, "city_drill.json")
+        for city in drill.get("cities", []):
+            if city in drill.get("city_data", {}):
+                tasks.append(("city", city, city_insight_messages(city, drill.get("months", []),
+                                                                   drill["city_data"][city])))
+    if "skill" in kinds:
+        drill = load_json(out_dir, "skill_drill.json")
+        for skill in drill.get("skills", []):
+            if skill in drill.get("skill_data", {}):
+                tasks.append(("skill", skill, skill_insight_messages(skill, drill["skill_data"][skill])))
+    return tasks
+
+
+def generate_text(messages, model):
+    payload = {
+        "model": model,
+        "messages": messages,
+        "stream": False,
+        "options": {"temperature": TEMPERATURE},
+    }
+    data = get_pool().post(payload, timeout=600)
+    return THINK_RE.sub("", data["message"]["content"]).strip()
+
+
+def save(doc, path):
+    doc["generated_at"] = time.strftime("%Y-%m-%d %H:%M:%S")
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(doc, f, ensure_ascii=False, indent=2)
+    tmp.replace(path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="用本地 Ollama 离线预生成看板的 AI 洞察")
+    parser.add_argument("--out", default=str(DEFAULT_OUT_DIR), help="static/data 目录（读数据、写 insights.json）")
+    parser.add_argument("--only", nargs="+", choices=KINDS, help="只生成这几类")
+    parser.add_argument("--model", default=MODEL_NAME)
+    parser.add_argument("--concurrency", type=int, default=CONCURRENCY)
+    parser.add_argument("--limit", type=int, help="最多生成多少条（试跑用）")
+    parser.add_argument("--force", action="store_true", help="数据没变的条目也重新生成")
+    args = parser.parse_args(argv)
+
+    kinds = args.only or KINDS
+    path = Path(args.out) / INSIGHTS_FILE
+    doc = {"model": args.model, "insights": {}}
+    if path.exists():
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                doc = json.load(f)
+        except (OSError, ValueError):
+            print(f"[warn] {path} 读不了，全部重新生成")
+    doc["model"] = args.model
+    insights = doc.setdefault("insights", {})
+
+    tasks = insight_tasks(args.out, kinds)
+    # 数据里已经没有的城市 / 技能顺手清掉
+    for kind in kinds:
+        keep = {key for k, key, _ in tasks if k == kind}
+        insights[kind] = {key: v for key, v in insights.get(kind, {}).items() if key in keep}
+
+    todo = []
+    for kind, key, messages in tasks:
+        version = messages_version(messages)
+        old = insights[kind].get(key)
+        if not args.force and old and old.get("version") == version and old.get("text"):
+            continue
+        todo.append((kind, key, messages, version))
+    if args.limit is not None:
+        todo = todo[:args.limit]
+    print(f"共 {len(tasks)} 条洞察，{len(tasks) - len(todo)} 条数据没变跳过，待生成 {len(todo)} 条"
+          f"（模型 {args.model}，并发 {args.concurrency}）")
+
+    t0 = time.time()
+    done = failed = 0
+    with ThreadPoolExecutor(max_workers=max(1, args.concurrency)) as ex:
+        futures = {ex.submit(generate_text, messages, args.model): (kind, key, version)
+                   for kind, key, messages, version in todo}
+        for fut in as_completed(futures):
+            kind, key, version = futures[fut]
+            try:
+                text = fut.result()
+            except Exception as e:
+                failed += 1
+                print(f"[{kind}] {key} 生成失败：{e}")
+                continue
+            if not text:
+                failed += 1
+                print(f"[{kind}] {key} 模型返回空文本")
+                continue
+            insights[kind][key] = {
+                "version": version,
+                "model": args.model,
+                "text": text,
+                "generated_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+            }
+            done += 1
+            if done % SAVE_EVERY == 0:
+                save(doc, path)
+                print(f"  已生成 {done}/{len(todo)}，耗时 {time.time() - t0:.0f}s")
+
+    save(doc, path)
+    get_pool().report()
+    print(f"完成：生成 {done} 条，失败 {failed} 条，耗时 {time.time() - t0:.1f}s → {path}")
+
+
+if __name__ == "__main__":
+    main()
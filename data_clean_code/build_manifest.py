@@ -0,0 +1,79 @@
+import hashlib
+import json
+import time
+from pathlib import Path
+
+
+# ========= 增量构建清单 build_manifest.json =========
+# 放在输出目录里，每个生成器记一条：
+#   code     生成器版本 + 源码哈希
+#   inputs   {发布月份: 该分区里它读的那几列的内容哈希}
+#   deps     {依赖的生成器: 它产物的哈希}
+#   outputs  {文件名: 文件内容哈希}，文件被手动改过或删了也算过期
+# 三样都没变就跳过；追加一个月只会让读到这个月的生成器重跑。
+
+MANIFEST_NAME = "build_manifest.json"
+
+
+def file_hash(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()[:16]
+
+
+class BuildManifest:
+    def __init__(self, out_dir):
+        self.out_dir = Path(out_dir)
+        self.path = self.out_dir / MANIFEST_NAME
+        self.entries = {}
+        if self.path.exists():
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self.entries = json.load(f).get("artifacts", {})
+            except (OSError, ValueError):
+                print(f"[warn] {self.path} 读不了，当作全部过期")
+                self.entries = {}
+
+    def output_hashes(self, name):
+        return self.entries.get(name, {}).get("outputs", {})
+
+    def stale_reason(self, name, code, inputs, deps):
+        """返回过期原因；最新的话返回 None。"""
+        old = self.entries.get(name)
+        if old is None:
+            return "第一次构建"
+        if old.get("code") != code:
+            return "生成器代码变了"
+        if old.get("deps") != deps:
+            return "依赖的产物变了：" + "、".join(sorted(k for k in deps if old.get("deps", {}).get(k) != deps[k]))
+        old_inputs = old.get("inputs", {})
+        if old_inputs != inputs:
+            changed = sorted(k for k in set(inputs) | set(old_inputs) if old_inputs.get(k) != inputs.get(k))
+            return "输入分区变了：" + "、".join(changed)
+        for fname, h in old.get("outputs", {}).items():
+            path = self.out_dir / fname
+            if not path.exists():
+                return f"{fname} 不存在"
+            if file_hash(path) != h:
+                return f"{fname} 被改动过"
+        return None
+
+    def record(self, name, code, inputs, deps, paths):
+        self.entries[name] = {
+            "code": code,
+            "inputs": inputs,
+            "deps": deps,
+            "outputs": {Path(p).name: file_hash(p) for p in paths},
+            "built_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+        }
+        self.save()
+
+    def save(self):
+        # 每跑完一个生成器就落盘，中途中断也不会丢掉已经完成的部分
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"artifacts": self.entries}, f, ensure_ascii=False, indent=2, sort_keys=True)
+        tmp.replace(self.path)
@@ -1,22 +1,105 @@
 import pandas as pd
-import json
-import requests
 import time
 import csv
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
 
+from columnar_store import ColumnarWriter
+from compact_desc import compact_description, compact_stats, count_tokens
+from dedup import DedupIndex
+from llm_cache import CleanCache, make_cache_key
+from ollama_pool import EndpointPool
+from raw_reader import count_excel_rows, iter_raw_chunks
+from run_metrics import RunMetrics, active_rows, add_to_active, new_row_metrics, set_active
+from tolerant_json import extract_json, repair_stats
+from rule_normalize import RULES_VERSION, normalize_rules, rule_fields
+
 # ========= 配置 =========
 RAW_PATH = "/home/user/jdy/hw2/人工智能招聘大数据2024年.xlsx"
 
+# 每行的埋点（排队、模型耗时、token、重试、兜底、解析耗时）写到这个 JSONL，结尾打印汇总
+METRICS_LOG = "/home/user/jdy/clean_llm_metrics.jsonl"
+
+# 流式读取原始 xlsx：按 READ_CHUNK_SIZE 行一块边读边清洗，内存不随文件大小涨，
+# 第一条模型调用几秒内就能开始。False = 原来的 pd.read_excel 整表读入
+STREAM_READ = True
+READ_CHUNK_SIZE = 2000
+
 # 输出文件名
 OUT_CSV = "/home/user/jdy/clean_ai_jobs_ollama.csv"
 
+# 同时写一份按发布月份分区的列式结果（columnar_store.py），下游用 load_cleaned() 直接读；
+# 设为 None 就只写 CSV
+OUT_COLUMNAR = "/home/user/jdy/clean_ai_jobs_columnar"
+# CSV 每攒多少行 flush 一次（断点续跑靠结果缓存，不靠 CSV 里已经写了多少行，所以不用每行 flush）
+WRITE_FLUSH_ROWS = 200
+# 列式结果每攒多少行落一批分区文件，太小会产生一堆碎文件
+COLUMNAR_FLUSH_ROWS = 5000
+
 
 OLLAMA_URL = "http://localhost:11434/api/chat"
+# 多台机器都能跑模型时全部列进来，按在途请求最少分发，超时的机器会被暂时踢出；
+# CONCURRENCY 按“每台能扛的并发 × 台数”来设
+OLLAMA_URLS = [OLLAMA_URL]
+# 连续失败几次踢出，踢出多少秒后放回来重试
+ENDPOINT_MAX_FAILURES = 3
+ENDPOINT_EJECT_SEC = 60
 MODEL_NAME = "qwen3:32b"
 
-SLEEP_SEC = 0.5  # 每条之间停一下，别把机器榨干
+# 小模型优先的级联模式：先用 SMALL_MODEL_NAME 清洗，结果过不了 validate_clean_obj
+# （经验段/学历层级枚举、整数薪资、字段集合）才升级到 MODEL_NAME 重做
+CASCADE = False
+SMALL_MODEL_NAME = "qwen3:4b"
+
+SLEEP_SEC = 0.5  # 每条之间停一下，别把机器榨干（只在 CONCURRENCY = 1 时生效）
+
+# 结构化输出：把输出 JSON schema 传给 Ollama 的 format 参数，让模型按 schema 解码，
+# 基本不会再因为格式问题整条重新生成（需要 Ollama >= 0.5）
+STRUCTURED_OUTPUT = True
+
+# 并发清洗：同时在飞的请求数。1 = 原来的逐条模式；
+# 大于 1 时由线程池并发调用 ollama，按模型服务能扛住的并发数来调
+CONCURRENCY = 4
+# 批量模式：一次请求塞几条岗位。1 = 单条模式；
+# 调大能省掉重复的字段规范 prefill，但别超过 32B 模型的上下文窗口，对照结尾打印的 行/秒 来调
+BATCH_SIZE = 1
+# 已提交但还没写盘的行数上限（有界队列），防止结果在内存里越堆越多
+QUEUE_SIZE = CONCURRENCY * BATCH_SIZE * 4
+
+# 结果缓存 + 断点续跑：已经清洗过的行存进 SQLite，重跑时直接命中不再调模型。
+# 开启后 OUT_CSV 每次重写（缓存命中的行秒出），不会再出现追加导致的重复行
+USE_CACHE = True
+CACHE_PATH = "/home/user/jdy/clean_llm_cache.sqlite"
+
+# 规则快速通道：先对整张表跑一遍向量化规则（rule_normalize.py），
+# 学历/经验/薪资/城市等能确定的字段直接填，模型只补规则搞不定的字段
+# （岗位摘要、核心技能列表始终由模型给），prompt 和输出都短很多
+RULE_FAST_PATH = True
+
+# 清洗前判重：完全重复（hash）+ 近重复（MinHash/LSH，同企业同岗位同城市同薪资等、描述相似度超过阈值），
+# 一个簇只清洗代表行，结果分发给所有成员，发布日期/发布月份各用各的；
+# 代表行走了兜底结构的不分发，成员自己再清洗一次
+DEDUP = True
+DEDUP_THRESHOLD = 0.85
+# 最多记住多少个代表行（判重索引和结果都按这个上限淘汰）；太久之前的代表被挤掉后，成员行就老老实实自己清洗
+DEDUP_MEMORY = 50000
+
+# 职位描述压缩：去掉公司介绍/福利/声明之类的样板段落和重复句子，
+# 再按 token 预算截断（优先保留带技能词的句子），prompt 短了 prefill 就快。
+# DESC_TOKEN_BUDGET <= 0 表示只去样板不截断
+COMPACT_DESC = True
+DESC_TOKEN_BUDGET = 400
+
+# 参与 prompt 的原始字段，缓存 key 只看这些
+INPUT_FIELDS = [
+    "招聘岗位", "企业名称", "工作城市", "工作区域",
+    "最低月薪", "最高月薪",
+    "要求经验", "学历要求",
+    "人工智能关键词", "职位描述",
+]
 
 
 # ========= Prompt =========
@@ -25,11 +108,8 @@ SYSTEM_PROMPT = """你是一个招聘数据清洗助手，负责将原始招聘
 不要发挥想象，只根据给定内容进行合理推断。
 所有数字统一用阿拉伯数字，JSON 必须能被严格解析。"""
 
-USER_INSTRUCTION = """
-下面是一条人工智能相关岗位的招聘数据，请你根据原始字段，输出一个结构化 JSON。
-
-【原始数据】
-- 招聘岗位：{job_title}
+# 原始数据块：单条模式和批量模式共用
+RAW_DATA_TEMPLATE = """- 招聘岗位：{job_title}
 - 企业名称：{company_name}
 - 工作城市：{city}
 - 工作区域：{area}
@@ -38,9 +118,10 @@ USER_INSTRUCTION = """
 - 要求经验：{exp_raw}
 - 学历要求：{degree_raw}
 - 人工智能关键词：{ai_keywords_raw}
-- 职位描述：{job_desc}
+- 职位描述：{job_desc}"""
 
-【字段标准化要求】
+# 字段规范：批量模式下只发一次
+FIELD_SPEC = """【字段标准化要求】
 
 请你只返回一个 JSON 对象，字段必须是下面这些（字段名用中文，不能多也不能少）：
 
@@ -91,11 +172,92 @@ USER_INSTRUCTION = """
 3. 所有字段名必须完全等于上面给出的中文名称。
 """
 
+USER_INSTRUCTION = """
+下面是一条人工智能相关岗位的招聘数据，请你根据原始字段，输出一个结构化 JSON。
+
+【原始数据】
+""" + RAW_DATA_TEMPLATE + "\n\n" + FIELD_SPEC
+
+
+# 规则已经确定了一部分字段时用的精简 prompt：只描述还需要模型给的字段
+SLIM_INSTRUCTION = """
+下面是一条人工智能相关岗位的招聘数据，其中一部分字段已经处理好了，请你只补充下面列出的字段。
+
+【原始数据】
+{raw_data}
+
+【需要你返回的字段】（字段名用中文，不能多也不能少）
+{field_hints}
+
+【必须严格遵守】
+1. 只能返回 JSON 对象本身，不要任何多余说明。
+2. JSON 必须是合法的、可被 json.loads 解析。
+3. 所有字段名必须完全等于上面给出的中文名称。
+"""
+
+# 精简 prompt 里每个字段的一句话说明（完整版见 FIELD_SPEC）
+FIELD_HINTS = {
+    "招聘岗位": '- "招聘岗位": 标准化后的岗位名称（中文字符串）',
+    "企业名称": '- "企业名称": 企业名称（字符串）',
+    "工作城市": '- "工作城市": 工作城市，简化成市级，例如“北京市”→“北京”',
+    "工作区域": '- "工作区域": 工作区域，保留原文，去掉明显噪音',
+    "最低月薪_元": '- "最低月薪_元": 整数，元/月，无法确定用 null',
+    "最高月薪_元": '- "最高月薪_元": 整数，元/月，无法确定用 null',
+    "经验段": '- "经验段": 只能是 ["实习/应届","0-1年","1-3年","3-5年","5-10年","10年以上","无经验要求"] 之一',
+    "经验年限下限": '- "经验年限下限": 整数，无法确定用 null',
+    "经验年限上限": '- "经验年限上限": 整数，无法确定用 null',
+    "学历层级": '- "学历层级": 只能是 ["博士","硕士","本科","大专","中专及以下","不限"] 之一',
+    "AI标签列表": '- "AI标签列表": 1-5 个核心 AI 方向的中文数组，优先拆分“人工智能关键词”',
+    "主要AI方向": '- "主要AI方向": 从 AI标签列表 中选一个最能代表岗位方向的，没有合适的用 "人工智能"',
+    "岗位摘要": '- "岗位摘要": 用中文 20 个字左右概括岗位核心工作内容',
+    "核心技能列表": '- "核心技能列表": 从职位描述中提取 3-8 个关键技能词（数组）',
+}
+
+
+BATCH_INSTRUCTION = """
+下面是 {n} 条人工智能相关岗位的招聘数据，请你根据原始字段，为每一条分别输出一个结构化 JSON 对象。
+
+{items}
+
+{field_spec}
+
+【批量模式说明（优先于上面的返回格式要求）】
+1. 上面的字段要求针对单条岗位，请对每一条岗位分别生成一个这样的对象。
+2. 每个对象额外带一个整数字段 "序号"，等于该岗位的【第 N 条】编号。
+3. 把这 {n} 个对象按序号顺序放进一个 JSON 数组返回，只返回这个数组本身。
+"""
+
+# 枚举字段的合法取值，和 FIELD_SPEC 里写的一致
+EXP_LEVELS = ["实习/应届", "0-1年", "1-3年", "3-5年", "5-10年", "10年以上", "无经验要求"]
+DEGREE_LEVELS = ["博士", "硕士", "本科", "大专", "中专及以下", "不限"]
+INT_FIELDS = ["最低月薪_元", "最高月薪_元", "经验年限下限", "经验年限上限"]
+LIST_FIELDS = ["AI标签列表", "核心技能列表"]
+
+# 模型必须返回的字段（不能多也不能少）
+CLEAN_FIELDS = [
+    "招聘岗位", "企业名称", "工作城市", "工作区域",
+    "最低月薪_元", "最高月薪_元",
+    "经验段", "经验年限下限", "经验年限上限",
+    "学历层级", "AI标签列表", "主要AI方向",
+    "岗位摘要", "核心技能列表",
+]
+
 
 # ========= 调用 ollama =========
 
-def call_ollama(row_dict, retry=3):
-    user_prompt = USER_INSTRUCTION.format(
+def job_desc_for(row_dict):
+    """职位描述原文，开了 COMPACT_DESC 就换成压缩后的版本，并记一笔省了多少 token。"""
+    desc = row_dict.get("职位描述", "") or ""
+    if not COMPACT_DESC or not isinstance(desc, str):
+        return desc
+    short = compact_description(desc, DESC_TOKEN_BUDGET)
+    compact_stats.record(count_tokens(desc), count_tokens(short))
+    return short
+
+
+def prompt_kwargs(row_dict):
+    """原始行 → prompt 模板里的占位符。"""
+    return dict(
         job_title=row_dict.get("招聘岗位", "") or "",
         company_name=row_dict.get("企业名称", "") or "",
         city=row_dict.get("工作城市", "") or "",
@@ -105,11 +267,114 @@ def call_ollama(row_dict, retry=3):
         exp_raw=row_dict.get("要求经验", "") or "",
         degree_raw=row_dict.get("学历要求", "") or "",
         ai_keywords_raw=row_dict.get("人工智能关键词", "") or "",
-        job_desc=row_dict.get("职位描述", "") or "",
+        job_desc=job_desc_for(row_dict),
+    )
+
+
+def field_spec_for(fields):
+    """全字段用完整的 FIELD_SPEC，只要一部分字段时用 FIELD_HINTS 拼一个精简版。"""
+    if fields is None or set(fields) == set(CLEAN_FIELDS):
+        return FIELD_SPEC
+    return "【需要返回的字段】（字段名用中文，不能多也不能少）\n" + "\n".join(
+        FIELD_HINTS[f] for f in CLEAN_FIELDS if f in fields
+    )
+
+
+def build_user_prompt(row_dict, fields=None):
+    if fields is None or set(fields) == set(CLEAN_FIELDS):
+        return USER_INSTRUCTION.format(**prompt_kwargs(row_dict))
+    return SLIM_INSTRUCTION.format(
+        raw_data=RAW_DATA_TEMPLATE.format(**prompt_kwargs(row_dict)),
+        field_hints="\n".join(FIELD_HINTS[f] for f in CLEAN_FIELDS if f in fields),
+    )
+
+
+def build_batch_prompt(row_dicts, fields=None):
+    items = "\n\n".join(
+        f"【第 {i} 条】\n" + RAW_DATA_TEMPLATE.format(**prompt_kwargs(row_dict))
+        for i, row_dict in enumerate(row_dicts, start=1)
     )
+    return BATCH_INSTRUCTION.format(n=len(row_dicts), items=items, field_spec=field_spec_for(fields))
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """第一次用到时按 OLLAMA_URLS 建 endpoint 池，之后所有 worker 共用。"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = EndpointPool(
+                OLLAMA_URLS or [OLLAMA_URL],
+                max_failures=ENDPOINT_MAX_FAILURES,
+                eject_sec=ENDPOINT_EJECT_SEC,
+                pool_size=max(1, CONCURRENCY),
+            )
+        return _pool
+
+
+def build_output_schema(fields=None, batch=False):
+    """按 CLEAN_FIELDS 和枚举生成输出 JSON schema；batch=True 时外面包一层带“序号”的数组。"""
+    fields = CLEAN_FIELDS if fields is None else [f for f in CLEAN_FIELDS if f in fields]
+    props = {}
+    for f in fields:
+        if f == "经验段":
+            props[f] = {"type": "string", "enum": EXP_LEVELS}
+        elif f == "学历层级":
+            props[f] = {"type": "string", "enum": DEGREE_LEVELS}
+        elif f in INT_FIELDS:
+            props[f] = {"type": ["integer", "null"]}
+        elif f in LIST_FIELDS:
+            props[f] = {"type": "array", "items": {"type": "string"}}
+        else:
+            props[f] = {"type": "string"}
+    required = list(fields)
+    if batch:
+        props = {"序号": {"type": "integer"}, **props}
+        required = ["序号"] + required
+    schema = {
+        "type": "object",
+        "properties": props,
+        "required": required,
+        "additionalProperties": False,
+    }
+    if batch:
+        return {"type": "array", "items": schema}
+    return schema
+
+
+class RetryStats:
+    """整条重新生成的次数和白白浪费掉的生成时间，线程安全。"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.retries = 0
+        self.wasted_sec = 0.0
+
+    def record(self, failed, cost):
+        with self._lock:
+            self.calls += 1
+            if failed:
+                self.retries += 1
+                self.wasted_sec += cost
+
+    def report(self):
+        print(f"\n重试：{self.retries}/{self.calls} 次请求需要重新生成"
+              f"（{self.retries / max(self.calls, 1):.1%}），浪费生成时间 {self.wasted_sec:.1f}s；"
+              f"本地修复：尾部多余文字 {repair_stats.trailing_text} 次，截断 {repair_stats.truncated} 次，"
+              f"单引号 {repair_stats.quotes} 次")
+
+
+retry_stats = RetryStats()
+
 
+def post_ollama(user_prompt, model=None, schema=None):
+    """发一次请求，返回模型原始文本。model 默认用 MODEL_NAME；schema 不为空时走结构化输出。"""
     payload = {
-        "model": MODEL_NAME,
+        "model": model or MODEL_NAME,
         "messages": [
             {"role": "system", "content": SYSTEM_PROMPT},
             {"role": "user", "content": user_prompt},
@@ -119,38 +384,172 @@ def call_ollama(row_dict, retry=3):
             "temperature": 0.1
         }
     }
+    if schema is not None:
+        payload["format"] = schema
+    t0 = time.time()
+    data = get_pool().post(payload, timeout=600)
+    add_to_active("model_latency", time.time() - t0)
+    add_to_active("prompt_tokens", int(data.get("prompt_eval_count") or 0))
+    add_to_active("completion_tokens", int(data.get("eval_count") or 0))
+    return data["message"]["content"]
+
+
+def parse_model_json(content):
+    """容错解析：思考段、代码块、尾部多余文字、截断都在本地修（见 tolerant_json.py）。"""
+    t0 = time.time()
+    try:
+        return extract_json(content)
+    finally:
+        add_to_active("parse_time", time.time() - t0)
+
+
+def validate_clean_obj(obj, fields=None):
+    """检查单条结果是否合格，返回问题列表（空列表 = 合格）。fields 为要求的字段集合，默认全字段。"""
+    if not isinstance(obj, dict):
+        return ["不是 JSON 对象"]
+
+    fields = CLEAN_FIELDS if fields is None else fields
+    problems = []
+    keys = set(obj.keys())
+    missing = [k for k in fields if k not in keys]
+    extra = sorted(keys - set(fields))
+    if missing:
+        problems.append(f"缺少字段 {missing}")
+    if extra:
+        problems.append(f"多余字段 {extra}")
+
+    if "经验段" in obj and obj["经验段"] not in EXP_LEVELS:
+        problems.append(f"经验段取值非法：{obj['经验段']}")
+    if "学历层级" in obj and obj["学历层级"] not in DEGREE_LEVELS:
+        problems.append(f"学历层级取值非法：{obj['学历层级']}")
+    for k in INT_FIELDS:
+        v = obj.get(k)
+        if k in obj and v is not None and (isinstance(v, bool) or not isinstance(v, int)):
+            problems.append(f"{k} 不是整数：{v!r}")
+    for k in LIST_FIELDS:
+        if k in obj and not isinstance(obj[k], list):
+            problems.append(f"{k} 不是数组")
+    return problems
+
+
+def pick_fields(obj, fields):
+    """精简模式下模型顺手多给的已知字段直接丢掉，反正合并时以规则为准。"""
+    if fields is None or not isinstance(obj, dict):
+        return obj
+    return {k: v for k, v in obj.items() if k in fields or k not in CLEAN_FIELDS}
+
+
+class TierStats:
+    """级联模式下每一档模型的调用次数、通过率和耗时，线程安全。"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.tiers = {}
+
+    def record(self, tier, latency, ok, n=1):
+        with self._lock:
+            t = self.tiers.setdefault(tier, {"calls": 0, "rows": 0, "ok": 0, "latency": 0.0})
+            t["calls"] += 1
+            t["rows"] += n
+            t["ok"] += ok
+            t["latency"] += latency
+
+    def report(self):
+        with self._lock:
+            tiers = {k: dict(v) for k, v in self.tiers.items()}
+        if not tiers:
+            return
+        print("\n各档模型统计：")
+        for name, t in tiers.items():
+            print(f"  {name}: 调用 {t['calls']} 次 / {t['rows']} 条，通过 {t['ok']} 条"
+                  f"（{t['ok'] / max(t['rows'], 1):.1%}），平均每次 {t['latency'] / max(t['calls'], 1):.2f}s")
+        small = tiers.get(SMALL_MODEL_NAME)
+        large = tiers.get(MODEL_NAME)
+        if small and large and large["calls"]:
+            # 小模型放行的行如果都走大模型要花的时间，减去小模型实际花掉的时间
+            saved = small["ok"] * large["latency"] / large["calls"] - small["latency"]
+            print(f"  估算节省大模型时间：{saved / 3600:.2f} 小时")
+
+
+tier_stats = TierStats()
+
+
+def cache_model_name():
+    """缓存 key 里的模型名：级联模式下结果由两档模型共同决定。"""
+    return f"{SMALL_MODEL_NAME}>{MODEL_NAME}" if CASCADE else MODEL_NAME
+
+
+def call_ollama(row_dict, retry=3, fields=None, model=None):
+    user_prompt = build_user_prompt(row_dict, fields)
+    schema = build_output_schema(fields) if STRUCTURED_OUTPUT else None
+    required = CLEAN_FIELDS if fields is None else fields
 
     for attempt in range(retry):
+        t0 = time.time()
         try:
-            resp = requests.post(OLLAMA_URL, json=payload, timeout=600)
-            resp.raise_for_status()
-            data = resp.json()
-            content = data["message"]["content"]
-
-            text = content.strip()
-            if text.startswith("```"):
-                parts = text.split("```")
-                if len(parts) >= 3:
-                    text = parts[1]
-                text = text.strip()
-                if text.lower().startswith("json"):
-                    text = text[4:].strip()
-
-            try:
-                obj = json.loads(text)
-            except json.JSONDecodeError:
-                text2 = text.replace("'", '"')
-                obj = json.loads(text2)
-
+            content = post_ollama(user_prompt, model, schema)
+            obj = parse_model_json(content)
+            if not isinstance(obj, dict):
+                raise ValueError("返回的不是 JSON 对象")
+            # 截断修复后缺字段的，只能重新生成
+            missing = [k for k in required if k not in obj]
+            if missing:
+                raise ValueError(f"缺少字段 {missing}")
+            retry_stats.record(False, time.time() - t0)
             return obj
 
         except Exception as e:
+            retry_stats.record(True, time.time() - t0)
+            for m in active_rows():
+                m["retries"] += 1
             print(f"[warn] 调用 ollama 失败，第 {attempt+1} 次重试：{e}")
             time.sleep(1.5)
 
     raise RuntimeError("调用 ollama 多次失败，放弃这一行。")
 
 
+def call_ollama_batch(row_dicts, fields=None, model=None):
+    """
+    批量模式：N 条岗位拼进一个 prompt，字段规范只发一次，模型返回 JSON 数组。
+    返回和 row_dicts 等长的列表，解析失败或校验不过的位置是 None，交给调用方单条重试。
+    """
+    model = model or MODEL_NAME
+    t0 = time.time()
+    try:
+        schema = build_output_schema(fields, batch=True) if STRUCTURED_OUTPUT else None
+        arr = parse_model_json(post_ollama(build_batch_prompt(row_dicts, fields), model, schema))
+    except Exception as e:
+        print(f"[warn] 批量调用失败，{len(row_dicts)} 条全部拆成单条重试：{e}")
+        retry_stats.record(True, time.time() - t0)
+        tier_stats.record(model, time.time() - t0, 0, n=len(row_dicts))
+        return [None] * len(row_dicts)
+
+    if isinstance(arr, dict):
+        arr = [arr]
+    if not isinstance(arr, list):
+        arr = []
+
+    results = [None] * len(row_dicts)
+    for item in arr:
+        if not isinstance(item, dict):
+            continue
+        try:
+            pos = int(item.pop("序号")) - 1
+        except (KeyError, TypeError, ValueError):
+            continue
+        item = pick_fields(item, fields)
+        if 0 <= pos < len(row_dicts) and not validate_clean_obj(item, fields):
+            results[pos] = item
+
+    ok = sum(r is not None for r in results)
+    cost = time.time() - t0
+    retry_stats.record(False, cost)
+    tier_stats.record(model, cost, ok, n=len(row_dicts))
+    print(f"[batch] {len(row_dicts)} 条，合格 {ok} 条，耗时 {cost:.1f}s，"
+          f"{len(row_dicts) / max(cost, 1e-9):.2f} 行/秒")
+    return results
+
+
 def make_fallback(row_dict):
     """模型彻底挂了时的兜底结构，避免整表断掉。"""
     return {
@@ -171,15 +570,188 @@ def make_fallback(row_dict):
     }
 
 
-# ========= 主流程：一条处理一条写 =========
+def call_cascade(row_dict, fields=None):
+    """
+    单条清洗。级联模式下先让小模型做一次（不重试），校验通过直接用；
+    不通过或出错再交给大模型。非级联模式就是直接调 MODEL_NAME。
+    """
+    if CASCADE:
+        t0 = time.time()
+        try:
+            obj = pick_fields(call_ollama(row_dict, retry=1, fields=fields, model=SMALL_MODEL_NAME), fields)
+            problems = validate_clean_obj(obj, fields)
+        except Exception as e:
+            problems = [str(e)]
+        tier_stats.record(SMALL_MODEL_NAME, time.time() - t0, not problems)
+        if not problems:
+            return obj
+        print(f"[cascade] 小模型结果不合格，升级到 {MODEL_NAME}：{problems}")
+
+    t0 = time.time()
+    try:
+        obj = call_ollama(row_dict, fields=fields, model=MODEL_NAME)
+    except Exception:
+        tier_stats.record(MODEL_NAME, time.time() - t0, False)
+        raise
+    tier_stats.record(MODEL_NAME, time.time() - t0, not validate_clean_obj(pick_fields(obj, fields), fields))
+    return obj
+
+
+def missing_fields(row_dict):
+    """规则没确定、还得让模型给的字段（按 CLEAN_FIELDS 顺序）。"""
+    rules = row_dict.get("_rules") or {}
+    return [f for f in CLEAN_FIELDS if f not in rules]
+
+
+def merge_rule_fields(row_dict, obj):
+    """模型结果和规则结果合并，规则确定的字段以规则为准。"""
+    merged = {f: obj.get(f) for f in CLEAN_FIELDS if f in obj}
+    merged.update(row_dict.get("_rules") or {})
+    return merged
+
+
+# ========= 一组行的处理（worker） =========
+
+def clean_rows(row_dicts, cache=None, submitted_at=None):
+    """
+    清洗一组行：规则已经全搞定的行直接出结果，其余先查缓存，剩下的按 BATCH_SIZE 打包调模型，
+    批量结果里不合格的条目拆出来单条重试，最后还失败就用兜底结构。
+    线程池里的 worker 跑的就是这个，返回 (clean_obj 列表, 每行埋点列表)，都和 row_dicts 等长。
+    """
+    results = [None] * len(row_dicts)
+    keys = [None] * len(row_dicts)
+    metrics = [new_row_metrics() for _ in row_dicts]
+    if submitted_at is not None:
+        wait = time.time() - submitted_at
+        for m in metrics:
+            m["queue_wait"] = wait
+    needs = [missing_fields(row_dict) for row_dict in row_dicts]
+    template = SYSTEM_PROMPT + USER_INSTRUCTION
+    if RULE_FAST_PATH:
+        template += "|rules-" + RULES_VERSION
+    if COMPACT_DESC:
+        template += f"|compact-{DESC_TOKEN_BUDGET}"
+
+    for i, row_dict in enumerate(row_dicts):
+        if not needs[i]:
+            results[i] = merge_rule_fields(row_dict, {})
+            metrics[i]["source"] = "rule"
+        elif cache is not None:
+            keys[i] = make_cache_key(cache_model_name(), template, row_dict, INPUT_FIELDS)
+            results[i] = cache.get(keys[i])
+            if results[i] is not None:
+                metrics[i]["source"] = "cache"
+
+    todo = [i for i, r in enumerate(results) if r is None]
+    if len(todo) > 1 and BATCH_SIZE > 1:
+        # 一批里各行缺的字段可能不一样，取并集一起问，合并时规则字段会盖回去
+        union = {f for i in todo for f in needs[i]}
+        fields = [f for f in CLEAN_FIELDS if f in union]
+        # 级联模式下批量先交给小模型，不合格的条目下面单条重试时直接走大模型
+        batch_model = SMALL_MODEL_NAME if CASCADE else MODEL_NAME
+        set_active([metrics[i] for i in todo])
+        batch_res = call_ollama_batch([row_dicts[i] for i in todo], fields, model=batch_model)
+        for i, obj in zip(todo, batch_res):
+            if obj is not None:
+                results[i] = merge_rule_fields(row_dicts[i], obj)
+                if cache is not None:
+                    cache.put(keys[i], results[i], model=batch_model)
+
+    batched = set(todo) if len(todo) > 1 and BATCH_SIZE > 1 else set()
+    for i, row_dict in enumerate(row_dicts):
+        if results[i] is not None:
+            continue
+        set_active([metrics[i]])
+        try:
+            if i in batched and CASCADE:
+                obj = call_ollama(row_dict, fields=needs[i], model=MODEL_NAME)
+            else:
+                obj = call_cascade(row_dict, fields=needs[i])
+            clean_obj = merge_rule_fields(row_dict, obj)
+        except Exception as e:
+            print(f"[error] 模型调用失败，使用兜底结构：{e}")
+            # 兜底结构不进缓存，下次重跑还会再试
+            clean_obj = merge_rule_fields(row_dict, make_fallback(row_dict))
+            metrics[i]["fallback"] = True
+        else:
+            if cache is not None:
+                cache.put(keys[i], clean_obj, model=cache_model_name())
+        results[i] = clean_obj
+
+    set_active(None)
+    if CONCURRENCY <= 1 and todo:
+        time.sleep(SLEEP_SEC)
+    return results, metrics
+
+
+def build_row_out(row_dict, clean_obj):
+    """把模型返回的 clean_obj 和原始行拼成要写进 CSV 的一行。"""
+    # 计算中位月薪
+    try:
+        smin = clean_obj.get("最低月薪_元")
+        smax = clean_obj.get("最高月薪_元")
+        if smin is None or smax is None:
+            mid = None
+        else:
+            mid = (float(smin) + float(smax)) / 2.0
+    except Exception:
+        mid = None
+
+    # 招聘发布日期 & 发布月份
+    pub_raw = row_dict.get("招聘发布日期", "")
+    pub_str = ""
+    month_str = ""
+    if pd.notna(pub_raw):
+        pub_str = str(pub_raw)
+        try:
+            dt = pd.to_datetime(pub_raw)
+            month_str = dt.to_period("M").strftime("%Y-%m")
+        except Exception:
+            month_str = ""
+
+    # 把列表字段转成字符串（方便 CSV 查看）
+    ai_tags = clean_obj.get("AI标签列表", [])
+    if isinstance(ai_tags, list):
+        ai_tags_str = "、".join(str(x) for x in ai_tags)
+    else:
+        ai_tags_str = str(ai_tags)
+
+    skills = clean_obj.get("核心技能列表", [])
+    if isinstance(skills, list):
+        skills_str = "、".join(str(x) for x in skills)
+    else:
+        skills_str = str(skills)
+
+    return {
+        "招聘岗位": clean_obj.get("招聘岗位", ""),
+        "企业名称": clean_obj.get("企业名称", ""),
+        "工作城市": clean_obj.get("工作城市", ""),
+        "工作区域": clean_obj.get("工作区域", ""),
+        "最低月薪_元": clean_obj.get("最低月薪_元", None),
+        "最高月薪_元": clean_obj.get("最高月薪_元", None),
+        "中位月薪_元": mid,
+        "经验段": clean_obj.get("经验段", ""),
+        "经验年限下限": clean_obj.get("经验年限下限", None),
+        "经验年限上限": clean_obj.get("经验年限上限", None),
+        "学历层级": clean_obj.get("学历层级", ""),
+        "AI标签列表": ai_tags_str,
+        "主要AI方向": clean_obj.get("主要AI方向", ""),
+        "岗位摘要": clean_obj.get("岗位摘要", ""),
+        "核心技能列表": skills_str,
+        "招聘发布日期": pub_str,
+        "发布月份": month_str,
+    }
+
+
+# ========= 主流程：线程池并发清洗，按原始行顺序写 =========
 
 def main():
     raw_path = Path(RAW_PATH)
     if not raw_path.exists():
         raise FileNotFoundError(f"未找到原始文件：{raw_path.absolute()}")
 
-    print(f"读取原始数据：{raw_path}")
-    df_raw = pd.read_excel(raw_path)
+    print(f"读取原始数据：{raw_path}（{'流式分块' if STREAM_READ else '整表'}读取）")
+    total = count_excel_rows(raw_path) if STREAM_READ else None
 
     needed_cols = [
         "招聘岗位", "企业名称", "工作城市", "工作区域",
@@ -188,12 +760,8 @@ def main():
         "人工智能关键词", "职位描述",
         "招聘发布日期"
     ]
-    for col in needed_cols:
-        if col not in df_raw.columns:
-            print(f"[warn] 原始表中缺少列：{col}，这一列将为空。")
-
-    total = len(df_raw)
-    print(f"共 {total} 条记录，开始逐行处理（每条写入一次）。")
+    print(f"共 {total if total is not None else '?'} 条记录，开始处理"
+          f"（并发数 {CONCURRENCY}，每批 {BATCH_SIZE} 条，按原始顺序写入）。")
 
     # 输出字段顺序（中文字段）
     fieldnames = [
@@ -206,85 +774,135 @@ def main():
     ]
 
     out_path = Path(OUT_CSV)
-    header_written = out_path.exists() and out_path.stat().st_size > 0
+    cache = CleanCache(CACHE_PATH) if USE_CACHE else None
+    if cache is not None:
+        # 有缓存时整表重写：已完成的行直接从缓存出，接着上次停下的地方继续调模型
+        print(f"使用结果缓存：{CACHE_PATH}（已有 {len(cache)} 条）")
+        open_mode = "w"
+        header_written = False
+    else:
+        open_mode = "a"
+        header_written = out_path.exists() and out_path.stat().st_size > 0
+
+    # 已提交的行按原始顺序排在 pending 里，队头的结果出来就写，
+    # 队列满了就阻塞在队头，相当于一个有界的“保序”流水线。
+    # 一批共享一个 future，pos 是该行在批里的位置；
+    # 重复行不提交，future 为 None，写的时候从代表行的结果复制
+    pending = deque()
+    batch = []
+    dedup = DedupIndex(threshold=DEDUP_THRESHOLD, max_reps=DEDUP_MEMORY) if DEDUP else None
+    rep_results = OrderedDict()
+    rule_cells = rule_total = 0
+    run_metrics = RunMetrics(METRICS_LOG, total)
+    columnar = ColumnarWriter(OUT_COLUMNAR, COLUMNAR_FLUSH_ROWS, append=(open_mode == "a")) if OUT_COLUMNAR else None
+    written = 0
 
     # 一次打开文件，循环写入每一行
-    with open(out_path, "a", newline="", encoding="utf-8-sig") as f:
+    with open(out_path, open_mode, newline="", encoding="utf-8-sig") as f, \
+            ThreadPoolExecutor(max_workers=max(1, CONCURRENCY)) as pool:
         writer = csv.DictWriter(f, fieldnames=fieldnames)
         if not header_written:
             writer.writeheader()
 
-        for idx, row in df_raw.iterrows():
-            row_dict = row.to_dict()
-            print(f"\n[{idx+1}/{total}] 处理：{row_dict.get('招聘岗位','')} @ {row_dict.get('工作城市','')}")
-
-            try:
-                clean_obj = call_ollama(row_dict)
-            except Exception as e:
-                print(f"[error] 模型调用失败，使用兜底结构：{e}")
-                clean_obj = make_fallback(row_dict)
-
-            # 计算中位月薪
-            try:
-                smin = clean_obj.get("最低月薪_元")
-                smax = clean_obj.get("最高月薪_元")
-                if smin is None or smax is None:
-                    mid = None
-                else:
-                    mid = (float(smin) + float(smax)) / 2.0
-            except Exception:
-                mid = None
-
-            # 招聘发布日期 & 发布月份
-            pub_raw = row_dict.get("招聘发布日期", "")
-            pub_str = ""
-            month_str = ""
-            if pd.notna(pub_raw):
-                pub_str = str(pub_raw)
-                try:
-                    dt = pd.to_datetime(pub_raw)
-                    month_str = dt.to_period("M").strftime("%Y-%m")
-                except Exception:
-                    month_str = ""
-
-            # 把列表字段转成字符串（方便 CSV 查看）
-            ai_tags = clean_obj.get("AI标签列表", [])
-            if isinstance(ai_tags, list):
-                ai_tags_str = "、".join(str(x) for x in ai_tags)
+        def write_head():
+            nonlocal written
+            idx, row_dict, fut, pos = pending.popleft()
+            if fut is not None:
+                objs, mets = fut.result()
+                clean_obj, m = objs[pos], mets[pos]
+                if dedup is not None and not m.get("fallback"):
+                    rep_results[idx] = clean_obj
+                    if len(rep_results) > DEDUP_MEMORY:
+                        rep_results.popitem(last=False)
             else:
-                ai_tags_str = str(ai_tags)
-
-            skills = clean_obj.get("核心技能列表", [])
-            if isinstance(skills, list):
-                skills_str = "、".join(str(x) for x in skills)
-            else:
-                skills_str = str(skills)
-
-            row_out = {
-                "招聘岗位": clean_obj.get("招聘岗位", ""),
-                "企业名称": clean_obj.get("企业名称", ""),
-                "工作城市": clean_obj.get("工作城市", ""),
-                "工作区域": clean_obj.get("工作区域", ""),
-                "最低月薪_元": clean_obj.get("最低月薪_元", None),
-                "最高月薪_元": clean_obj.get("最高月薪_元", None),
-                "中位月薪_元": mid,
-                "经验段": clean_obj.get("经验段", ""),
-                "经验年限下限": clean_obj.get("经验年限下限", None),
-                "经验年限上限": clean_obj.get("经验年限上限", None),
-                "学历层级": clean_obj.get("学历层级", ""),
-                "AI标签列表": ai_tags_str,
-                "主要AI方向": clean_obj.get("主要AI方向", ""),
-                "岗位摘要": clean_obj.get("岗位摘要", ""),
-                "核心技能列表": skills_str,
-                "招聘发布日期": pub_str,
-                "发布月份": month_str,
-            }
-
+                rep_obj = rep_results.get(pos)
+                if rep_obj is None:
+                    objs, mets = clean_rows([row_dict], cache)
+                    clean_obj, m = objs[0], mets[0]
+                else:
+                    rep_results.move_to_end(pos)
+                    # 城市、薪资等原始字段判重时已经要求一样；规则能确定的字段照样用成员自己的
+                    clean_obj = merge_rule_fields(row_dict, rep_obj)
+                    m = new_row_metrics()
+                    m["source"] = "dup"
+            row_out = build_row_out(row_dict, clean_obj)
             writer.writerow(row_out)
-            f.flush()
-            time.sleep(SLEEP_SEC)
+            if columnar is not None:
+                columnar.add(row_out)
+            written += 1
+            if written % max(1, WRITE_FLUSH_ROWS) == 0:
+                f.flush()
+            run_metrics.add(idx, m)
+            print(f"[{idx+1}/{total if total is not None else '?'}] 完成：{row_dict.get('招聘岗位','')} @ {row_dict.get('工作城市','')}"
+                  f"（{run_metrics.progress()}）")
+
+        def submit_batch():
+            rows = [r for _, r, rep in batch if rep is None]
+            fut = pool.submit(clean_rows, rows, cache, time.time()) if rows else None
+            pos = 0
+            for idx, row_dict, rep in batch:
+                if rep is None:
+                    pending.append((idx, row_dict, fut, pos))
+                    pos += 1
+                else:
+                    pending.append((idx, row_dict, None, rep))
+            batch.clear()
+
+        for chunk_no, df_raw in enumerate(iter_raw_chunks(raw_path, STREAM_READ, READ_CHUNK_SIZE)):
+            if chunk_no == 0:
+                for col in needed_cols:
+                    if col not in df_raw.columns:
+                        print(f"[warn] 原始表中缺少列：{col}，这一列将为空。")
+            if total is None and not STREAM_READ:
+                total = run_metrics.total = len(df_raw)
+
+            # 规则在每一块上向量化地跑一遍
+            rule_values = rule_resolved = None
+            if RULE_FAST_PATH:
+                rule_values, rule_resolved = normalize_rules(df_raw)
+                rule_cells += int(rule_resolved.values.sum())
+                rule_total += rule_resolved.size
+
+            for idx, row in df_raw.iterrows():
+                row_dict = row.to_dict()
+                if rule_values is not None:
+                    row_dict["_rules"] = rule_fields(rule_values, rule_resolved, idx)
+                rep = dedup.assign(idx, row_dict) if dedup is not None else None
+                batch.append((idx, row_dict, rep))
+                if sum(1 for e in batch if e[2] is None) >= max(1, BATCH_SIZE):
+                    submit_batch()
+
+                while len(pending) >= max(1, QUEUE_SIZE):
+                    write_head()
+
+        if batch:
+            submit_batch()
+        while pending:
+            write_head()
+        if columnar is not None:
+            columnar.close()
+
+    run_metrics.summary()
+    print(f"（并发 {CONCURRENCY}，每批 {BATCH_SIZE} 条）")
+    run_metrics.close()
+    print(f"逐行埋点已写入：{METRICS_LOG}")
+
+    if RULE_FAST_PATH:
+        share = rule_cells / rule_total if rule_total else 0.0
+        print(f"规则快速通道：确定性字段 {rule_cells}/{rule_total}（{share:.1%}）由规则确定，模型只补剩下的。")
+    retry_stats.report()
+    compact_stats.report()
+    tier_stats.report()
+    get_pool().report()
+    if dedup is not None:
+        dedup.report()
+    if cache is not None:
+        print(f"缓存命中 {cache.hits} 条，调用模型 {cache.misses} 条。")
+        cache.close()
 
     print(f"\n全部处理完成，结果已写入：{OUT_CSV}")
+    if columnar is not None:
+        print(f"列式结果（按发布月份分区，{columnar.files} 个文件）：{OUT_COLUMNAR}")
     print("这个 CSV 直接用 Excel 打开就是中文字段的干净表。")
 
 
@@ -0,0 +1,233 @@
+import io
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401
+    HAS_PARQUET = True
+except ImportError:
+    HAS_PARQUET = False
+
+
+# ========= 列式、按发布月份分区的清洗结果 =========
+# CSV 每次都要整表重新解析，字符串列全是 Python 对象，下游九个脚本各读一遍。
+# 这里把同样的数据存成按「发布月份」分区的列式文件：
+#   - 城市、学历、经验段这类低基数列存成 category
+#   - AI标签列表 / 核心技能列表 存成真正的 list 列，下游不用再各自 split
+#   - 装了 pyarrow 就写 Parquet，没装就退回 pandas pickle（同样是 numpy 底层 + category）
+#   - 每行带一个 _row 行号，load_cleaned 按它排回写入时（也就是 CSV 里）的顺序
+# 目录结构：<root>/<发布月份>/part-<时间戳>-<序号>.parquet|.pkl，没有月份的行放在 unknown/
+# load_cleaned + to_csv_frame 和直接 read_csv 得到的表一模一样（行序、空值、dtype），可以直接替换 CSV 输入。
+
+CATEGORY_COLS = ["工作城市", "工作区域", "经验段", "学历层级", "主要AI方向", "发布月份"]
+FLOAT_COLS = ["最低月薪_元", "最高月薪_元", "中位月薪_元", "经验年限下限", "经验年限上限"]
+LIST_COLS = ["AI标签列表", "核心技能列表"]
+LIST_SEP = "、"
+PARTITION_COL = "发布月份"
+UNKNOWN_PARTITION = "unknown"
+ROW_COL = "_row"
+
+# read_csv 给文本列的 dtype：pandas 2 是 object，pandas 3 是 str
+CSV_TEXT_DTYPE = pd.read_csv(io.StringIO("a\nx\n"))["a"].dtype
+
+
+def _split_list(v):
+    if isinstance(v, list):
+        return [str(x) for x in v]
+    if not isinstance(v, str) or not v.strip():
+        return []
+    return [s.strip() for s in v.split(LIST_SEP) if s.strip()]
+
+
+def to_columnar(df):
+    """CSV 形态的 DataFrame（列表字段是 、 拼起来的字符串）→ 带类型的列式 DataFrame。"""
+    df = df.copy()
+    for col in FLOAT_COLS:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors="coerce").astype("float64")
+    for col in LIST_COLS:
+        if col in df.columns:
+            df[col] = df[col].map(_split_list)
+    for col in CATEGORY_COLS:
+        if col in df.columns:
+            df[col] = df[col].astype("category")
+    return df
+
+
+def to_csv_frame(df):
+    """
+    列式 DataFrame → CSV 形态（list 列拼回字符串），和 read_csv 读同一份数据的结果一致：
+    空列表还原成 NaN，category 还原成文本列，没有空值的整数列还原成 int64。
+    """
+    df = df.copy()
+    for col in LIST_COLS:
+        if col in df.columns:
+            df[col] = df[col].map(lambda xs: LIST_SEP.join(xs) if isinstance(xs, list) and xs else np.nan)
+    for col in df.columns:
+        s = df[col]
+        if s.isna().all():
+            df[col] = s.astype(object).astype("float64")
+        elif isinstance(s.dtype, pd.CategoricalDtype) or s.dtype == object or col in LIST_COLS:
+            df[col] = s.astype(object).astype(CSV_TEXT_DTYPE)
+        elif s.dtype.kind == "f" and s.notna().all() and (s == s.round()).all():
+            df[col] = s.astype("int64")
+    return df
+
+
+def _partition_name(month):
+    if not isinstance(month, str) or not month.strip():
+        return UNKNOWN_PARTITION
+    return month.strip()
+
+
+def write_partitions(df, root, tag=None, start_row=0):
+    """按发布月份把 df 写成若干个分区文件，返回写出的文件列表。行号从 start_row 开始依次编。"""
+    root = Path(root)
+    tag = tag or time.strftime("%Y%m%d%H%M%S")
+    if ROW_COL not in df.columns:
+        df = df.assign(**{ROW_COL: np.arange(start_row, start_row + len(df), dtype="int64")})
+    ext = ".parquet" if HAS_PARQUET else ".pkl"
+    keys = df[PARTITION_COL].astype(object).map(_partition_name) if PARTITION_COL in df.columns \
+        else pd.Series(UNKNOWN_PARTITION, index=df.index)
+    written = []
+    for month, part in df.groupby(keys, sort=True):
+        part_dir = root / month
+        part_dir.mkdir(parents=True, exist_ok=True)
+        seq = len(list(part_dir.glob(f"part-{tag}-*")))
+        path = part_dir / f"part-{tag}-{seq:05d}{ext}"
+        part = part.reset_index(drop=True)
+        if HAS_PARQUET:
+            part.to_parquet(path, index=False)
+        else:
+            part.to_pickle(path)
+        written.append(path)
+    return written
+
+
+def clear_partitions(root):
+    """删掉 root 下之前写出的分区文件（只动 part-* 文件和变空的月份目录）。"""
+    root = Path(root)
+    if not root.exists():
+        return
+    for path in root.glob("*/part-*"):
+        path.unlink()
+    for d in root.iterdir():
+        if d.is_dir() and not any(d.iterdir()):
+            d.rmdir()
+
+
+def _read_part(path):
+    if path.suffix != ".parquet":
+        return pd.read_pickle(path)
+    df = pd.read_parquet(path)
+    for col in LIST_COLS:
+        if col in df.columns:
+            # Parquet 读回来是 numpy 数组，统一成 list
+            df[col] = df[col].map(lambda xs: [] if xs is None else list(xs))
+    return df
+
+
+def next_row_number(root):
+    """已有分区文件里最大的行号 + 1，续写时从这里接着编。"""
+    rows = [_read_part(p)[ROW_COL].max() for p in Path(root).glob("*/part-*")
+            if p.suffix in (".parquet", ".pkl")]
+    rows = [r for r in rows if pd.notna(r)]
+    return int(max(rows)) + 1 if rows else 0
+
+
+def load_cleaned(path, months=None):
+    """
+    读取清洗结果：path 是分区目录就读列式文件，是 CSV 就解析后转成同样的列式结构。
+    months 只对分区目录有效，传入要读的月份列表就只读这些分区。
+    分区目录按 _row 排回原来的行序（老版本写的没有行号，就按月份顺序拼）。
+    """
+    path = Path(path)
+    if path.is_file():
+        return to_columnar(pd.read_csv(path))
+
+    files = sorted(p for p in path.glob("*/part-*") if p.suffix in (".parquet", ".pkl"))
+    if months is not None:
+        wanted = {_partition_name(m) for m in months}
+        files = [p for p in files if p.parent.name in wanted]
+    if not files:
+        raise FileNotFoundError(f"{path} 下没有清洗结果分区文件")
+
+    df = pd.concat([_read_part(p) for p in files], ignore_index=True)
+    if ROW_COL in df.columns:
+        if df[ROW_COL].notna().all():
+            df = df.sort_values(ROW_COL, kind="stable").reset_index(drop=True)
+        df = df.drop(columns=ROW_COL)
+    # 各分区的 category 取值不一样，拼起来会退化成 object，这里重新统一
+    for col in CATEGORY_COLS:
+        if col in df.columns and df[col].dtype != "category":
+            df[col] = df[col].astype("category")
+    return df
+
+
+class ColumnarWriter:
+    """
+    清洗主流程用的缓冲写入器：攒够 flush_rows 行就按月份落一批分区文件，
+    常驻内存只跟 flush_rows 有关。append=False 时先清掉旧的分区文件。
+    """
+
+    def __init__(self, root, flush_rows=2000, append=False):
+        self.root = Path(root)
+        self.flush_rows = flush_rows
+        self.tag = time.strftime("%Y%m%d%H%M%S")
+        self.rows = 0
+        self.files = 0
+        self._buf = []
+        if not append:
+            clear_partitions(self.root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.next_row = next_row_number(self.root) if append else 0
+
+    def add(self, row_out):
+        self._buf.append(row_out)
+        if len(self._buf) >= self.flush_rows:
+            self.flush()
+
+    def flush(self):
+        if not self._buf:
+            return
+        df = to_columnar(pd.DataFrame(self._buf))
+        self.files += len(write_partitions(df, self.root, self.tag, self.next_row))
+        self.rows += len(self._buf)
+        self.next_row += len(self._buf)
+        self._buf = []
+
+    def close(self):
+        self.flush()
+
+
+def csv_to_columnar(csv_path, root):
+    """把已有的 cleaned_data.csv 转成分区列式目录，返回行数。"""
+    df = to_columnar(pd.read_csv(csv_path))
+    clear_partitions(root)
+    write_partitions(df, root)
+    return len(df)
+
+
+if __name__ == "__main__":
+    # 用法：python columnar_store.py cleaned_data.csv cleaned_data_columnar
+    src = sys.argv[1] if len(sys.argv) > 1 else "cleaned_data.csv"
+    dst = sys.argv[2] if len(sys.argv) > 2 else "cleaned_data_columnar"
+
+    t0 = time.time()
+    csv_df = pd.read_csv(src)
+    t_csv = time.time() - t0
+
+    n = csv_to_columnar(src, dst)
+
+    t0 = time.time()
+    col_df = load_cleaned(dst)
+    t_col = time.time() - t0
+
+    print(f"已转换 {n} 行：{src} → {dst}（{'Parquet' if HAS_PARQUET else 'pickle'}）")
+    print(f"读取耗时：CSV {t_csv * 1000:.0f} ms，列式 {t_col * 1000:.0f} ms")
+    print(f"内存占用：CSV {csv_df.memory_usage(deep=True).sum() / 1e6:.1f} MB，"
+          f"列式 {col_df.memory_usage(deep=True).sum() / 1e6:.1f} MB")
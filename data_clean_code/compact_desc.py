@@ -0,0 +1,143 @@
+import math
+import re
+import threading
+
+from rule_normalize import SKILL_PATTERN
+
+
+# ========= 职位描述压缩 =========
+# 职位描述里一大半是公司介绍、福利清单、反诈骗/反歧视声明，对抽技能和写摘要没用，
+# 却全都要在 32B 模型上做 prefill。这里在拼 prompt 前：
+#   1. 整段去掉公司介绍 / 福利 / 联系方式之类的小节
+#   2. 去掉命中样板关键词的句子，重复的句子只留一句
+#   3. 超出 token 预算时优先保留带技能词 / 职责要求的句子，其余按原顺序往里填
+
+# 小节标题：命中 DROP 的小节整段丢掉，直到遇到 KEEP 小节标题为止
+KEEP_HEADINGS = r"岗位职责|工作职责|职位职责|工作内容|岗位描述|职位描述|任职要求|任职资格|岗位要求|职位要求|技能要求"
+DROP_HEADINGS = r"公司介绍|公司简介|关于我们|企业介绍|福利待遇|薪资福利|公司福利|员工福利|我们提供|联系方式|工作时间|工作地址|上班地址|面试地址"
+
+BOILERPLATE_RE = re.compile(
+    r"五险一金|六险一金|带薪年假|节日福利|年终奖|团建|下午茶|免费班车|包吃包住|餐补|房补|交通补贴|"
+    r"定期体检|弹性工作|双休|不收取任何费用|谨防.*诈骗|反歧视|平等就业|欢迎加入|期待你的加入|简历投递"
+)
+
+PRIORITY_RE = re.compile(r"熟悉|掌握|精通|了解|负责|经验|能力|优先|算法|模型|开发|设计|[A-Za-z]{2,}")
+
+SENT_SPLIT_RE = re.compile(r"(?<=[。；;！!？?\n])|(?=\s*\d+[、.．)）]\s*)")
+
+# 本地 tokenizer：装了 transformers 并且本地有 Qwen 的 tokenizer 文件就用真的，
+# 否则用近似计数（汉字 1 个 token，英文数字每 4 个字符 1 个 token）
+TOKENIZER_NAME = "Qwen/Qwen2.5-7B-Instruct"
+_tokenizer = None
+_tokenizer_loaded = False
+_tokenizer_lock = threading.Lock()
+
+
+def _get_tokenizer():
+    global _tokenizer, _tokenizer_loaded
+    with _tokenizer_lock:
+        if not _tokenizer_loaded:
+            _tokenizer_loaded = True
+            try:
+                from transformers import AutoTokenizer
+                _tokenizer = AutoTokenizer.from_pretrained(TOKENIZER_NAME, local_files_only=True)
+            except Exception:
+                _tokenizer = None
+    return _tokenizer
+
+
+def count_tokens(text):
+    tok = _get_tokenizer()
+    if tok is not None:
+        return len(tok.encode(text, add_special_tokens=False))
+    n = 0
+    for piece in re.findall(r"[A-Za-z0-9_]+|\s+|.", text):
+        if piece.isspace():
+            continue
+        n += math.ceil(len(piece) / 4) if piece[0].isascii() and piece[0].isalnum() else 1
+    return n
+
+
+def _drop_sections(text):
+    parts = re.split(rf"((?:{KEEP_HEADINGS}|{DROP_HEADINGS})\s*[:：]?)", text)
+    out = []
+    dropping = False
+    for part in parts:
+        if re.fullmatch(rf"(?:{DROP_HEADINGS})\s*[:：]?", part):
+            dropping = True
+            continue
+        if re.fullmatch(rf"(?:{KEEP_HEADINGS})\s*[:：]?", part):
+            dropping = False
+        if not dropping:
+            out.append(part)
+    return "".join(out)
+
+
+def compact_description(text, token_budget=400):
+    """返回压缩后的描述。token_budget <= 0 表示只去样板和去重，不截断。"""
+    if not isinstance(text, str) or not text.strip():
+        return ""
+
+    text = _drop_sections(text)
+    sentences = []
+    seen = set()
+    for s in SENT_SPLIT_RE.split(text):
+        s = s.strip()
+        if not s or BOILERPLATE_RE.search(s):
+            continue
+        key = re.sub(r"^\d+[、.．)）]\s*|[\W_]+", "", s)
+        if not key or key in seen:
+            continue
+        seen.add(key)
+        sentences.append(s)
+
+    if token_budget <= 0:
+        return "".join(sentences)
+
+    costs = [count_tokens(s) for s in sentences]
+    if sum(costs) <= token_budget:
+        return "".join(sentences)
+
+    # 先放带技能词的，再放职责/要求类的，最后其它的；输出时还按原来的顺序
+    def rank(i):
+        s = sentences[i]
+        if re.search(SKILL_PATTERN, s):
+            return 0
+        if PRIORITY_RE.search(s):
+            return 1
+        return 2
+
+    keep = set()
+    used = 0
+    for i in sorted(range(len(sentences)), key=lambda i: (rank(i), i)):
+        if used + costs[i] <= token_budget:
+            keep.add(i)
+            used += costs[i]
+    return "".join(sentences[i] for i in sorted(keep))
+
+
+class CompactStats:
+    """累计压缩前后 token 数，线程安全。"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.tokens_before = 0
+        self.tokens_after = 0
+
+    def record(self, before, after):
+        with self._lock:
+            self.calls += 1
+            self.tokens_before += before
+            self.tokens_after += after
+
+    def report(self):
+        if not self.calls:
+            return
+        saved = self.tokens_before - self.tokens_after
+        print(f"描述压缩：{self.calls} 次 prompt，职位描述 {self.tokens_before} → {self.tokens_after} tokens，"
+              f"省下 {saved}（{saved / max(self.tokens_before, 1):.1%}），"
+              f"tokenizer：{'本地 ' + TOKENIZER_NAME if _get_tokenizer() is not None else '近似计数'}")
+
+
+compact_stats = CompactStats()
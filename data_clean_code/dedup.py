@@ -0,0 +1,145 @@
+import hashlib
+import re
+from collections import OrderedDict
+
+import numpy as np
+
+from llm_cache import normalize_value
+
+
+# ========= 重复 / 近重复岗位识别 =========
+# 招聘网站同一个岗位会反复重发：企业、岗位名一样，职位描述只差几个字。
+# 清洗前先判重，一个簇只清洗代表行，结果再分发给簇里的其它行（发布日期各用各的）。
+#   - 完全重复：企业 + 岗位 + POSTING_FIELDS + 描述 规范化后做 hash
+#   - 近重复：企业 + 岗位 + POSTING_FIELDS 都一样的块里，描述按字符 shingle 做 MinHash，LSH 分桶找候选，
+#             签名一致率（≈ Jaccard 相似度）超过阈值算同簇
+# 同一条广告换个城市 / 薪资重发不算重复：成员直接拿代表行的模型结果，城市、薪资这些字段不能不一样。
+# 判重是增量的（一行一行 assign），整表读入和流式读入都能用；
+# 最多记住 max_reps 个代表行（按最近命中淘汰），流式跑大表时内存不随行数涨。
+
+MERSENNE_PRIME = (1 << 31) - 1
+
+# 除了描述以外必须完全一样才算同一个岗位的原始字段（模型结果里的城市、薪资、经验、学历都从这些来）
+POSTING_FIELDS = ("工作城市", "工作区域", "最低月薪", "最高月薪", "要求经验", "学历要求")
+
+
+def _norm_text(v):
+    """小写、去掉空白和标点，只留汉字/字母/数字。"""
+    return re.sub(r"[^\w]+", "", normalize_value(v).lower())
+
+
+class DedupIndex:
+    def __init__(self, threshold=0.85, num_perm=64, bands=16, shingle=5, seed=42, max_reps=None):
+        assert num_perm % bands == 0
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows_per_band = num_perm // bands
+        self.shingle = shingle
+        self.max_reps = max_reps
+
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, MERSENNE_PRIME, size=num_perm, dtype=np.int64)
+        self._b = rng.integers(0, MERSENNE_PRIME, size=num_perm, dtype=np.int64)
+
+        self._exact = {}            # 完全重复 hash → 代表行 idx
+        self._buckets = {}          # (岗位块, band 号, band hash) → [代表行 idx]
+        self._signatures = {}       # 代表行 idx → MinHash 签名
+        self._reps = OrderedDict()  # 代表行 idx → (它名下的 exact hash 列表, band key 列表)，越靠后越新
+
+        self.rows = 0
+        self.exact_dups = 0
+        self.near_dups = 0
+        self.evicted = 0
+
+    @property
+    def clusters(self):
+        return self.rows - self.exact_dups - self.near_dups
+
+    def _minhash(self, text):
+        n = self.shingle
+        grams = {text[i:i + n] for i in range(max(len(text) - n + 1, 1))}
+        hashes = np.fromiter(
+            (int.from_bytes(hashlib.blake2b(g.encode("utf-8"), digest_size=4).digest(), "little")
+             for g in grams),
+            dtype=np.int64, count=len(grams),
+        ) % MERSENNE_PRIME
+        # (a * x + b) mod p，x/a/b 都小于 2^31，乘积不会溢出 int64
+        perm = (np.outer(hashes, self._a) + self._b) % MERSENNE_PRIME
+        return perm.min(axis=0)
+
+    def _add_rep(self, idx, exact_key, band_keys=()):
+        self._exact[exact_key] = idx
+        self._reps[idx] = ([exact_key], list(band_keys))
+        if self.max_reps is not None:
+            while len(self._reps) > self.max_reps:
+                self._evict()
+
+    def _evict(self):
+        """忘掉最久没命中的代表行：它的 exact hash、签名和 LSH 桶里的位置一起清掉。"""
+        old, (exact_keys, band_keys) = self._reps.popitem(last=False)
+        for key in exact_keys:
+            self._exact.pop(key, None)
+        self._signatures.pop(old, None)
+        for key in band_keys:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                continue
+            bucket.remove(old)
+            if not bucket:
+                del self._buckets[key]
+        self.evicted += 1
+
+    def assign(self, idx, row_dict):
+        """
+        登记一行。返回它所属簇的代表行 idx；自己就是新簇的代表时返回 None。
+        """
+        self.rows += 1
+        company = _norm_text(row_dict.get("企业名称"))
+        title = _norm_text(row_dict.get("招聘岗位"))
+        posting = "|".join(_norm_text(row_dict.get(f)) for f in POSTING_FIELDS)
+        desc = _norm_text(row_dict.get("职位描述"))
+
+        block = f"{company}|{title}|{posting}"
+        exact_key = hashlib.sha1(f"{block}|{desc}".encode("utf-8")).hexdigest()
+        rep = self._exact.get(exact_key)
+        if rep is not None:
+            self.exact_dups += 1
+            self._reps.move_to_end(rep)
+            return rep
+
+        # 描述太短的不做近重复，shingle 太少误判率高
+        if len(desc) < self.shingle * 4:
+            self._add_rep(idx, exact_key)
+            return None
+
+        sig = self._minhash(desc)
+        band_keys = []
+        candidates = []
+        for b in range(self.bands):
+            part = sig[b * self.rows_per_band:(b + 1) * self.rows_per_band]
+            key = (block, b, hashlib.sha1(part.tobytes()).digest())
+            band_keys.append(key)
+            for c in self._buckets.get(key, ()):
+                if c not in candidates:
+                    candidates.append(c)
+
+        for c in candidates:
+            if float(np.mean(self._signatures[c] == sig)) >= self.threshold:
+                self.near_dups += 1
+                self._exact[exact_key] = c
+                self._reps[c][0].append(exact_key)
+                self._reps.move_to_end(c)
+                return c
+
+        self._signatures[idx] = sig
+        for key in band_keys:
+            self._buckets.setdefault(key, []).append(idx)
+        self._add_rep(idx, exact_key, band_keys)
+        return None
+
+    def report(self):
+        saved = self.exact_dups + self.near_dups
+        print(f"判重：{self.rows} 条 → {self.clusters} 个簇"
+              f"（完全重复 {self.exact_dups} 条，近重复 {self.near_dups} 条，省下 {saved} 次清洗；"
+              f"超出上限忘掉的代表行 {self.evicted} 个）")
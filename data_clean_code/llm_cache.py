@@ -0,0 +1,86 @@
+import hashlib
+import json
+import sqlite3
+import threading
+
+import pandas as pd
+
+
+# ========= 清洗结果缓存（SQLite） =========
+# key = sha256(模型名 + prompt 模板 + 规范化后的原始行)，value = 解析好的 clean_obj。
+# 换模型或者改 prompt，key 自然就变了，会重新调模型；其它情况重跑直接命中。
+
+def normalize_value(v):
+    """把原始单元格规范成字符串：NaN/None → 空串，多余空白压成一个空格。"""
+    if v is None:
+        return ""
+    try:
+        if pd.isna(v):
+            return ""
+    except (TypeError, ValueError):
+        pass
+    return " ".join(str(v).split())
+
+
+def make_cache_key(model_name, prompt_template, row_dict, fields):
+    """只拿参与 prompt 的字段算 hash，发布日期之类不影响模型输出的字段不算进去。"""
+    norm_row = {col: normalize_value(row_dict.get(col)) for col in fields}
+    payload = json.dumps(
+        [model_name, prompt_template, norm_row],
+        ensure_ascii=False,
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class CleanCache:
+    """线程安全的 SQLite 结果缓存，worker 线程里可以直接 get/put。"""
+
+    def __init__(self, path):
+        self.path = str(path)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        # WAL：写一条提交一条，进程被杀掉也不会把库写坏
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS clean_cache (
+                key        TEXT PRIMARY KEY,
+                model      TEXT,
+                clean_obj  TEXT NOT NULL,
+                created_at TEXT DEFAULT CURRENT_TIMESTAMP
+            )
+            """
+        )
+        self._conn.commit()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT clean_obj FROM clean_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, key, clean_obj, model=""):
+        text = json.dumps(clean_obj, ensure_ascii=False)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO clean_cache (key, model, clean_obj) VALUES (?, ?, ?)",
+                (key, model, text),
+            )
+            self._conn.commit()
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM clean_cache").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,96 @@
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+# ========= 多台 Ollama 服务的负载均衡 =========
+# - 每个 endpoint 一个持久 requests.Session，连接复用，不用每次重新握手
+# - 选 endpoint 按“在途请求最少”（least outstanding requests）
+# - 连续超时 / 连不上达到 max_failures 次就踢出 eject_sec 秒，到点自动放回来再试
+
+
+class Endpoint:
+    def __init__(self, url, pool_size):
+        self.url = url
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self.outstanding = 0
+        self.consecutive_failures = 0
+        self.ejected_until = 0.0
+        self.requests = 0
+        self.errors = 0
+        self.busy_sec = 0.0
+
+    def healthy(self, now):
+        return now >= self.ejected_until
+
+
+class EndpointPool:
+    def __init__(self, urls, max_failures=3, eject_sec=60, pool_size=8):
+        if not urls:
+            raise ValueError("至少要配置一个 Ollama endpoint")
+        self.endpoints = [Endpoint(u, pool_size) for u in urls]
+        self.max_failures = max_failures
+        self.eject_sec = eject_sec
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        with self._lock:
+            now = time.time()
+            alive = [ep for ep in self.endpoints if ep.healthy(now)]
+            if alive:
+                ep = min(alive, key=lambda e: e.outstanding)
+            else:
+                # 全被踢了就挑最早恢复的那台硬着头皮试，不然整个任务卡死
+                ep = min(self.endpoints, key=lambda e: e.ejected_until)
+            ep.outstanding += 1
+            ep.requests += 1
+            return ep
+
+    def release(self, ep, ok, cost, unhealthy=False):
+        with self._lock:
+            ep.outstanding -= 1
+            ep.busy_sec += cost
+            if ok:
+                ep.consecutive_failures = 0
+                return
+            ep.errors += 1
+            if unhealthy:
+                ep.consecutive_failures += 1
+                if ep.consecutive_failures >= self.max_failures:
+                    ep.ejected_until = time.time() + self.eject_sec
+                    ep.consecutive_failures = 0
+                    print(f"[pool] {ep.url} 连续失败 {self.max_failures} 次，踢出 {self.eject_sec}s")
+
+    def post(self, payload, timeout=600):
+        """发给当前最闲的 endpoint，返回解析好的 JSON。"""
+        ep = self.acquire()
+        t0 = time.time()
+        try:
+            resp = ep.session.post(ep.url, json=payload, timeout=timeout)
+            resp.raise_for_status()
+            data = resp.json()
+        except (requests.Timeout, requests.ConnectionError):
+            self.release(ep, False, time.time() - t0, unhealthy=True)
+            raise
+        except Exception:
+            self.release(ep, False, time.time() - t0)
+            raise
+        self.release(ep, True, time.time() - t0)
+        return data
+
+    def report(self):
+        if len(self.endpoints) < 2:
+            return
+        print("\n各 Ollama 服务统计：")
+        now = time.time()
+        with self._lock:
+            for ep in self.endpoints:
+                state = "正常" if ep.healthy(now) else "已踢出"
+                print(f"  {ep.url}: 请求 {ep.requests} 次，失败 {ep.errors} 次，"
+                      f"累计占用 {ep.busy_sec:.0f}s，{state}")
@@ -0,0 +1,54 @@
+import pandas as pd
+from openpyxl import load_workbook
+
+
+# ========= 原始 Excel 读取 =========
+# pd.read_excel 会把整本工作簿一次读进内存，多年份的导出文件动辄几个 G。
+# 这里用 openpyxl 的 read_only 模式按行流式解析 xlsx，
+# 每攒够 chunk_size 行就吐出一个小 DataFrame，常驻内存只跟 chunk_size 有关。
+
+
+def count_excel_rows(path):
+    """从工作表的 dimension 估计数据行数（不含表头），拿不到就返回 None。"""
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        max_row = wb.active.max_row
+    finally:
+        wb.close()
+    return max_row - 1 if max_row else None
+
+
+def iter_excel_chunks(path, chunk_size=2000):
+    """流式读取第一个工作表，逐块 yield DataFrame，index 接着上一块往下编号。"""
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = wb.active.iter_rows(values_only=True)
+        try:
+            header = [str(h).strip() if h is not None else "" for h in next(rows)]
+        except StopIteration:
+            return
+
+        width = len(header)
+        buf = []
+        start = 0
+        for r in rows:
+            if r is None or all(v is None for v in r):
+                continue
+            r = list(r[:width]) + [None] * (width - len(r))
+            buf.append(r)
+            if len(buf) >= chunk_size:
+                yield pd.DataFrame(buf, columns=header, index=range(start, start + len(buf)))
+                start += len(buf)
+                buf = []
+        if buf:
+            yield pd.DataFrame(buf, columns=header, index=range(start, start + len(buf)))
+    finally:
+        wb.close()
+
+
+def iter_raw_chunks(path, stream=True, chunk_size=2000):
+    """stream=False 时退回原来的整表 pd.read_excel，一次吐一整块。"""
+    if stream:
+        yield from iter_excel_chunks(path, chunk_size)
+    else:
+        yield pd.read_excel(path)
@@ -0,0 +1,211 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+
+# ========= 规则快速通道 =========
+# 学历、经验段、薪资、城市这些字段绝大多数情况用正则就能定，不值得让 32B 模型推一遍。
+# normalize_rules 对整张原始表（或一个分块）做向量化处理，返回：
+#   values   : 和 clean_obj 同名的列，规则算出来的值
+#   resolved : 同形状的 bool 表，True 表示这一格规则已经确定，不需要模型
+# 只管有确定答案的字段；岗位摘要、核心技能列表要读懂描述才写得好，始终交给模型。
+# 规则改了记得改 RULES_VERSION，缓存 key 会带上它。
+
+RULES_VERSION = "3"
+
+# (正则, 学历层级)。学历要求写的是门槛：“大专及以上，本科优先”要的是大专，
+# 所以先看“X及以上”里的 X，没有的话取最先提到的那个学历，而不是最高的
+DEGREE_RULES = [
+    (r"博士", "博士"),
+    (r"硕士|研究生", "硕士"),
+    (r"本科|学士", "本科"),
+    (r"大专|专科", "大专"),
+    (r"中专|中技|职高|技校|高中|初中", "中专及以下"),
+    (r"不限|无要求|无学历", "不限"),
+]
+DEGREE_WORD = "(" + "|".join(p for p, _ in DEGREE_RULES) + ")"
+
+SALARY_UNITS = {"万": 10000, "w": 10000, "W": 10000, "千": 1000, "k": 1000, "K": 1000}
+
+# 主要AI方向：标签里有这些就优先选，没有就用第一个标签
+DIRECTION_PRIORITY = [
+    "机器学习", "深度学习", "自然语言处理", "计算机视觉", "大数据处理",
+    "数据挖掘", "机器人自动化", "无人驾驶", "自动驾驶", "云计算",
+]
+
+# 技能词表：取自已清洗数据里出现最多的技能，compact_desc.py 压缩描述时优先保留带这些词的句子
+SKILL_VOCAB = [
+    "Python", "Java", "C++", "C/C++", "C#", "Golang", "JavaScript", "Matlab", "Shell",
+    "SQL", "MySQL", "Oracle", "Redis", "MongoDB", "Hive", "Spark", "Flink", "Hadoop", "Kafka",
+    "PyTorch", "TensorFlow", "OpenCV", "Halcon", "ROS", "Docker", "Kubernetes", "Linux", "Git",
+    "Spring Boot", "Tableau", "Excel", "Axure", "Visio", "ETL", "NLP", "PLC",
+    "机器学习", "深度学习", "强化学习", "数据挖掘", "数据分析", "数据可视化", "数据仓库",
+    "数据治理", "数据清洗", "数据建模", "特征工程", "自然语言处理", "计算机视觉", "图像处理",
+    "图像识别", "目标检测", "知识图谱", "推荐算法", "神经网络", "大数据", "云计算", "物联网",
+    "分布式系统", "微服务", "算法优化", "模型训练", "数据标注", "信号处理", "嵌入式",
+    "项目管理", "需求分析", "产品设计", "竞品分析", "市场分析",
+]
+
+
+def _text(df, col):
+    """取一列并转成去掉首尾空白的字符串，缺列 / NaN 都当空串。"""
+    if col not in df.columns:
+        return pd.Series("", index=df.index, dtype=object)
+    s = df[col].astype(object).where(df[col].notna(), "")
+    return s.astype(str).str.strip()
+
+
+def _to_int_or_none(series):
+    return pd.Series(
+        [None if pd.isna(x) else int(x) for x in series],
+        index=series.index, dtype=object,
+    )
+
+
+def _split_tags(text):
+    seen = []
+    for t in re.split(r"[、，,;；/\s]+", text):
+        t = t.strip()
+        if t and t not in seen:
+            seen.append(t)
+    return seen
+
+
+def _skill_pattern():
+    # 长词优先，避免 "C" 先吃掉 "C++"；英文词前后不能再接字母，避免 "R" 匹配进 "PyTorch"
+    parts = []
+    for w in sorted(SKILL_VOCAB, key=len, reverse=True):
+        if re.match(r"^[A-Za-z]", w):
+            parts.append(r"(?<![A-Za-z])" + re.escape(w) + r"(?![A-Za-z])")
+        else:
+            parts.append(re.escape(w))
+    return "(" + "|".join(parts) + ")"
+
+
+SKILL_PATTERN = _skill_pattern()
+
+
+def _degree_level(word):
+    if not isinstance(word, str):
+        return None
+    return next(v for p, v in DEGREE_RULES if re.fullmatch(p, word))
+
+
+def normalize_degree(s):
+    minimum = s.str.extract(DEGREE_WORD + r"\s*(?:学历)?\s*(?:及|或)?以上")[0]
+    first = s.str.extract(DEGREE_WORD)[0]
+    out = minimum.fillna(first).map(_degree_level).astype(object)
+    out = out.where(out.notna(), None)
+    return out, out.notna()
+
+
+def exp_bucket(lo, hi):
+    """按上限（没有上限就按下限）归到 USER_INSTRUCTION 里的经验段。"""
+    by_hi = hi.notna()
+    key = hi.where(by_hi, lo)
+    conds_hi = [key <= 1, key <= 3, key <= 5, key <= 10]
+    conds_lo = [key < 1, key < 3, key < 5, key < 10]
+    labels = ["0-1年", "1-3年", "3-5年", "5-10年"]
+    out_hi = np.select(conds_hi, labels, default="10年以上")
+    out_lo = np.select(conds_lo, labels, default="10年以上")
+    out = np.where(by_hi, out_hi, out_lo)
+    return pd.Series(out, index=lo.index, dtype=object).where(key.notna(), None)
+
+
+def normalize_experience(s):
+    intern = s.str.contains(r"在校|应届|实习|毕业生", regex=True)
+    no_req = s.str.contains(r"不限|无需|无经验|无要求", regex=True)
+
+    rng = s.str.extract(r"(\d+)\s*[-~～至到]\s*(\d+)\s*年").astype(float)
+    above = s.str.extract(r"(\d+)\s*年(?:及)?以上")[0].astype(float)
+    below = s.str.extract(r"(\d+)\s*年(?:及)?以[下内]")[0].astype(float)
+    plain = s.str.extract(r"^(\d+)\s*年")[0].astype(float)
+
+    lo = rng[0].fillna(above).fillna(below.where(below.isna(), 0)).fillna(plain)
+    hi = rng[1].fillna(below)
+
+    bucket = exp_bucket(lo, hi)
+    special = intern | no_req
+    bucket = bucket.where(~intern, "实习/应届").where(~(no_req & ~intern), "无经验要求")
+    lo = lo.where(~special)
+    hi = hi.where(~special)
+
+    resolved = bucket.notna()
+    return bucket, _to_int_or_none(lo), _to_int_or_none(hi), resolved
+
+
+def normalize_salary(s):
+    m = s.str.extract(r"^(\d+(?:\.\d+)?)\s*(万|w|W|千|k|K)?\s*(?:元)?(?:/月)?$")
+    mult = m[1].map(SALARY_UNITS).fillna(1)
+    val = m[0].astype(float) * mult
+    # 没单位又特别小的数（比如 "15"）说不清是 15k 还是 15 元，交给模型
+    val = val.where(~(m[1].isna() & (val < 100)))
+    negotiable = s.str.contains("面议", regex=False)
+    resolved = val.notna() | negotiable
+    return _to_int_or_none(val.round()), resolved
+
+
+# 城市前面可能带的省、自治区全称；按名单去，不按字数猜（“新疆维吾尔自治区”有 8 个字）
+PROVINCES = (
+    "河北省", "山西省", "辽宁省", "吉林省", "黑龙江省", "江苏省", "浙江省", "安徽省", "福建省", "江西省",
+    "山东省", "河南省", "湖北省", "湖南省", "广东省", "海南省", "四川省", "贵州省", "云南省", "陕西省",
+    "甘肃省", "青海省", "台湾省",
+    "内蒙古自治区", "广西壮族自治区", "西藏自治区", "宁夏回族自治区", "新疆维吾尔自治区",
+)
+PROVINCE_PREFIX = "^(?:" + "|".join(PROVINCES) + ")"
+
+
+def normalize_city(s):
+    city = (
+        s.str.split(r"[-－·]", regex=True).str[0]
+        .str.replace(PROVINCE_PREFIX, "", regex=True)
+        .str.replace(r"市$", "", regex=True)
+        .str.strip()
+    )
+    return city, city != ""
+
+
+def normalize_rules(df_raw):
+    """对原始表做一遍向量化规则清洗，返回 (values, resolved) 两张表。"""
+    idx = df_raw.index
+    values = pd.DataFrame(index=idx)
+    resolved = pd.DataFrame(index=idx)
+
+    title = _text(df_raw, "招聘岗位").str.replace(r"[（(【\[][^）)】\]]*[）)】\]]", "", regex=True).str.strip()
+    values["招聘岗位"], resolved["招聘岗位"] = title, title != ""
+
+    company = _text(df_raw, "企业名称")
+    values["企业名称"], resolved["企业名称"] = company, company != ""
+
+    values["工作城市"], resolved["工作城市"] = normalize_city(_text(df_raw, "工作城市"))
+
+    area = _text(df_raw, "工作区域").replace("nan", "")
+    values["工作区域"], resolved["工作区域"] = area, pd.Series(True, index=idx)
+
+    values["最低月薪_元"], resolved["最低月薪_元"] = normalize_salary(_text(df_raw, "最低月薪"))
+    values["最高月薪_元"], resolved["最高月薪_元"] = normalize_salary(_text(df_raw, "最高月薪"))
+
+    bucket, lo, hi, exp_ok = normalize_experience(_text(df_raw, "要求经验"))
+    values["经验段"], values["经验年限下限"], values["经验年限上限"] = bucket, lo, hi
+    resolved["经验段"] = resolved["经验年限下限"] = resolved["经验年限上限"] = exp_ok
+
+    values["学历层级"], resolved["学历层级"] = normalize_degree(_text(df_raw, "学历要求"))
+
+    tags = _text(df_raw, "人工智能关键词").map(_split_tags)
+    has_tags = tags.str.len() > 0
+    values["AI标签列表"], resolved["AI标签列表"] = tags, has_tags
+    values["主要AI方向"] = tags.map(
+        lambda ts: next((d for d in DIRECTION_PRIORITY if d in ts), ts[0] if ts else None)
+    )
+    resolved["主要AI方向"] = has_tags
+
+    # 岗位摘要、核心技能列表不在这里出，rule_fields 取不到，模型那边一定会补
+    return values, resolved.astype(bool)
+
+
+def rule_fields(values, resolved, idx):
+    """取出某一行规则已确定的字段 → dict，塞进 row_dict["_rules"] 给 worker 用。"""
+    ok = resolved.loc[idx]
+    row = values.loc[idx]
+    return {col: row[col] for col in values.columns if ok[col]}
@@ -0,0 +1,108 @@
+import json
+import threading
+import time
+
+import numpy as np
+
+
+# ========= 清洗过程埋点 =========
+# 每一行一条 JSONL 记录：排队等待、模型耗时、prompt/生成 token 数、重试次数、
+# 是否用了兜底结构、解析耗时、结果来源（rule / cache / model / dup）。
+# worker 线程通过 thread-local 的 active 列表把一次请求的耗时和 token 摊到对应的行上。
+
+_ctx = threading.local()
+
+
+def new_row_metrics():
+    return {
+        "source": "model",
+        "queue_wait": 0.0,
+        "model_latency": 0.0,
+        "prompt_tokens": 0,
+        "completion_tokens": 0,
+        "retries": 0,
+        "fallback": False,
+        "parse_time": 0.0,
+    }
+
+
+def set_active(rows):
+    """声明当前线程接下来的请求是为哪些行发的（批量时是多行）。"""
+    _ctx.active = rows
+
+
+def active_rows():
+    return getattr(_ctx, "active", None) or []
+
+
+def add_to_active(key, value):
+    """
+    把一次请求的开销平摊到当前这几行上。
+    整数（token 数）按最大余数法分：每行先拿整除的那份，余下的 1 个 1 个分给前几行，各行加起来正好等于总数。
+    """
+    rows = active_rows()
+    if not rows:
+        return
+    if isinstance(value, int):
+        base, extra = divmod(value, len(rows))
+        for i, m in enumerate(rows):
+            m[key] += base + (i < extra)
+        return
+    share = value / len(rows)
+    for m in rows:
+        m[key] += share
+
+
+class RunMetrics:
+    def __init__(self, log_path, total=None):
+        self.total = total
+        self.t_start = time.time()
+        self.rows = 0
+        self.latencies = []
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.by_source = {}
+        self.fallbacks = 0
+        self.retries = 0
+        self._log = open(log_path, "w", encoding="utf-8") if log_path else None
+
+    def add(self, idx, m):
+        """主线程按写盘顺序调用，不需要加锁。"""
+        self.rows += 1
+        self.by_source[m["source"]] = self.by_source.get(m["source"], 0) + 1
+        if m["source"] == "model":
+            self.latencies.append(m["model_latency"])
+        self.prompt_tokens += m["prompt_tokens"]
+        self.completion_tokens += m["completion_tokens"]
+        self.fallbacks += bool(m["fallback"])
+        self.retries += m["retries"]
+        if self._log is not None:
+            rec = {"idx": int(idx), **{k: (round(v, 4) if isinstance(v, float) else v) for k, v in m.items()}}
+            self._log.write(json.dumps(rec, ensure_ascii=False) + "\n")
+
+    def progress(self):
+        """进度串：速度 + 预计剩余时间。"""
+        elapsed = max(time.time() - self.t_start, 1e-9)
+        rate = self.rows / elapsed
+        text = f"{rate:.2f} 行/秒"
+        if self.total and rate > 0:
+            eta = (self.total - self.rows) / rate
+            text += f"，ETA {eta / 60:.1f} 分钟"
+        return text
+
+    def summary(self):
+        elapsed = max(time.time() - self.t_start, 1e-9)
+        print("\n===== 清洗运行报告 =====")
+        print(f"总行数 {self.rows}，耗时 {elapsed:.1f}s，{self.rows / elapsed:.2f} 行/秒")
+        print("结果来源：" + "，".join(f"{k} {v}" for k, v in sorted(self.by_source.items())))
+        if self.latencies:
+            p50, p95, p99 = np.percentile(self.latencies, [50, 95, 99])
+            print(f"模型耗时（每行）：p50 {p50:.2f}s，p95 {p95:.2f}s，p99 {p99:.2f}s")
+        print(f"token：prompt {self.prompt_tokens}，生成 {self.completion_tokens}，"
+              f"{(self.prompt_tokens + self.completion_tokens) / elapsed:.1f} tokens/秒"
+              f"（生成 {self.completion_tokens / elapsed:.1f} tokens/秒）")
+        print(f"重试 {self.retries} 次，兜底 {self.fallbacks} 行")
+
+    def close(self):
+        if self._log is not None:
+            self._log.close()
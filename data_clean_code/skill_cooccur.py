@@ -0,0 +1,90 @@
+import numpy as np
+import scipy.sparse as sp
+
+
+# ========= 技能共现引擎 =========
+# 岗位 × 技能 0/1 稀疏矩阵 X（一行一个岗位，一列一个技能），
+# C = XᵀX 一次矩阵乘法就得到所有技能对的共现岗位数，对角线是每个技能的岗位数。
+# 在 C 上再算：
+#   lift(a, b) = C[a, b] * N / (C[a, a] * C[b, b])   实际共现 / 独立时的期望共现
+#   PMI(a, b)  = log(lift)
+# 原来嵌套 itertools.combinations 数技能对，只能截到前 30 个技能；这里整个词表都能算。
+
+
+class CooccurrenceEngine:
+    def __init__(self, skills, positions, n_jobs):
+        """
+        skills / positions：去重后的 (技能, 岗位行位置) 两列，长度相同。
+        n_jobs：岗位总数 N（算 lift/PMI 的分母，包括一个技能都没有的岗位）。
+        """
+        self.vocab, codes = np.unique(np.asarray(skills, dtype=object), return_inverse=True)
+        self.index = {s: i for i, s in enumerate(self.vocab)}
+        self.n_jobs = int(n_jobs)
+
+        positions = np.asarray(positions, dtype=np.int64)
+        x = sp.csr_matrix(
+            (np.ones(len(codes), dtype=np.int32), (positions, codes)),
+            shape=(self.n_jobs, len(self.vocab)),
+        )
+        x.data[:] = 1  # 同一岗位同一技能重复出现也只算 1
+        self.x = x
+        self.c = (x.T @ x).tocsr()
+        self.job_counts = self.c.diagonal().astype(np.int64)
+
+    def __len__(self):
+        return len(self.vocab)
+
+    def count(self, a, b):
+        """两个技能的共现岗位数。"""
+        i, j = self.index.get(a), self.index.get(b)
+        if i is None or j is None:
+            return 0
+        return int(self.c[i, j])
+
+    def pairs(self, min_count=1, skills=None):
+        """
+        所有 a < b 的技能对，返回 (i 数组, j 数组, 共现数数组)。
+        skills 给了就只看这些技能之间的边。
+        """
+        c = sp.triu(self.c, k=1).tocoo()
+        keep = c.data >= min_count
+        if skills is not None:
+            mask = np.zeros(len(self.vocab), dtype=bool)
+            mask[[self.index[s] for s in skills if s in self.index]] = True
+            keep &= mask[c.row] & mask[c.col]
+        return c.row[keep], c.col[keep], c.data[keep].astype(np.int64)
+
+    def lift(self, i, j, counts):
+        ci = self.job_counts[i].astype(float)
+        cj = self.job_counts[j].astype(float)
+        return counts * self.n_jobs / (ci * cj)
+
+    def neighbors(self, skill, k=10, by="pmi", min_count=2):
+        """
+        一个技能的 top-k 邻居：[{"name", "count", "lift", "pmi"}]。
+        by 可选 "pmi" / "lift" / "count"；min_count 过滤偶然共现一两次就 PMI 很高的冷门组合。
+        """
+        i = self.index.get(skill)
+        if i is None:
+            return []
+        row = self.c.getrow(i)
+        cols, counts = row.indices, row.data.astype(np.int64)
+        keep = (cols != i) & (counts >= min_count)
+        cols, counts = cols[keep], counts[keep]
+        if cols.size == 0:
+            return []
+
+        lift = self.lift(np.full(cols.size, i), cols, counts)
+        pmi = np.log(lift)
+        score = {"pmi": pmi, "lift": lift, "count": counts}[by]
+        # 同分按共现数、再按名字排，保证每次输出一样
+        order = np.lexsort((self.vocab[cols], -counts, -score))[:k]
+        return [
+            {
+                "name": self.vocab[cols[t]],
+                "count": int(counts[t]),
+                "lift": round(float(lift[t]), 3),
+                "pmi": round(float(pmi[t]), 3),
+            }
+            for t in order
+        ]
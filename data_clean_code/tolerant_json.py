@@ -0,0 +1,121 @@
+import json
+import re
+
+
+# ========= 容错 JSON 提取 =========
+# 模型输出常见的“格式噪音”：<think> 思考段、``` 代码块、JSON 后面跟一句说明、
+# 生成到一半被截断。这些都在本地修掉，不值得为此重新生成一遍。
+
+THINK_RE = re.compile(r"<think>.*?(</think>|$)", re.S)
+
+
+class JsonRepairStats:
+    """记录本地修复了多少次，方便确认重试是不是真的降下来了。"""
+
+    def __init__(self):
+        self.trailing_text = 0
+        self.truncated = 0
+        self.quotes = 0
+
+
+repair_stats = JsonRepairStats()
+
+
+def _strip_noise(text):
+    text = THINK_RE.sub("", text).strip()
+    if text.startswith("```"):
+        parts = text.split("```")
+        if len(parts) >= 3:
+            text = parts[1]
+        else:
+            text = text[3:]
+        text = text.strip()
+        if text.lower().startswith("json"):
+            text = text[4:].strip()
+    return text
+
+
+def _scan(text, start):
+    """
+    从 start 开始按括号配对往后扫，字符串里的括号不算。
+    返回 (结束位置 or None, 扫到末尾时还没闭合的括号栈, 末尾是否停在字符串里)。
+    """
+    stack = []
+    in_str = False
+    escape = False
+    for i in range(start, len(text)):
+        ch = text[i]
+        if in_str:
+            if escape:
+                escape = False
+            elif ch == "\\":
+                escape = True
+            elif ch == '"':
+                in_str = False
+            continue
+        if ch == '"':
+            in_str = True
+        elif ch in "{[":
+            stack.append(ch)
+        elif ch in "}]":
+            if stack:
+                stack.pop()
+            if not stack:
+                return i + 1, [], False
+    return None, stack, in_str
+
+
+def _close_truncated(body, stack, in_str):
+    """给截断的 JSON 补上引号和括号；最后一个键值对不完整就丢掉它。"""
+    if in_str:
+        body += '"'
+    closers = "".join("}" if c == "{" else "]" for c in reversed(stack))
+    candidate = body
+    for _ in range(8):
+        trimmed = re.sub(r'[,:\s]+$', "", candidate)
+        # 对象里只剩一个孤零零的 key（"岗位摘要" 或 "岗位摘要":）时把它删掉
+        if stack and stack[-1] == "{":
+            trimmed = re.sub(r'([{,])\s*"[^"]*"\s*:?\s*$', r"\1", trimmed)
+        trimmed = re.sub(r",\s*$", "", trimmed)
+        try:
+            return json.loads(trimmed + closers)
+        except json.JSONDecodeError:
+            pass
+        cut = max(candidate.rfind(","), candidate.rfind("{"), candidate.rfind("["))
+        if cut <= 0:
+            break
+        candidate = candidate[:cut] if candidate[cut] == "," else candidate[:cut + 1]
+        _, stack, in_str = _scan(candidate, 0)
+        closers = "".join("}" if c == "{" else "]" for c in reversed(stack))
+    raise json.JSONDecodeError("截断的 JSON 修不回来", body, len(body))
+
+
+def extract_json(content):
+    """从模型输出里尽量取出一个 JSON 对象/数组，修不好才抛 JSONDecodeError。"""
+    text = _strip_noise(content)
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        pass
+
+    starts = [p for p in (text.find("{"), text.find("[")) if p >= 0]
+    if not starts:
+        raise json.JSONDecodeError("输出里没有 JSON", text, 0)
+    start = min(starts)
+
+    end, stack, in_str = _scan(text, start)
+    if end is not None:
+        body = text[start:end]
+        try:
+            obj = json.loads(body)
+            repair_stats.trailing_text += 1
+            return obj
+        except json.JSONDecodeError:
+            obj = json.loads(body.replace("'", '"'))
+            # 修好了才算一次修复，修不好的照样抛出去走重试
+            repair_stats.quotes += 1
+            return obj
+
+    obj = _close_truncated(text[start:], stack, in_str)
+    repair_stats.truncated += 1
+    return obj
@@ -0,0 +1,7 @@
+import sys
+from pathlib import Path
+
+# data_clean_code / ai_dashboard 都是平铺的脚本目录，按脚本自己的方式 import
+REPO_DIR = Path(__file__).resolve().parent.parent
+for sub in ("data_clean_code", "ai_dashboard"):
+    sys.path.insert(0, str(REPO_DIR / sub))
@@ -0,0 +1,83 @@
+from answer_cache import AnswerCache, extract_entities, compile_entity_pattern, normalize_question
+
+TERMS = ["北京", "南京", "上海", "Python", "Java", "JavaScript", "SQL", "C", "C++", "本科", "硕士"]
+
+
+def make_cache():
+    return AnswerCache(entity_terms=lambda: TERMS)
+
+
+def test_near_match_hits_when_only_wording_differs():
+    cache = make_cache()
+    cache.store("北京的 AI 岗位平均月薪是多少", "v1", "北京的回答")
+    hit = cache.lookup("请问北京AI岗位平均月薪是多少？", "v1")
+    assert hit is not None and hit[0] == "北京的回答"
+
+
+def test_city_swap_is_a_miss():
+    q = "北京地区人工智能算法工程师岗位的平均月薪大概是多少，未来三年的发展前景怎么样"
+    swapped = q.replace("北京", "南京")
+    # 两句字面相似度在 0.93 以上，不认实体的话会把北京的回答给南京
+    unguarded = AnswerCache()
+    unguarded.store(q, "v1", "北京的回答")
+    assert unguarded.lookup(swapped, "v1") is not None
+
+    cache = make_cache()
+    cache.store(q, "v1", "北京的回答")
+    assert cache.lookup(swapped, "v1") is None
+    assert cache.stats()["entity_rejects"] == 1
+
+
+def test_skill_swap_is_a_miss():
+    q = ("想转行做人工智能算法工程师，目前在一线城市的互联网公司做后端开发已经三年了，"
+         "平时工作里也接触过一些推荐系统和数据分析的内容，请问应该先系统地学习 Python 编程基础，"
+         "还是先做一些实际的项目来积累经验，哪条路线找工作更容易")
+    swapped = q.replace("Python", "SQL")
+    unguarded = AnswerCache()
+    unguarded.store(q, "v1", "Python 的回答")
+    assert unguarded.lookup(swapped, "v1") is not None
+
+    cache = make_cache()
+    cache.store(q, "v1", "Python 的回答")
+    assert cache.lookup(swapped, "v1") is None
+    assert cache.lookup(q.replace("Python", "Java"), "v1") is None
+
+
+def test_digits_and_degree_must_match():
+    cache = make_cache()
+    q = "本科毕业以后在一线城市互联网公司做人工智能算法工程师，工作3年左右的话一般月薪能到多少，跳槽时涨幅大概是多少"
+    cache.store(q, "v1", "本科 3 年的回答")
+    assert cache.lookup(q.replace("3年", "5年"), "v1") is None
+    assert cache.lookup(q.replace("本科", "硕士"), "v1") is None
+    assert cache.lookup(q + "？", "v1") is not None
+
+
+def test_ascii_terms_need_word_boundaries():
+    pattern = compile_entity_pattern(TERMS)
+    assert extract_entities("C++ 和 C 哪个好", pattern) == {"c++", "c"}
+    assert extract_entities("JavaScript 岗位多吗", pattern) == {"javascript"}
+    assert extract_entities("CSS 岗位多吗", pattern) == frozenset()
+
+
+def test_new_data_version_drops_answers():
+    cache = make_cache()
+    cache.store("哪个城市 AI 岗位最多", "v1", "旧回答")
+    assert cache.lookup("哪个城市 AI 岗位最多", "v2") is None
+    assert cache.stats()["invalidations"] == 1
+
+
+def test_opposite_direction_is_a_miss():
+    q = "目前AI岗位整体的薪资水平怎么样，哪些方向的工资最高"
+    opposite = q.replace("最高", "最低")
+    # 两句只差一个字，字面相似度 0.92，比较词不算进实体的话会把“最高”的回答给“最低”
+    cache = make_cache()
+    cache.store(q, "v1", "最高的回答")
+    assert cache.lookup(opposite, "v1") is None
+    assert cache.lookup(q.replace("最高", "最多"), "v1") is None
+    assert cache.lookup(q + "？", "v1") is not None
+
+
+def test_fillers_only_stripped_at_phrase_edges():
+    assert normalize_question("请问北京的岗位多吗？") == normalize_question("北京的岗位多")
+    assert "了解" in normalize_question("想了解AI岗位的学历要求")
+    assert "目的" in normalize_question("企业招人的目的是什么")
@@ -0,0 +1,65 @@
+import inspect
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import build_artifacts
+from build_artifacts import GENERATORS
+
+
+def code_hashes():
+    return {name: g.code_hash for name, g in GENERATORS.items()}
+
+
+def test_code_hash_is_stable_across_processes():
+    # 集合常量的 repr 顺序随 PYTHONHASHSEED 变，指纹不能跟着变，不然每次构建都当过期
+    script = "from build_artifacts import GENERATORS as G; print(sorted((n, g.code_hash) for n, g in G.items()))"
+    cwd = Path(build_artifacts.__file__).parent
+    runs = [
+        subprocess.run([sys.executable, "-c", script], cwd=cwd, capture_output=True, text=True, check=True,
+                       env={**os.environ, "PYTHONHASHSEED": seed}).stdout
+        for seed in ("1", "2")
+    ]
+    assert runs[0] == runs[1] == repr(sorted(code_hashes().items())) + "\n"
+
+
+def test_editing_a_helper_function_invalidates_its_generators(monkeypatch):
+    before = code_hashes()
+    real_getsource = inspect.getsource
+
+    def edited(obj):
+        src = real_getsource(obj)
+        return src + "\n# edited\n" if obj is build_artifacts.skill_drill_stats else src
+
+    monkeypatch.setattr(build_artifacts.inspect, "getsource", edited)
+    after = code_hashes()
+    assert after["skill_drill"] != before["skill_drill"]
+    assert after["skill_drill_hist"] != before["skill_drill_hist"]
+    assert after["talent"] == before["talent"]
+
+
+def test_editing_a_helper_module_invalidates_its_generators(monkeypatch):
+    before = code_hashes()
+    real_read_bytes = Path.read_bytes
+
+    def edited(path):
+        data = real_read_bytes(path)
+        return data + b"\n# edited\n" if path.name == "salary_sketch.py" else data
+
+    monkeypatch.setattr(Path, "read_bytes", edited)
+    after = code_hashes()
+    # BuildState 用到了 salary_sketch，所以所有生成器都会过期
+    assert all(after[name] != before[name] for name in GENERATORS)
+
+
+def test_changing_constants_or_defaults_invalidates_the_generator(monkeypatch):
+    before = code_hashes()
+    monkeypatch.setattr(build_artifacts, "SKILL_SPLIT_RE", build_artifacts.re.compile(r"[、,]+"))
+    assert code_hashes()["skill"] != before["skill"]
+
+    monkeypatch.undo()
+    monkeypatch.setattr(build_artifacts.build_skill, "__defaults__", (50,))
+    after = code_hashes()
+    assert after["skill"] != before["skill"]
+    assert after["talent"] == before["talent"]
@@ -0,0 +1,41 @@
+from dedup import DedupIndex
+
+DESC = ("负责大模型训练与推理优化，参与数据清洗、特征工程和模型评估，"
+        "熟悉 PyTorch 和分布式训练，有推荐系统或自然语言处理项目经验者优先，"
+        "能和产品、工程团队一起把算法落地到线上业务")
+
+
+def posting(**kw):
+    row = {"企业名称": "某某科技", "招聘岗位": "算法工程师", "工作城市": "北京", "工作区域": "海淀区",
+           "最低月薪": 20000, "最高月薪": 35000, "要求经验": "3-5年", "学历要求": "本科", "职位描述": DESC}
+    row.update(kw)
+    return row
+
+
+def test_exact_and_near_duplicates():
+    index = DedupIndex()
+    assert index.assign(0, posting()) is None
+    assert index.assign(1, posting()) == 0
+    assert index.assign(2, posting(职位描述=DESC + "，欢迎投递")) == 0
+    assert (index.exact_dups, index.near_dups, index.clusters) == (1, 1, 1)
+
+
+def test_repost_in_another_city_or_salary_is_not_a_duplicate():
+    index = DedupIndex()
+    assert index.assign(0, posting()) is None
+    assert index.assign(1, posting(工作城市="上海")) is None
+    assert index.assign(2, posting(最高月薪=40000)) is None
+    assert index.assign(3, posting(工作城市="上海", 职位描述=DESC + "，欢迎投递")) == 1
+
+
+def test_representatives_are_bounded():
+    index = DedupIndex(max_reps=2)
+    for i in range(10):
+        index.assign(i, posting(招聘岗位=f"算法工程师{i}"))
+    assert len(index._reps) == len(index._signatures) == 2
+    assert len(index._exact) == 2
+    assert sum(len(b) for b in index._buckets.values()) == 2 * index.bands
+    assert index.evicted == 8
+    # 最近的代表还认得，被挤掉的当成新岗位
+    assert index.assign(10, posting(招聘岗位="算法工程师9")) == 9
+    assert index.assign(11, posting(招聘岗位="算法工程师0")) is None
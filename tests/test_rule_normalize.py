@@ -0,0 +1,62 @@
+import pandas as pd
+import pytest
+
+from rule_normalize import normalize_city, normalize_degree, normalize_rules, rule_fields
+
+
+@pytest.mark.parametrize("text, level", [
+    ("大专及以上，本科优先", "大专"),
+    ("本科优先，大专及以上", "大专"),
+    ("硕士及以上学历", "硕士"),
+    ("本科或以上", "本科"),
+    ("统招本科/硕士", "本科"),
+    ("博士研究生", "博士"),
+    ("中专/高中以上", "中专及以下"),
+    ("学历不限", "不限"),
+])
+def test_degree_takes_the_minimum_requirement(text, level):
+    values, resolved = normalize_degree(pd.Series([text]))
+    assert values[0] == level
+    assert resolved[0]
+
+
+def test_unknown_degree_is_left_to_the_model():
+    values, resolved = normalize_degree(pd.Series(["", "面议"]))
+    assert values.isna().all()
+    assert not resolved.any()
+
+
+def test_summary_and_skills_are_never_rule_resolved():
+    df = pd.DataFrame({
+        "招聘岗位": ["算法工程师"],
+        "企业名称": ["某公司"],
+        "工作城市": ["北京市"],
+        "学历要求": ["本科及以上"],
+        "要求经验": ["3-5年"],
+        "最低月薪": ["15000"],
+        "最高月薪": ["25000"],
+        "人工智能关键词": ["机器学习、深度学习"],
+        "职位描述": ["负责推荐系统的模型训练与上线，熟悉 Python、PyTorch、Spark、SQL、Linux"],
+    })
+    values, resolved = normalize_rules(df)
+    fields = rule_fields(values, resolved, 0)
+    assert fields["学历层级"] == "本科"
+    assert fields["工作城市"] == "北京"
+    assert "岗位摘要" not in fields
+    assert "核心技能列表" not in fields
+
+
+@pytest.mark.parametrize("text, city", [
+    ("北京市", "北京"),
+    ("广东省深圳市", "深圳"),
+    ("黑龙江省哈尔滨市", "哈尔滨"),
+    ("吉林省吉林市", "吉林"),
+    ("新疆维吾尔自治区乌鲁木齐", "乌鲁木齐"),
+    ("广西壮族自治区南宁市-青秀区", "南宁"),
+    ("内蒙古自治区呼和浩特市", "呼和浩特"),
+    ("西藏自治区拉萨市", "拉萨"),
+])
+def test_city_strips_province_prefix(text, city):
+    values, resolved = normalize_city(pd.Series([text]))
+    assert values[0] == city
+    assert resolved[0]
@@ -0,0 +1,22 @@
+from run_metrics import RunMetrics, add_to_active, new_row_metrics, set_active
+
+
+def test_batch_tokens_add_up_to_the_batch_total():
+    rows = [new_row_metrics() for _ in range(3)]
+    set_active(rows)
+    try:
+        add_to_active("prompt_tokens", 1000)
+        add_to_active("completion_tokens", 200)
+        add_to_active("model_latency", 1.5)
+    finally:
+        set_active(None)
+
+    assert [m["prompt_tokens"] for m in rows] == [334, 333, 333]
+    assert sum(m["completion_tokens"] for m in rows) == 200
+    assert all(isinstance(m["prompt_tokens"], int) for m in rows)
+    assert abs(sum(m["model_latency"] for m in rows) - 1.5) < 1e-9
+
+    run = RunMetrics(None)
+    for i, m in enumerate(rows):
+        run.add(i, m)
+    assert (run.prompt_tokens, run.completion_tokens) == (1000, 200)